@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Format benchmark: JSON vs binary character files (size, load and save time).
+
+Usage: python benchmarks/bench_binary.py [count]
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import timeit
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def time_per_call(function, count):
+    """Best-of-five microseconds per call"""
+    return min(timeit.repeat(function, number=count, repeat=5)) / count * 1e6
+
+
+def load(path, lazy):
+    character = Character()
+    character.load(path, lazy=lazy)
+    character.get_skill_bonus("perception")
+    return character
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+            character = Character()
+            character.load(path)
+            stem = os.path.join(directory, os.path.splitext(os.path.basename(path))[0])
+            formats = (
+                ("json  ", stem + ".json", character.to_json, character.write),
+                ("binary", stem + ".dndb", character.to_binary, character.write_binary),
+            )
+
+            print(os.path.basename(path))
+            for label, target, serialize, write in formats:
+                write(target)
+                size = os.path.getsize(target)
+                eager = time_per_call(lambda: load(target, False), count)
+                lazy = time_per_call(lambda: load(target, True), count)
+                encode = time_per_call(serialize, count)
+                # Every write is fsynced, so fewer rounds
+                save = time_per_call(lambda: write(target), max(1, count // 20))
+                print(f"  {label} {size:6d} B   load {eager:6.1f} us (lazy {lazy:6.1f})   "
+                      f"serialize {encode:6.1f} us   save {save:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
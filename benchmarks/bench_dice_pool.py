@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Dice pool benchmark: per-roll cost of single dice drawn one random call at a
+time versus from a pre-drawn entropy pool (refilled inline or in the
+background), next to the original roller, which called random.randint on
+the module-level random stream for every die.
+
+Usage: python benchmarks/bench_dice_pool.py [count]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.dice import DiceModifier, RollType, compile_modifiers, perform_roll, roll_d20, use_rng
+from src.dnd_mcp.rng import DiceRNG
+
+POOL_SIZE = 1024
+
+STREAMS = [
+    ("random call", dict(pool_size=0)),
+    ("pool", dict(pool_size=POOL_SIZE)),
+    ("pool (background)", dict(pool_size=POOL_SIZE, background=True)),
+]
+
+bless = DiceModifier("bless", "1d4")
+plan = compile_modifiers("advantage bless:1d4 +2")
+
+
+def baseline_roll_d20(roll_type: RollType = RollType.NORMAL):
+    """roll_d20 as it was before seedable streams: random.randint per die"""
+    roll1 = random.randint(1, 20)
+    if roll_type == RollType.NORMAL:
+        return {"result": roll1, "rolls": [roll1], "type": roll_type.value, "used_roll": roll1}
+    roll2 = random.randint(1, 20)
+    result = max(roll1, roll2) if roll_type == RollType.ADVANTAGE else min(roll1, roll2)
+    return {"result": result, "rolls": [roll1, roll2], "type": roll_type.value, "used_roll": result}
+
+
+def baseline_modifier_roll(modifier: DiceModifier):
+    """DiceModifier.roll as it was: parse the dice text, random.randint per die"""
+    num_str, sides_str = modifier.dice.split('d')
+    num_dice = int(num_str) if num_str else 1
+    sides = int(sides_str)
+    rolls = [random.randint(1, sides) for _ in range(num_dice)]
+    return {"name": modifier.name, "dice": modifier.dice, "rolls": rolls, "total": sum(rolls),
+            "description": modifier.description}
+
+
+# (name, roll through the current stream, equivalent original roll or None)
+ROLLS = [
+    ("roll_d20", lambda: roll_d20(), lambda: baseline_roll_d20()),
+    ("roll_d20 advantage", lambda: roll_d20(RollType.ADVANTAGE), lambda: baseline_roll_d20(RollType.ADVANTAGE)),
+    ("DiceModifier.roll 1d4", lambda: bless.roll(), lambda: baseline_modifier_roll(bless)),
+    ("perform_roll", lambda: perform_roll(5, plan, "Check"), None),
+]
+
+
+def best(roll, count):
+    return min(timeit.repeat(roll, number=count, repeat=5)) / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for name, roll, baseline in ROLLS:
+        print(name)
+        if baseline is not None:
+            print(f"  {'baseline randint':18s} {best(baseline, count):7.3f} us")
+        for label, options in STREAMS:
+            with use_rng(DiceRNG(1, **options)):
+                print(f"  {label:18s} {best(roll, count):7.3f} us")
+
+
+if __name__ == "__main__":
+    main()
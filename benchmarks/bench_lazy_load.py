@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: eager vs lazy character loading followed by one skill check,
+from JSON text and from the binary format.
+
+Usage: python benchmarks/bench_lazy_load.py [count]
+"""
+
+import glob
+import gc
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def load_and_check(source, lazy):
+    """Load JSON text, or a binary file when given its path, and roll a check"""
+    character = Character()
+    if source.endswith(".dndb"):
+        character.load_binary(source, lazy=lazy)
+    else:
+        character.load_from_json(source, lazy=lazy)
+    character.get_skill_bonus("perception")
+    return character
+
+
+def time_per_load(source, lazy, count):
+    """Best-of-five microseconds per load + skill check"""
+    timings = timeit.repeat(lambda: load_and_check(source, lazy), number=count, repeat=5)
+    return min(timings) / count * 1e6
+
+
+def bytes_per_character(source, lazy, count):
+    """Bytes still allocated per character while holding `count` of them"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    roster = [load_and_check(source, lazy) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del roster
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+            with open(path, encoding='utf-8') as file:
+                text = file.read()
+            binary_path = os.path.join(directory, "character.dndb")
+            character = Character()
+            character.load_from_json(text)
+            character.write_binary(binary_path)
+            print(os.path.basename(path))
+            for source, format_name in ((text, "json  "), (binary_path, "binary")):
+                for lazy in (False, True):
+                    label = "lazy " if lazy else "eager"
+                    print(f"  {format_name} {label} {time_per_load(source, lazy, count):7.1f} us/load   "
+                          f"{bytes_per_character(source, lazy, count):8.0f} B/character")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: per-character footprint of Character vs CompactCharacter.
+
+Usage: python benchmarks/bench_memory.py [count]
+"""
+
+import glob
+import gc
+import os
+import sys
+import tracemalloc
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.compact import CompactCharacter
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def measure(factory, sources, count):
+    """Return bytes allocated per instance while holding `count` instances"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    roster = [factory(sources[i % len(sources)]) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del roster
+    return (after - before) / count
+
+
+def make_character(text):
+    character = Character()
+    character.load_from_json(text)
+    return character
+
+
+def make_compact(text):
+    character = CompactCharacter()
+    character.load_from_json(text)
+    return character
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+        with open(path, encoding='utf-8') as file:
+            text = file.read()
+        full = measure(make_character, [text], count)
+        compact = measure(make_compact, [text], count)
+        print(f"{os.path.basename(path):32} Character {full:9.0f} B   "
+              f"CompactCharacter {compact:8.0f} B   ({full / compact:4.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
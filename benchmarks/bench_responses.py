@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Response benchmark: bytes and serialization time of tool responses for
+every installed JSON backend, pretty and compact.
+
+Usage: python benchmarks/bench_responses.py [count]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp import server
+from src.dnd_mcp.serialization import available_backends, dumps
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+TOOLS = [
+    ("get_character_info", lambda: server.get_character_info()),
+    ("get_character_spells", lambda: server.get_character_spells()),
+    ("get_character_equipment", lambda: server.get_character_equipment()),
+    ("list_available_skills", lambda: server.list_available_skills()),
+    ("roll_skill_check", lambda: server.roll_skill_check("arcana", "advantage")),
+    ("get_check_odds", lambda: server.get_check_odds("skill", "arcana", 15)),
+    ("list_common_modifiers", lambda: server.list_common_modifiers()),
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(server.load_character(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"), "bench_sorcerer"))
+
+    for name, call in TOOLS:
+        # The tool's payload, serialized again by each backend and format
+        value = json.loads(call())
+        print(name)
+        for backend in available_backends():
+            for label, indent in (("pretty ", 2), ("compact", None)):
+                text = dumps(value, indent=indent, backend=backend)
+                assert json.loads(text) == value
+                timings = timeit.repeat(lambda: dumps(value, indent=indent, backend=backend),
+                                        number=count, repeat=5)
+                print(f"  {backend:6s} {label} {len(text.encode('utf-8')):6d} B   "
+                      f"{min(timings) / count * 1e6:7.2f} us")
+    server.unload_character("bench_sorcerer")
+
+
+if __name__ == "__main__":
+    main()
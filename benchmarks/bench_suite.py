@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: hot paths of dice rolling, character I/O and the server
+tools, timed on the characters in examples/characters, with JSON results
+and a regression gate.
+
+Each benchmark is calibrated to run for at least --min-time seconds per
+repeat and reports the best of --repeat repeats in microseconds per call.
+With --compare, every benchmark is checked against a stored baseline; the
+run fails (exit status 1) when one is more than --threshold slower.
+
+Usage:
+    python benchmarks/bench_suite.py [--output results.json] [--filter dice/]
+    python benchmarks/bench_suite.py --output benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json [--threshold 0.25]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp import server
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.dice import (RollType, compile_dice, compile_modifiers, parse_modifiers_string, perform_roll,
+                              perform_roll_batch, roll_d20, use_rng)
+from src.dnd_mcp.rng import DiceRNG
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+# Allowed slowdown against the baseline before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+MODIFIERS = "advantage bless:1d4 guidance:1d4 +2"
+
+Benchmark = Tuple[str, Callable[[], Any]]
+
+
+def fixture_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].lower().replace(" ", "_")
+
+
+def dice_benchmarks() -> List[Benchmark]:
+    plan = compile_modifiers(MODIFIERS)
+    modifiers = parse_modifiers_string(MODIFIERS)
+    fireball = compile_dice("8d6")
+    return [
+        ("dice/roll_d20", lambda: roll_d20()),
+        ("dice/roll_d20_advantage", lambda: roll_d20(RollType.ADVANTAGE)),
+        ("dice/parse_modifiers_string", lambda: parse_modifiers_string(MODIFIERS)),
+        ("dice/perform_roll", lambda: perform_roll(5, plan, "Check")),
+        ("dice/perform_roll_parsed", lambda: perform_roll(5, modifiers, "Check")),
+        ("dice/perform_roll_batch_1000", lambda: perform_roll_batch(5, plan, 1000)),
+        ("dice/roll_8d6", lambda: fireball.roll()),
+    ]
+
+
+def character_benchmarks(directory: str) -> List[Benchmark]:
+    benchmarks = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+        name = fixture_name(path)
+        character = Character()
+        character.load(path)
+        target = os.path.join(directory, f"write_{name}.json")
+
+        def load(path=path):
+            Character().load(path)
+
+        benchmarks += [
+            (f"character/load[{name}]", load),
+            (f"character/to_dict[{name}]", character.to_dict),
+            (f"character/write[{name}]", lambda character=character, target=target: character.write(target)),
+        ]
+    return benchmarks
+
+
+def tool_benchmarks(directory: str) -> List[Benchmark]:
+    ids = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+        # Copies, so update_hit_points journals next to a scratch file
+        copy = shutil.copy(path, os.path.join(directory, os.path.basename(path)))
+        character_id = f"bench_{fixture_name(path)}"
+        server.load_character(copy, character_id)
+        ids.append(character_id)
+    server.select_character("bench_thorin")
+    thorin = server.registry.get("bench_thorin")
+    hit_points = thorin.hit_points["current"]
+
+    def update_hit_points():
+        server.update_hit_points(hit_points - 1)
+        server.update_hit_points(hit_points)
+
+    return [
+        ("tools/get_character_info", lambda: server.get_character_info()),
+        ("tools/roll_skill_check", lambda: server.roll_skill_check("athletics", MODIFIERS)),
+        ("tools/roll_saving_throw", lambda: server.roll_saving_throw("con", "advantage")),
+        ("tools/roll_attack", lambda: server.roll_attack("Battleaxe", "+1", target_ac=15)),
+        ("tools/get_check_odds", lambda: server.get_check_odds("skill", "athletics", 15, MODIFIERS)),
+        ("tools/get_damage_per_round", lambda: server.get_damage_per_round(modifiers="advantage")),
+        ("tools/roll_group_check", lambda: server.roll_group_check("save", "dex", 14, character_ids=ids)),
+        ("tools/roll_dice", lambda: server.roll_dice("8d6", count=10)),
+        ("tools/update_hit_points_x2", update_hit_points),
+    ]
+
+
+def measure(call: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """Best and median microseconds per call over `repeat` calibrated runs"""
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    timings = sorted(t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number))
+    return {"us": round(timings[0], 4), "median_us": round(timings[len(timings) // 2], 4),
+            "number": number, "repeat": repeat}
+
+
+def run(name_filter: str, repeat: int, min_time: float) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        server.seed_dice(0)
+        try:
+            with use_rng(DiceRNG(0)):
+                benchmarks = dice_benchmarks() + character_benchmarks(directory) + tool_benchmarks(directory)
+                for name, call in benchmarks:
+                    if name_filter not in name:
+                        continue
+                    results[name] = measure(call, repeat, min_time)
+                    print(f"{name:42s} {results[name]['us']:12.3f} us")
+        finally:
+            for character_id in list(server.registry.ids()):
+                if character_id.startswith("bench_"):
+                    server.unload_character(character_id)
+            server.flush()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Dict[str, Any]]:
+    """Each benchmark's change against the baseline; status is "regressed"
+    when it is more than `threshold` (a fraction) slower"""
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            rows.append({"name": name, "status": "new", "us": result["us"]})
+            continue
+        ratio = result["us"] / baseline[name]["us"] if baseline[name]["us"] else 1.0
+        if ratio > 1 + threshold:
+            status = "regressed"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "us": result["us"],
+                     "baseline_us": baseline[name]["us"], "ratio": round(ratio, 4)})
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write the results (and any comparison) to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail on regressions against this results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per benchmark (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Minimum seconds per repeat (default 0.1)")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": run(args.filter, args.repeat, args.min_time),
+    }
+
+    failed = False
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["benchmarks"]
+        rows = compare(report["benchmarks"], baseline, args.threshold)
+        report["comparison"] = {"baseline": args.compare, "threshold": args.threshold, "results": rows}
+        print(f"\nAgainst {args.compare} (threshold {args.threshold:.0%}):")
+        for row in rows:
+            change = f"{row['ratio'] - 1:+8.1%}" if "ratio" in row else " " * 8
+            print(f"  {row['name']:42s} {change}  {row['status']}")
+        regressed = [row["name"] for row in rows if row["status"] == "regressed"]
+        if regressed:
+            print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+            failed = True
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Convert D&D character sheets between JSON and the compact binary format.
+
+Usage: python convert_character.py thorin.json [more files...] [-o output]
+"""
+
+import sys
+
+from src.dnd_mcp.binary import main
+
+if __name__ == "__main__":
+    sys.exit(main())
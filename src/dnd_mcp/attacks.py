@@ -0,0 +1,319 @@
+"""
+Weapon attack profiles for D&D 5e characters.
+
+A profile holds everything an attack with one weapon needs: the ability it
+uses (finesse weapons take the better of STR and DEX, ranged weapons DEX),
+proficiency from the sheet's weapon proficiencies, magic bonuses, the
+critical range and the damage dice, compiled once. Character builds the
+profiles of all its weapons together and keeps them until it changes, so an
+attack is a lookup plus the rolls themselves.
+
+Both weapon formats found in character files are understood:
+
+    {"name": "Battleaxe", "type": "Martial Melee", "damage": "1d8",
+     "damage_type": "slashing", "properties": ["versatile"]}
+
+    {"name": "Dagger", "damage": {"dice": {"sides": 4, "count": 1, "mod": 1},
+     "type": "Piercing"}, "properties": {"Finesse": true, "Light": true}}
+
+A "mod" inside the damage dice is the sheet's own damage modifier and is
+used instead of the ability modifier. Optional keys: "magic_bonus" (or
+"bonus") for +N weapons, "proficient" to override the proficiency lookup,
+and "crit_range" for the lowest natural roll that is a critical hit.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+try:
+    from .dice import (DiceExpression, RollDistribution, RollPlan, compile_dice, d20_distribution,
+                       perform_roll, np)
+    from .constants import WEAPON_TYPES
+except ImportError:
+    from src.dnd_mcp.dice import (DiceExpression, RollDistribution, RollPlan, compile_dice, d20_distribution,
+                                  perform_roll, np)
+    from src.dnd_mcp.constants import WEAPON_TYPES
+
+
+GENERIC_ATTACK = "Generic Attack"
+
+# Armor classes covered by damage-per-round tables
+DPR_ARMOR_CLASSES = range(5, 31)
+
+
+class AttackProfile(NamedTuple):
+    """Precomputed attack and damage bonuses of one weapon"""
+    weapon: str
+    ability: str
+    ability_modifier: int
+    proficiency_bonus: int  # 0 when not proficient
+    proficient: bool
+    magic_bonus: int
+    attack_bonus: int  # Everything added to the d20
+    damage_dice: str  # Empty for attacks without damage dice
+    damage_bonus: int  # Added to the damage dice
+    damage_type: str
+    crit_range: int  # Lowest natural d20 that is a critical hit
+    ranged: bool
+    damage: Optional[DiceExpression] = None  # Compiled damage_dice
+
+
+def _weapon_properties(weapon: Dict[str, Any]) -> frozenset:
+    """Lowercase property names from a list or a {name: enabled} dict"""
+    properties = weapon.get("properties") or ()
+    if isinstance(properties, dict):
+        return frozenset(name.lower() for name, enabled in properties.items() if enabled)
+    return frozenset(str(name).lower() for name in properties)
+
+
+def _weapon_damage(weapon: Dict[str, Any]):
+    """(dice text, sheet damage modifier or None, damage type) from either weapon format"""
+    damage = weapon.get("damage")
+    damage_type = weapon.get("damage_type", "")
+    if isinstance(damage, dict):
+        dice = damage.get("dice") or {}
+        damage_type = damage.get("type", damage_type)
+        modifier = dice.get("mod")
+        if modifier is not None:
+            try:
+                modifier = int(modifier)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid damage modifier: {modifier!r}") from None
+        text = f"{dice.get('count', 1)}d{dice['sides']}" if dice.get("sides") else ""
+        return text, modifier, damage_type
+    return str(damage) if damage else "", None, damage_type
+
+
+def _is_proficient(weapon_name: str, weapon_type: str, proficiencies: List[str]) -> bool:
+    """Whether sheet proficiencies such as "Simple Weapons" or "Longswords" cover a weapon
+
+    Sheets without any weapon proficiencies count as proficient with everything.
+    """
+    if not proficiencies:
+        return True
+    name = weapon_name.lower()
+    category = weapon_type.split()[0].lower() if weapon_type else ""
+    for proficiency in proficiencies:
+        proficiency = str(proficiency).lower()
+        if proficiency in (name, name + "s") or (category and proficiency == f"{category} weapons"):
+            return True
+    return False
+
+
+def critical_range(classes: List[Dict[str, Any]]) -> int:
+    """Lowest natural d20 that crits: 19 for Champions from level 3, 18 from level 15"""
+    crit_range = 20
+    for cls in classes:
+        subclass = str(cls.get("subtype") or cls.get("subclass") or "").lower()
+        if subclass == "champion":
+            level = cls.get("level", 0)
+            if level >= 15:
+                crit_range = min(crit_range, 18)
+            elif level >= 3:
+                crit_range = min(crit_range, 19)
+    return crit_range
+
+
+def build_attack_profile(character, weapon: Dict[str, Any]) -> AttackProfile:
+    """Profile of one weapon dict for a character
+
+    Raises ValueError (or TypeError) for damage dice, modifiers or bonuses
+    that cannot be parsed.
+    """
+    name = str(weapon.get("name", "Unknown Weapon"))
+    weapon_type = str(weapon.get("type") or WEAPON_TYPES.get(name.lower(), ""))
+    properties = _weapon_properties(weapon)
+    ranged = "ranged" in weapon_type.lower() or "ammunition" in properties or "range" in weapon
+
+    strength = character.get_ability_modifier("str")
+    dexterity = character.get_ability_modifier("dex")
+    if "finesse" in properties:
+        ability = "dex" if dexterity > strength else "str"
+    else:
+        ability = "dex" if ranged else "str"
+    ability_modifier = dexterity if ability == "dex" else strength
+
+    proficient = weapon.get("proficient")
+    if proficient is None:
+        proficient = _is_proficient(name, weapon_type, character.weapon_proficiencies)
+    proficiency_bonus = character.get_proficiency_bonus() if proficient else 0
+    magic_bonus = int(weapon.get("magic_bonus", weapon.get("bonus", 0)) or 0)
+
+    damage_dice, damage_modifier, damage_type = _weapon_damage(weapon)
+    if damage_modifier is None:
+        damage_modifier = ability_modifier
+    return AttackProfile(
+        weapon=name,
+        ability=ability,
+        ability_modifier=ability_modifier,
+        proficiency_bonus=proficiency_bonus,
+        proficient=bool(proficient),
+        magic_bonus=magic_bonus,
+        attack_bonus=ability_modifier + proficiency_bonus + magic_bonus,
+        damage_dice=damage_dice,
+        damage_bonus=damage_modifier + magic_bonus,
+        damage_type=str(damage_type).lower(),
+        crit_range=int(weapon.get("crit_range") or critical_range(character.classes)),
+        ranged=ranged,
+        damage=compile_dice(damage_dice) if damage_dice else None
+    )
+
+
+def build_attack_profiles(character, errors: Optional[Dict[str, str]] = None) -> Dict[str, AttackProfile]:
+    """Profiles of every weapon a character carries, keyed by lowercase weapon name
+
+    Weapons that cannot be parsed are left out, so one bad sheet entry does
+    not disable the others; their errors go into `errors` (also keyed by
+    lowercase weapon name) when given.
+    """
+    profiles = {}
+    for weapon in character.weapons or ():
+        if isinstance(weapon, dict):
+            try:
+                profile = build_attack_profile(character, weapon)
+            except (TypeError, ValueError) as e:
+                if errors is not None:
+                    errors.setdefault(str(weapon.get("name", "Unknown Weapon")).lower(), str(e))
+                continue
+            profiles.setdefault(profile.weapon.lower(), profile)
+    return profiles
+
+
+def generic_attack_profile(character) -> AttackProfile:
+    """An attack without a weapon: STR plus proficiency, with no damage dice"""
+    strength = character.get_ability_modifier("str")
+    proficiency_bonus = character.get_proficiency_bonus()
+    return AttackProfile(GENERIC_ATTACK, "str", strength, proficiency_bonus, True, 0,
+                         strength + proficiency_bonus, "", 0, "", critical_range(character.classes), False)
+
+
+def attack_name(profile: AttackProfile) -> str:
+    """Roll name of an attack, e.g. "Battleaxe Attack" """
+    return "Attack Roll" if profile.weapon == GENERIC_ATTACK else f"{profile.weapon} Attack"
+
+
+def roll_damage(profile: AttackProfile, critical: bool = False) -> Dict[str, Any]:
+    """Roll a profile's damage; a critical hit rolls the damage dice twice"""
+    rolls: List[int] = []
+    dice_total = 0
+    if profile.damage is not None:
+        for _ in range(2 if critical else 1):
+            total, kept = profile.damage.roll()
+            dice_total += total
+            rolls.extend(kept)
+    return {
+        "dice": profile.damage_dice,
+        "rolls": rolls,
+        "bonus": profile.damage_bonus,
+        "total": max(dice_total + profile.damage_bonus, 0),
+        "type": profile.damage_type,
+        "critical": critical
+    }
+
+
+def attack_hits(natural: int, total: int, crit_range: int, armor_class: Optional[int] = None) -> bool:
+    """Whether an attack roll hits: a natural 1 always misses, a natural roll
+    within the critical range always hits, anything else hits when the total
+    meets the armor class (or, without one, always)"""
+    if natural == 1:
+        return False
+    if natural >= crit_range:
+        return True
+    return armor_class is None or total >= armor_class
+
+
+def resolve_attack(profile: AttackProfile, plan: RollPlan,
+                   armor_class: Optional[int] = None) -> Dict[str, Any]:
+    """Roll an attack and, unless it misses, its damage
+
+    A natural 1 always misses and a natural roll within the critical range
+    always hits. Without an armor class every attack that is not a natural 1
+    is treated as a hit, so its damage is rolled too.
+    """
+    result = perform_roll(profile.attack_bonus, plan, attack_name(profile))
+    natural = result["d20_roll"]["result"]
+    critical = natural >= profile.crit_range
+    hit = attack_hits(natural, result["total"], profile.crit_range, armor_class)
+    result["critical"] = critical
+    if armor_class is not None:
+        result["target_ac"] = armor_class
+        result["hit"] = hit
+    if hit and (profile.damage is not None or profile.damage_bonus):
+        result["damage"] = roll_damage(profile, critical)
+    return result
+
+
+class DamageTable(NamedTuple):
+    """Exact hit chances and expected damage of one attack across armor classes"""
+    weapon: str
+    armor_classes: List[int]
+    hit_chances: List[float]  # Including critical hits
+    crit_chance: float
+    damage_on_hit: float  # Expected damage of a normal hit
+    damage_on_crit: float
+    damage_per_round: List[float]  # Expected damage of one attack
+
+
+def _expected_damage(distribution: Optional[RollDistribution], bonus: int) -> float:
+    """Expected damage of dice plus a bonus, never below 0"""
+    if distribution is None:
+        return float(max(bonus, 0))
+    return sum(max(distribution.minimum + i + bonus, 0) * p
+               for i, p in enumerate(distribution.probabilities))
+
+
+def _survival(distribution: RollDistribution) -> List[float]:
+    """survival[i] = P(total >= minimum + i), with a trailing 0"""
+    survival = [0.0] * (len(distribution.probabilities) + 1)
+    for i in range(len(distribution.probabilities) - 1, -1, -1):
+        survival[i] = survival[i + 1] + distribution.probabilities[i]
+    return survival
+
+
+def damage_table(profile: AttackProfile, plan: RollPlan,
+                 armor_classes: Iterable[int] = DPR_ARMOR_CLASSES) -> DamageTable:
+    """Hit chance and expected damage of an attack against every armor class
+
+    Exact, by the same rules as resolve_attack: a natural 1 misses, a natural
+    roll in the critical range hits and doubles the damage dice, any other
+    roll hits when the total with every attack modifier meets the AC. The
+    whole AC range is computed in one vectorized pass when NumPy is installed.
+    """
+    armor_classes = list(armor_classes)
+    naturals = d20_distribution(plan.roll_type).probabilities
+    crit_chance = sum(naturals[profile.crit_range - 1:])
+
+    # Attack modifiers other than the d20: bonus, flat modifiers and dice such as bless
+    modifier = RollDistribution(profile.attack_bonus + plan.flat_total, [1.0])
+    for expression in plan.dice:
+        modifier = modifier.convolve(expression.distribution())
+    survival = _survival(modifier)
+    # Naturals that hit only by beating the AC
+    normal = range(2, profile.crit_range)
+
+    if np is not None:
+        survival = np.array(survival)
+        faces = np.arange(2, profile.crit_range)
+        needed = np.array(armor_classes)[:, None] - faces[None, :] - modifier.minimum
+        chances = survival[np.clip(needed, 0, len(survival) - 1)] @ np.array(naturals[1:profile.crit_range - 1])
+        normal_hits = chances.tolist()
+    else:
+        normal_hits = []
+        for armor_class in armor_classes:
+            chance = 0.0
+            for face in normal:
+                needed = min(max(armor_class - face - modifier.minimum, 0), len(survival) - 1)
+                chance += naturals[face - 1] * survival[needed]
+            normal_hits.append(chance)
+
+    dice = profile.damage.distribution() if profile.damage is not None else None
+    on_hit = _expected_damage(dice, profile.damage_bonus)
+    on_crit = _expected_damage(dice.convolve(dice) if dice is not None else None, profile.damage_bonus)
+    return DamageTable(
+        weapon=profile.weapon,
+        armor_classes=armor_classes,
+        hit_chances=[chance + crit_chance for chance in normal_hits],
+        crit_chance=crit_chance,
+        damage_on_hit=on_hit,
+        damage_on_crit=on_crit,
+        damage_per_round=[chance * on_hit + crit_chance * on_crit for chance in normal_hits]
+    )
@@ -0,0 +1,261 @@
+"""
+Compact binary character format.
+
+A binary sheet holds the same data as a JSON sheet, but the fields every
+tool needs are struct-packed and the large, rarely read sections are
+length-prefixed, so loading one only decodes what it has to. Character
+keeps those sections as raw text until first accessed when loading lazily.
+
+Layout (version 1, little endian):
+    header    "DNDB", format version, packed-field flags, section count
+    core      ability scores (6 x u8), xp (u32), hit points max and current
+              (i32), armor class value (i16)
+    strings   name, nickname, alignment, armor class description, each as a
+              u16 byte length (0xFFFF for None) followed by UTF-8
+    sections  section id (u8) and byte length (u32), then compact JSON
+
+The "fields" section is one JSON object holding every field that is neither
+packed nor a section of its own, so it is decoded with a single parse. Core
+fields whose data does not fit the packed form (unusual keys, values out of
+range) are stored there too; the flags record which core fields are valid.
+Section ids index SECTION_NAMES, which may only grow.
+
+Run as a script to convert sheets between JSON and binary:
+    python -m src.dnd_mcp.binary thorin.json [-o thorin.dndb]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .serialization import dumps
+except ImportError:
+    from src.dnd_mcp.serialization import dumps
+
+
+BINARY_MAGIC = b"DNDB"
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".dndb"
+
+_HEADER = struct.Struct("<4sBBH")
+_CORE = struct.Struct("<6BIiih")
+_STRING_LENGTH = struct.Struct("<H")
+_SECTION = struct.Struct("<BI")
+_NONE = 0xFFFF
+
+ABILITIES = ("str", "dex", "con", "int", "wis", "cha")
+
+# Sections stored on their own, so they can be copied or skipped undecoded
+SECTION_NAMES = ("fields", "background", "details", "feats", "spells", "weapons", "equipment")
+_SECTION_IDS = {name: index for index, name in enumerate(SECTION_NAMES)}
+
+# Fields kept in the "fields" section (besides core fields that do not pack)
+UNPACKED_FIELDS = (
+    "player", "race", "classes", "speed", "skills", "saving_throws",
+    "weapon_proficiencies", "armor_proficiencies", "tool_proficiencies",
+    "languages", "treasure",
+)
+
+# Flags for core fields stored in packed form
+PACKED_ABILITIES = 1
+PACKED_HIT_POINTS = 2
+PACKED_ARMOR_CLASS = 4
+PACKED_XP = 8
+
+
+class BinaryFormatError(ValueError):
+    """Raised for data that is not a readable binary character sheet"""
+
+
+def is_binary(data: bytes) -> bool:
+    """Whether data starts like a binary character sheet"""
+    return data[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def is_binary_file(file_path: str) -> bool:
+    """Whether a file is a binary character sheet (by its first bytes)"""
+    with open(file_path, 'rb') as file:
+        return is_binary(file.read(len(BINARY_MAGIC)))
+
+
+def _is_int(value: Any, low: int, high: int) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+
+def _encode_json(value: Any) -> bytes:
+    return dumps(value).encode("utf-8")
+
+
+def _encode_string(value: Optional[str]) -> bytes:
+    if value is None:
+        return _STRING_LENGTH.pack(_NONE)
+    encoded = value.encode("utf-8")
+    if len(encoded) >= _NONE:
+        raise ValueError("String too long for the binary format")
+    return _STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def encode_character(character) -> bytes:
+    """Serialize a Character (or anything with its attributes) to bytes
+
+    Sections a lazy load has not decoded yet are copied as raw text.
+    """
+    flags = 0
+    fields: Dict[str, Any] = {name: getattr(character, name) for name in UNPACKED_FIELDS}
+    deferred: Dict[str, str] = character.__dict__.get("_deferred") or {}
+
+    abilities = character.ability_scores
+    if tuple(abilities) == ABILITIES and all(_is_int(abilities[name], 0, 255) for name in ABILITIES):
+        flags |= PACKED_ABILITIES
+        ability_bytes = [abilities[name] for name in ABILITIES]
+    else:
+        fields["ability_scores"] = abilities
+        ability_bytes = [0] * 6
+
+    hit_points = character.hit_points
+    if tuple(hit_points) == ("max", "current") and \
+            all(_is_int(hit_points[key], -2**31, 2**31 - 1) for key in hit_points):
+        flags |= PACKED_HIT_POINTS
+        hp_max, hp_current = hit_points["max"], hit_points["current"]
+    else:
+        fields["hit_points"] = hit_points
+        hp_max = hp_current = 0
+
+    armor_class = character.armor_class
+    ac_description = None
+    if tuple(armor_class) == ("value", "description") and _is_int(armor_class["value"], -2**15, 2**15 - 1) \
+            and isinstance(armor_class["description"], str):
+        flags |= PACKED_ARMOR_CLASS
+        ac_value, ac_description = armor_class["value"], armor_class["description"]
+    else:
+        fields["armor_class"] = armor_class
+        ac_value = 0
+
+    xp = character.xp
+    if _is_int(xp, 0, 2**32 - 1):
+        flags |= PACKED_XP
+    else:
+        fields["xp"] = xp
+        xp = 0
+
+    parts = [
+        _HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(SECTION_NAMES)),
+        _CORE.pack(*ability_bytes, xp, hp_max, hp_current, ac_value),
+        _encode_string(character.name),
+        _encode_string(character.nickname),
+        _encode_string(character.alignment),
+        _encode_string(ac_description),
+    ]
+    for section_id, name in enumerate(SECTION_NAMES):
+        if name == "fields":
+            payload = _encode_json(fields)
+        elif name in deferred:
+            payload = deferred[name].encode("utf-8")
+        else:
+            payload = _encode_json(getattr(character, name))
+        parts.append(_SECTION.pack(section_id, len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def decode_character(data: bytes) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Split a binary sheet into decoded fields and raw section text
+
+    Returns (fields, sections): fields maps attribute names to values for
+    the packed core, the strings and the "fields" section; sections maps
+    the names of the other sections to their JSON text.
+    """
+    if not is_binary(data):
+        raise BinaryFormatError("Not a binary character sheet")
+    try:
+        _, version, flags, count = _HEADER.unpack_from(data, 0)
+        if version != BINARY_VERSION:
+            raise BinaryFormatError(f"Unsupported binary character format version {version}")
+        offset = _HEADER.size
+
+        *abilities, xp, hp_max, hp_current, ac_value = _CORE.unpack_from(data, offset)
+        offset += _CORE.size
+
+        strings: List[Optional[str]] = []
+        for _ in range(4):
+            length, = _STRING_LENGTH.unpack_from(data, offset)
+            offset += _STRING_LENGTH.size
+            if length == _NONE:
+                strings.append(None)
+            else:
+                strings.append(data[offset:offset + length].decode("utf-8"))
+                offset += length
+        name, nickname, alignment, ac_description = strings
+
+        sections: Dict[str, str] = {}
+        for _ in range(count):
+            section_id, length = _SECTION.unpack_from(data, offset)
+            offset += _SECTION.size
+            if section_id >= len(SECTION_NAMES) or offset + length > len(data):
+                raise BinaryFormatError("Damaged binary character sheet")
+            sections[SECTION_NAMES[section_id]] = data[offset:offset + length].decode("utf-8")
+            offset += length
+    except (struct.error, UnicodeDecodeError) as e:
+        raise BinaryFormatError(f"Damaged binary character sheet: {e}")
+
+    fields: Dict[str, Any] = json.loads(sections.pop("fields", "{}"))
+    fields.update(name=name, nickname=nickname, alignment=alignment)
+    if flags & PACKED_ABILITIES:
+        fields["ability_scores"] = dict(zip(ABILITIES, abilities))
+    if flags & PACKED_HIT_POINTS:
+        fields["hit_points"] = {"max": hp_max, "current": hp_current}
+    if flags & PACKED_ARMOR_CLASS:
+        fields["armor_class"] = {"value": ac_value, "description": ac_description}
+    if flags & PACKED_XP:
+        fields["xp"] = xp
+    return fields, sections
+
+
+def convert(source: str, target: Optional[str] = None) -> str:
+    """Convert a sheet between JSON and binary, by the source's format
+
+    Returns the path written (defaults to the source path with the other
+    format's extension).
+    """
+    try:
+        from .character import Character
+    except ImportError:
+        from src.dnd_mcp.character import Character
+
+    to_binary = not is_binary_file(source)
+    if target is None:
+        target = os.path.splitext(source)[0] + (BINARY_SUFFIX if to_binary else ".json")
+
+    character = Character()
+    character.load(source, lazy=True)
+    if to_binary:
+        character.write_binary(target)
+    else:
+        character.write(target)
+    return target
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert D&D character sheets between JSON and binary")
+    parser.add_argument("source", nargs="+", help="Character files to convert")
+    parser.add_argument("-o", "--output", help="Output path (only with a single source)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.source) > 1:
+        parser.error("--output needs a single source file")
+
+    failed = 0
+    for source in args.source:
+        try:
+            print(f"{source} -> {convert(source, args.output)}")
+        except (OSError, ValueError) as e:
+            print(f"{source}: {e}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Bulk character import from directories and JSONL files.
+
+Characters are read and parsed on a thread or process pool and yielded one
+by one, in source order, as soon as they are ready. Only a bounded number of
+entries are in flight at once, so importing a campaign of thousands of
+characters never holds more than a window of them beyond what the caller
+keeps. A file that fails to load is reported in its result instead of
+aborting the import. With compact=True characters come back as
+CompactCharacter, for rosters too large to hold as Character objects.
+"""
+
+import glob
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    from .binary import BINARY_SUFFIX
+    from .character import Character
+    from .compact import CompactCharacter
+except ImportError:
+    from src.dnd_mcp.binary import BINARY_SUFFIX
+    from src.dnd_mcp.character import Character
+    from src.dnd_mcp.compact import CompactCharacter
+
+
+# Entries handed to a worker per task, and tasks queued per worker before
+# waiting on the oldest one
+BATCH_SIZE = 32
+IN_FLIGHT_PER_WORKER = 4
+
+
+class ImportResult(NamedTuple):
+    """Outcome of importing one character
+
+    `source` is the file path, or "path:line" for JSONL entries. Exactly one
+    of `character` and `error` is set.
+    """
+    source: str
+    character: Optional[Union[Character, CompactCharacter]]
+    error: Optional[str]
+
+
+def iter_sources(source: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (source, text) pairs for a directory, glob pattern or JSONL file
+
+    Text is None for files the worker should read itself; JSONL lines are
+    yielded with their text. Blank JSONL lines are skipped.
+    """
+    if source.endswith(".jsonl") and os.path.isfile(source):
+        with open(source, 'r', encoding='utf-8') as file:
+            for number, line in enumerate(file, 1):
+                if line.strip():
+                    yield f"{source}:{number}", line
+        return
+
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "*.json")) + glob.glob(os.path.join(source, "*" + BINARY_SUFFIX))
+    else:
+        paths = glob.glob(source)
+    for path in sorted(paths):
+        if os.path.isfile(path):
+            yield path, None
+
+
+def _load_entry(source: str, text: Optional[str], lazy: Optional[bool], compact: bool) -> ImportResult:
+    """Load one character, capturing any error"""
+    try:
+        character = Character()
+        if text is None:
+            character.load(source, lazy=source.endswith(BINARY_SUFFIX) if lazy is None else lazy)
+        else:
+            character.load_from_json(text, lazy=bool(lazy))
+        if compact:
+            return ImportResult(source, CompactCharacter.from_character(character), None)
+        return ImportResult(source, character, None)
+    except Exception as e:
+        return ImportResult(source, None, str(e))
+
+
+def _load_batch(entries: List[Tuple[str, Optional[str]]], lazy: Optional[bool],
+                compact: bool) -> List[ImportResult]:
+    """Worker entry point: load a batch of entries"""
+    return [_load_entry(source, text, lazy, compact) for source, text in entries]
+
+
+def bulk_load(source: str, workers: Optional[int] = None, processes: bool = False,
+              max_in_flight: Optional[int] = None, lazy: Optional[bool] = None,
+              compact: bool = False) -> Iterator[ImportResult]:
+    """Load every character in a directory, glob pattern or JSONL file
+
+    Args:
+        source: Directory (all *.json and *.dndb files), glob pattern or .jsonl file
+        workers: Pool size (defaults to the CPU count)
+        processes: Parse in worker processes instead of threads
+        max_in_flight: Batches of BATCH_SIZE entries submitted but not yet
+            yielded (defaults to IN_FLIGHT_PER_WORKER per worker)
+        lazy: Load characters lazily (see Character.load); by default only
+            binary files are, as JSON loads faster in full
+        compact: Yield CompactCharacter instead of Character (packed in the
+            worker, so process pools also send less data back)
+
+    Yields an ImportResult per entry, in source order.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * IN_FLIGHT_PER_WORKER
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    executor: Executor = pool_class(max_workers=workers)
+    entries = iter_sources(source)
+    pending = deque()
+    try:
+        while True:
+            batch = list(islice(entries, BATCH_SIZE))
+            if not batch:
+                break
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_load_batch, batch, lazy, compact))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Stop early if the caller abandons the generator
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,304 @@
+"""
+Persistent catalog of the character files in a directory.
+
+The catalog scans a directory once and stores a summary of every character
+file, JSON or binary (name, race, classes, level, path, mtime and content
+hash) in a compact binary index next to the files. Lookups read the
+memory-mapped index directly, so finding a character never opens its file.
+Refreshing only re-reads files whose size or mtime changed.
+
+Index layout (little endian):
+    header   magic "DNDC", format version, record count
+    records  fixed-size, sorted by case-folded name, each holding
+             (offset, length) pairs into the string table plus the level,
+             mtime, size and hash
+    strings  UTF-8 text of every key, name, race, classes string and path
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from .binary import BINARY_SUFFIX, decode_character, is_binary
+except ImportError:
+    from src.dnd_mcp.binary import BINARY_SUFFIX, decode_character, is_binary
+
+
+CATALOG_FILE_NAME = ".dnd_catalog"
+CATALOG_MAGIC = b"DNDC"
+CATALOG_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxI")
+# key, name, race, classes, path as (offset, length); level; mtime_ns; size; hash
+_RECORD = struct.Struct("<10IHxxqQ16s")
+
+# Largest level an index record can hold
+MAX_CATALOG_LEVEL = 0xFFFF
+
+
+class CatalogEntry(NamedTuple):
+    """Summary of one character file"""
+    name: str
+    race: str
+    classes: str  # e.g. "Fighter 3, Rogue 2"
+    level: int
+    path: str  # absolute
+    mtime_ns: int
+    size: int
+    content_hash: str  # hex BLAKE2b-128 of the file bytes
+
+
+def _catalog_key(name: str) -> bytes:
+    return name.casefold().encode("utf-8")
+
+
+def summarize_file(path: str) -> CatalogEntry:
+    """Read one character file and summarize it for the catalog
+
+    Raises ValueError (or TypeError) for files whose data cannot be indexed.
+    """
+    with open(path, 'rb') as file:
+        content = file.read()
+    stat = os.stat(path)
+    if is_binary(content):
+        data, _ = decode_character(content)
+    else:
+        data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("Character data must be a JSON object")
+
+    classes = [cls for cls in data.get("classes", []) if isinstance(cls, dict)]
+    race = data.get("race", {})
+    level = sum(cls.get("level", 0) for cls in classes)
+    if not isinstance(level, int) or not 0 <= level <= MAX_CATALOG_LEVEL:
+        raise ValueError(f"Character level must be a whole number from 0 to {MAX_CATALOG_LEVEL}, got {level!r}")
+    name = data.get("name") or os.path.splitext(os.path.basename(path))[0]
+    race_name = race.get("name", "") if isinstance(race, dict) else ""
+    if not isinstance(name, str):
+        raise ValueError(f"Character name must be text, got {name!r}")
+    if not isinstance(race_name, str):
+        raise ValueError(f"Race name must be text, got {race_name!r}")
+    return CatalogEntry(
+        name=name,
+        race=race_name,
+        classes=", ".join(f"{cls.get('name', 'Unknown')} {cls.get('level', 1)}" for cls in classes),
+        level=level,
+        path=os.path.abspath(path),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        content_hash=hashlib.blake2b(content, digest_size=16).hexdigest()
+    )
+
+
+class Catalog:
+    """Memory-mapped index of the character files in one directory"""
+
+    def __init__(self, directory: str, index_path: Optional[str] = None):
+        self.directory = os.path.abspath(directory)
+        self.index_path = index_path or os.path.join(self.directory, CATALOG_FILE_NAME)
+        self.directory_mtime_ns: Optional[int] = None
+        # Files that could not be summarized: path -> (mtime_ns, size, error)
+        self._failed: Dict[str, Tuple[int, int, str]] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+        self._strings = 0
+        self._entries: Optional[List[CatalogEntry]] = None
+        self._lock = threading.RLock()
+        self._open()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the index file"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._count = 0
+            self._entries = None
+
+    def _open(self) -> None:
+        """Map the index file if it exists and is valid"""
+        self.close()
+        try:
+            with open(self.index_path, 'rb') as file:
+                index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return
+
+        if len(index) < _HEADER.size:
+            index.close()
+            return
+        magic, version, count = _HEADER.unpack_from(index, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION or \
+                len(index) < _HEADER.size + count * _RECORD.size:
+            # Unknown or damaged index; the next refresh rebuilds it
+            index.close()
+            return
+        self._map = index
+        self._count = count
+        self._strings = _HEADER.size + count * _RECORD.size
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _key(self, index: int) -> bytes:
+        offset, length = struct.unpack_from("<2I", self._map, _HEADER.size + index * _RECORD.size)
+        start = self._strings + offset
+        return self._map[start:start + length]
+
+    def entry(self, index: int) -> CatalogEntry:
+        """Decode the record at `index` (records are sorted by name)"""
+        fields = _RECORD.unpack_from(self._map, _HEADER.size + index * _RECORD.size)
+        strings = [self._string(fields[i], fields[i + 1]) for i in range(2, 10, 2)]
+        name, race, classes, path = strings
+        level, mtime_ns, size, digest = fields[10:]
+        return CatalogEntry(name, race, classes, level, os.path.join(self.directory, path),
+                            mtime_ns, size, digest.hex())
+
+    def entries(self) -> List[CatalogEntry]:
+        """Every entry, sorted by name (decoded once per index file)"""
+        with self._lock:
+            if self._entries is None:
+                self._entries = [self.entry(index) for index in range(self._count)]
+            return self._entries
+
+    def find(self, name: str) -> List[CatalogEntry]:
+        """Entries whose name matches exactly, ignoring case (binary search)"""
+        key = _catalog_key(name)
+        with self._lock:
+            low, high = 0, self._count
+            while low < high:
+                middle = (low + high) // 2
+                if self._key(middle) < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            matches = []
+            while low < self._count and self._key(low) == key:
+                matches.append(self.entry(low))
+                low += 1
+            return matches
+
+    def search(self, query: str = "", race: str = "", class_name: str = "",
+               min_level: int = 0, max_level: int = 20) -> List[CatalogEntry]:
+        """Entries matching every given filter
+
+        `query` matches anywhere in the name; `race` and `class_name` match
+        anywhere in the race and classes strings. All matching ignores case.
+        """
+        query, race, class_name = query.casefold(), race.casefold(), class_name.casefold()
+        matches = []
+        for entry in self.entries():
+            if not min_level <= entry.level <= max_level:
+                continue
+            if query and query not in entry.name.casefold():
+                continue
+            if race and race not in entry.race.casefold():
+                continue
+            if class_name and class_name not in entry.classes.casefold():
+                continue
+            matches.append(entry)
+        return matches
+
+    def is_stale(self) -> bool:
+        """Whether files were added, removed or changed since the last refresh
+
+        Checks the directory's mtime, then the mtime and size of every file
+        seen by the last refresh (edits in place leave the directory alone).
+        """
+        try:
+            if os.stat(self.directory).st_mtime_ns != self.directory_mtime_ns:
+                return True
+            known = [(entry.path, entry.mtime_ns, entry.size) for entry in self.entries()]
+            known += [(path, mtime_ns, size) for path, (mtime_ns, size, _) in self._failed.items()]
+            for path, mtime_ns, size in known:
+                stat = os.stat(path)
+                if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                    return True
+            return False
+        except FileNotFoundError:
+            return True
+
+    def refresh(self) -> Tuple[int, int, int, Dict[str, str]]:
+        """Rescan the directory, re-reading only new or changed files
+
+        Returns (added, updated, removed, errors) where errors maps file
+        paths that could not be summarized to their error message. Such
+        files are only read again once they change.
+        """
+        with self._lock:
+            known = {entry.path: entry for entry in self.entries()}
+            entries = []
+            errors = {}
+            added = updated = 0
+
+            with os.scandir(self.directory) as scan:
+                files = sorted(item.path for item in scan
+                               if item.name.endswith((".json", BINARY_SUFFIX)) and item.is_file())
+            failed, self._failed = self._failed, {}
+            for path in files:
+                previous = known.pop(path, None)
+                stat = os.stat(path)
+                if previous is not None and previous.mtime_ns == stat.st_mtime_ns \
+                        and previous.size == stat.st_size:
+                    entries.append(previous)
+                    continue
+                failure = failed.get(path)
+                if failure is not None and failure[:2] == (stat.st_mtime_ns, stat.st_size):
+                    self._failed[path] = failure
+                    errors[path] = failure[2]
+                    continue
+                try:
+                    entries.append(summarize_file(path))
+                except (OSError, ValueError, TypeError, struct.error) as e:
+                    errors[path] = str(e)
+                    self._failed[path] = (stat.st_mtime_ns, stat.st_size, str(e))
+                    continue
+                if previous is None:
+                    added += 1
+                else:
+                    updated += 1
+
+            removed = len(known)
+            if added or updated or removed or self._map is None:
+                self._write(entries)
+            # Taken after writing, since the index itself lives in the directory
+            self.directory_mtime_ns = os.stat(self.directory).st_mtime_ns
+            return added, updated, removed, errors
+
+    def _write(self, entries: List[CatalogEntry]) -> None:
+        """Write a new index file atomically and map it"""
+        entries = sorted(entries, key=lambda entry: (_catalog_key(entry.name), entry.path))
+        strings = bytearray()
+        records = bytearray()
+
+        def add_string(text: str) -> Tuple[int, int]:
+            encoded = text.encode("utf-8")
+            offset = len(strings)
+            strings.extend(encoded)
+            return offset, len(encoded)
+
+        for entry in entries:
+            fields = []
+            for text in (entry.name.casefold(), entry.name, entry.race, entry.classes,
+                         os.path.relpath(entry.path, self.directory)):
+                fields.extend(add_string(text))
+            records.extend(_RECORD.pack(*fields, entry.level, entry.mtime_ns, entry.size,
+                                        bytes.fromhex(entry.content_hash)))
+
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, len(entries)))
+            file.write(records)
+            file.write(strings)
+        self.close()
+        os.replace(temp_path, self.index_path)
+        self._open()
@@ -1,9 +1,88 @@
 import json
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, NamedTuple, Tuple, Union
+
+try:
+    from .attacks import AttackProfile, build_attack_profiles
+    from .binary import BINARY_SUFFIX, decode_character, encode_character, is_binary
+    from .constants import SKILL_ABILITIES
+    from .journal import has_journal, replay
+    from .saver import write_atomically
+    from .serialization import dumps
+except ImportError:
+    from src.dnd_mcp.attacks import AttackProfile, build_attack_profiles
+    from src.dnd_mcp.binary import BINARY_SUFFIX, decode_character, encode_character, is_binary
+    from src.dnd_mcp.constants import SKILL_ABILITIES
+    from src.dnd_mcp.journal import has_journal, replay
+    from src.dnd_mcp.saver import write_atomically
+    from src.dnd_mcp.serialization import dumps
+
+
+class RollBonus(NamedTuple):
+    """Precomputed bonus for a skill check or saving throw"""
+    total: int
+    ability: str
+    ability_modifier: int
+    proficiency_bonus: int  # 0 when not proficient
+    is_proficient: bool
+
+
+_FIRST_MEMBER = re.compile(r'\s*\{\s*(?:(\})|"([^"\\]*(?:\\.[^"\\]*)*)"\s*:\s*)')
+_NEXT_MEMBER = re.compile(r'\s*(?:(\})|,\s*"([^"\\]*(?:\\.[^"\\]*)*)"\s*:\s*)')
+_scan_value = json.JSONDecoder().scan_once
+
+
+def _split_sections(text: str, deferred: frozenset) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Decode a top-level JSON object, keeping the deferred keys as raw JSON text
+    
+    Every value is still validated by the C scanner, but deferred values are
+    only kept as compact source slices rather than as nested dicts and lists.
+    """
+    core: Dict[str, Any] = {}
+    raw: Dict[str, str] = {}
+    pattern = _FIRST_MEMBER
+    index = 0
+    while True:
+        match = pattern.match(text, index)
+        if match is None:
+            raise json.JSONDecodeError("Expecting property name or '}'", text, index)
+        key = match.group(2)
+        if key is None:
+            return core, raw
+        if "\\" in key:
+            key = json.loads(f'"{key}"')
+        
+        start = match.end()
+        try:
+            value, index = _scan_value(text, start)
+        except StopIteration as e:
+            raise json.JSONDecodeError("Expecting value", text, e.value) from None
+        if key in deferred:
+            raw[key] = text[start:index]
+        else:
+            core[key] = value
+        pattern = _NEXT_MEMBER
+
+
+def _normalize_skill(name: str) -> str:
+    """Normalize a skill key as written in character files, e.g. "Sleight of Hand" -> "sleight_of_hand" """
+    return name.lower().replace(" ", "_")
 
 
 class Character:
+    # Fields the derived stat table is computed from; assigning any of them
+    # invalidates the table (changes made in place need touch())
+    DERIVED_SOURCES = frozenset({"ability_scores", "classes", "skills", "saving_throws"})
+    
+    # Sections a lazy load leaves as raw JSON until first accessed
+    LAZY_SECTIONS = frozenset({"spells", "equipment", "weapons", "details", "feats", "background"})
+    
     def __init__(self):
+        # Incremented by every change to the character's data
+        self.__dict__["version"] = 0
+        self._derived: Optional[Dict[str, Any]] = None
+        self._attack_profiles: Optional[Tuple[int, Dict[str, AttackProfile], Dict[str, str]]] = None
+        
         # Basic character info
         self.name: Optional[str] = None
         self.nickname: Optional[str] = None
@@ -49,25 +128,98 @@ class Character:
             "pp": 0, "ep": 0, "gp": 0, "sp": 0, "cp": 0
         }
     
-    def load(self, file_path: str) -> None:
-        """Load character data from a JSON file."""
+    def load(self, file_path: str, lazy: bool = False) -> None:
+        """Load character data from a JSON or binary file (detected from its content).
+        
+        With lazy=True, the sections in LAZY_SECTIONS are kept as raw JSON
+        text and only turned into objects when first accessed. Binary files
+        then skip those sections outright; JSON must still be scanned in
+        full, which is slower than parsing it but holds less memory.
+        
+        Changes journaled since the file was last written are replayed on
+        top of it (the load is then never lazy).
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            with open(file_path, 'rb') as file:
+                content = file.read()
+            if is_binary(content):
+                self._load_binary(content, lazy, file_path)
+                return
+            if has_journal(file_path):
+                data = json.loads(content)
+                replay(data, file_path)
+                self._load_from_dict(data)
+            elif lazy:
+                self._load_lazy(content.decode('utf-8'))
+            else:
+                data = json.loads(content)
                 self._load_from_dict(data)
         except FileNotFoundError:
             raise FileNotFoundError(f"Character file not found: {file_path}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in character file: {e}")
     
-    def load_from_json(self, json_string: str) -> None:
+    def load_binary(self, file_path: str, lazy: bool = False) -> None:
+        """Load character data from a binary file written by write_binary.
+        
+        Journaled changes are replayed as in load().
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Character file not found: {file_path}")
+        try:
+            self._load_binary(content, lazy, file_path)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid section in binary character file: {e}")
+    
+    def _load_binary(self, content: bytes, lazy: bool, file_path: Optional[str] = None) -> None:
+        """Load packed fields and sections, keeping LAZY_SECTIONS as text if lazy."""
+        data, sections = decode_character(content)
+        journaled = file_path is not None and has_journal(file_path)
+        deferred = {}
+        for name, text in sections.items():
+            if lazy and not journaled and name in self.LAZY_SECTIONS:
+                deferred[name] = text
+            else:
+                data[name] = json.loads(text)
+        if journaled:
+            replay(data, file_path)
+        self._load_from_dict(data)
+        if lazy and not journaled:
+            for name in deferred:
+                del self.__dict__[name]
+            self.__dict__["_deferred"] = deferred
+    
+    def load_from_json(self, json_string: str, lazy: bool = False) -> None:
         """Load character data from a JSON string."""
         try:
-            data = json.loads(json_string)
-            self._load_from_dict(data)
+            if lazy:
+                self._load_lazy(json_string)
+            else:
+                data = json.loads(json_string)
+                self._load_from_dict(data)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON string: {e}")
     
+    def _load_lazy(self, json_string: str) -> None:
+        """Load core fields now and keep LAZY_SECTIONS as raw JSON text."""
+        data, deferred = _split_sections(json_string, self.LAZY_SECTIONS)
+        self._load_from_dict(data)
+        for name in deferred:
+            del self.__dict__[name]
+        self.__dict__["_deferred"] = deferred
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only called for missing attributes: decode a deferred section on first access
+        deferred = self.__dict__.get("_deferred")
+        if deferred and name in deferred:
+            # Decoding is not a change, so the version stays
+            value = self.__dict__[name] = json.loads(deferred.pop(name))
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+    
     def _load_from_dict(self, data: Dict[str, Any]) -> None:
         """Load character data from a dictionary."""
         # Basic info
@@ -122,16 +274,32 @@ class Character:
         })
     
     def write(self, file_path: str, indent: int = 4) -> None:
-        """Write character data to a JSON file."""
+        """Write character data to a JSON file (atomically, via a temporary file)."""
+        try:
+            write_atomically(file_path, self.to_json(indent))
+        except IOError as e:
+            raise IOError(f"Error writing character file: {e}")
+    
+    def write_binary(self, file_path: str) -> None:
+        """Write character data to a binary file (atomically, via a temporary file)."""
         try:
-            with open(file_path, 'w', encoding='utf-8') as file:
-                json.dump(self.to_dict(), file, indent=indent, ensure_ascii=False)
+            write_atomically(file_path, self.to_binary())
         except IOError as e:
             raise IOError(f"Error writing character file: {e}")
     
+    def to_binary(self) -> bytes:
+        """Convert character data to the compact binary format."""
+        return encode_character(self)
+    
+    def serialize(self, file_path: str) -> Union[str, bytes]:
+        """Contents for a character file: binary for *.dndb paths, JSON otherwise."""
+        if file_path.endswith(BINARY_SUFFIX):
+            return self.to_binary()
+        return self.to_json()
+    
     def to_json(self, indent: int = 4) -> str:
         """Convert character data to JSON string."""
-        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+        return dumps(self.to_dict(), indent=indent)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert character data to dictionary, excluding None values where appropriate."""
@@ -208,19 +376,113 @@ class Character:
         
         return character_dict
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        attributes = self.__dict__
+        attributes[name] = value
+        if name.startswith("_") or name == "version":
+            return
+        if "_deferred" in attributes:
+            attributes["_deferred"].pop(name, None)
+        if name in self.DERIVED_SOURCES:
+            attributes["_derived"] = None
+        attributes["version"] += 1
+    
+    def touch(self) -> None:
+        """Record a change made in place, such as hit_points["current"] = 5.
+        
+        Assignments to fields are recorded automatically; changes inside a
+        field's dicts and lists are not, so call this after making them.
+        It bumps the version and marks the derived stat table stale.
+        """
+        self.__dict__["_derived"] = None
+        self.__dict__["version"] += 1
+    
+    @property
+    def derived_stats(self) -> Dict[str, Any]:
+        """Level, proficiency bonus, ability modifiers, skill and save bonuses.
+        
+        Built lazily and cached until ability scores, classes, skills or
+        saving throws are assigned, or touch() is called.
+        """
+        if self._derived is None:
+            self._derived = self._build_derived_stats()
+        return self._derived
+    
+    def _build_derived_stats(self) -> Dict[str, Any]:
+        """Compute the derived stat table from the raw character data."""
+        level = sum(cls.get("level", 0) for cls in self.classes)
+        proficiency_bonus = 2 + ((level - 1) // 4)
+        ability_modifiers = {ability.lower(): (score - 10) // 2
+                             for ability, score in self.ability_scores.items()}
+        
+        proficient_skills = {_normalize_skill(skill) for skill, value in self.skills.items() if value}
+        skills = {}
+        for skill, ability in SKILL_ABILITIES.items():
+            is_proficient = skill in proficient_skills
+            bonus = proficiency_bonus if is_proficient else 0
+            modifier = ability_modifiers.get(ability, 0)
+            skills[skill] = RollBonus(modifier + bonus, ability, modifier, bonus, is_proficient)
+        
+        proficient_saves = {ability.lower() for ability, value in self.saving_throws.items() if value}
+        saving_throws = {}
+        for ability, modifier in ability_modifiers.items():
+            is_proficient = ability in proficient_saves
+            bonus = proficiency_bonus if is_proficient else 0
+            saving_throws[ability] = RollBonus(modifier + bonus, ability, modifier, bonus, is_proficient)
+        
+        return {
+            "level": level,
+            "proficiency_bonus": proficiency_bonus,
+            "ability_modifiers": ability_modifiers,
+            "skills": skills,
+            "saving_throws": saving_throws
+        }
+    
     def get_level(self) -> int:
         """Calculate total character level from all classes."""
-        return sum(cls.get("level", 0) for cls in self.classes)
+        return self.derived_stats["level"]
     
     def get_ability_modifier(self, ability: str) -> int:
         """Calculate ability modifier for a given ability score."""
-        score = self.ability_scores.get(ability.lower(), 10)
-        return (score - 10) // 2
+        return self.derived_stats["ability_modifiers"].get(ability.lower(), 0)
     
     def get_proficiency_bonus(self) -> int:
         """Calculate proficiency bonus based on character level."""
-        level = self.get_level()
-        return 2 + ((level - 1) // 4)
+        return self.derived_stats["proficiency_bonus"]
+    
+    def get_skill_bonus(self, skill: str) -> Optional[RollBonus]:
+        """Get the precomputed bonus for a skill check, or None for unknown skills."""
+        return self.derived_stats["skills"].get(_normalize_skill(skill))
+    
+    def get_saving_throw_bonus(self, ability: str) -> Optional[RollBonus]:
+        """Get the precomputed bonus for a saving throw, or None for unknown abilities."""
+        return self.derived_stats["saving_throws"].get(ability.lower())
+    
+    @property
+    def attack_profiles(self) -> Dict[str, AttackProfile]:
+        """Attack profiles of every weapon, keyed by lowercase weapon name.
+        
+        Built lazily and cached until the character's version changes (call
+        touch() after editing a weapon's nested data in place).
+        """
+        return self._cached_attack_profiles()[1]
+    
+    @property
+    def attack_profile_errors(self) -> Dict[str, str]:
+        """Why weapons left out of attack_profiles could not be parsed, keyed by lowercase weapon name."""
+        return self._cached_attack_profiles()[2]
+    
+    def _cached_attack_profiles(self) -> Tuple[int, Dict[str, AttackProfile], Dict[str, str]]:
+        cached = self._attack_profiles
+        if cached is None or cached[0] != self.version:
+            errors: Dict[str, str] = {}
+            cached = self._attack_profiles = (self.version, build_attack_profiles(self, errors), errors)
+        return cached
+    
+    def get_attack_profile(self, weapon: str) -> Optional[AttackProfile]:
+        """Get the precomputed attack profile of a weapon, or None for weapons the character lacks
+        or whose entry cannot be parsed (see attack_profile_errors)."""
+        return self.attack_profiles.get(weapon.lower())
     
     def __str__(self) -> str:
         """String representation of the character."""
@@ -0,0 +1,185 @@
+"""
+Combat encounters: initiative order and hit points for many combatants.
+
+Initiative is rolled for all combatants in one batch. The turn order of a
+round is a heap, so creatures summoned or killed mid-round are inserted or
+removed in O(log n) without re-sorting anyone else: removed creatures are
+left in the heap and skipped when they come up. Each new round rebuilds the
+heap from the surviving combatants.
+
+Combatants backed by a loaded character share that character's hit_points
+dict, so damage lands on the character sheet itself.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .dice import roll_d20_batch
+except ImportError:
+    from src.dnd_mcp.dice import roll_d20_batch
+
+
+@dataclass
+class Combatant:
+    """One creature in an encounter
+
+    Attributes:
+        name: Display name
+        hit_points: Dict with "max" and "current" (a character's own dict
+            for character-backed combatants)
+        initiative_bonus: Added to the initiative roll, and breaks ties
+        armor_class: Armor class, if known
+        character_id: Id of the loaded character, or None for monsters
+        initiative: Initiative total, rolled when added without one
+    """
+    name: str
+    hit_points: Dict[str, Any]
+    initiative_bonus: int = 0
+    armor_class: Optional[int] = None
+    character_id: Optional[str] = None
+    initiative: Optional[int] = None
+
+    @property
+    def current_hp(self) -> int:
+        return self.hit_points.get("current", 0)
+
+    @property
+    def max_hp(self) -> int:
+        return self.hit_points.get("max", 0)
+
+
+class HitPointChange(NamedTuple):
+    """Result of damage or healing applied to one combatant"""
+    combatant_id: str
+    old: int
+    new: int
+    defeated: bool
+
+
+# Heap entries: (turn order key, combatant id); keys are unique per entry
+_Entry = Tuple[Tuple[int, int, int], str]
+
+
+def roll_initiative(bonuses: List[int]) -> List[int]:
+    """Initiative totals for many combatants, rolled as one batch"""
+    if not bonuses:
+        return []
+    rolls = roll_d20_batch(len(bonuses))["result"]
+    return [int(roll) + bonus for roll, bonus in zip(rolls, bonuses)]
+
+
+class Encounter:
+    """Turn order and hit points of one fight
+
+    Higher initiative acts first, ties go to the higher initiative bonus and
+    then to whoever joined first. Monsters reduced to 0 hit points are
+    removed; characters stay in the order (they make death saves).
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.combatants: Dict[str, Combatant] = {}
+        self.round = 0
+        self.current: Optional[str] = None
+        self._turn_key: Optional[Tuple[int, int, int]] = None  # Of the latest turn this round
+        self._keys: Dict[str, Tuple[int, int, int]] = {}
+        self._pending: List[_Entry] = []  # Yet to act this round
+        self._joined = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.combatants)
+
+    def __contains__(self, combatant_id: str) -> bool:
+        return combatant_id in self.combatants
+
+    def add(self, combatants: Iterable[Tuple[str, Combatant]]) -> None:
+        """Add combatants by id, rolling initiative for those without one
+
+        Mid-round, a combatant whose initiative has not come up yet acts this
+        round; otherwise it first acts next round.
+        """
+        combatants = list(combatants)
+        for combatant_id, _ in combatants:
+            if combatant_id in self.combatants:
+                raise ValueError(f"Duplicate combatant id: {combatant_id}")
+        unrolled = [combatant for _, combatant in combatants if combatant.initiative is None]
+        for combatant, initiative in zip(unrolled, roll_initiative([c.initiative_bonus for c in unrolled])):
+            combatant.initiative = initiative
+
+        for combatant_id, combatant in combatants:
+            key = (-combatant.initiative, -combatant.initiative_bonus, next(self._joined))
+            self.combatants[combatant_id] = combatant
+            self._keys[combatant_id] = key
+            if self.round and (self._turn_key is None or key > self._turn_key):
+                heapq.heappush(self._pending, (key, combatant_id))
+
+    def remove(self, combatant_id: str) -> Combatant:
+        """Take a combatant out of the fight (its heap entry is skipped later)"""
+        combatant = self.combatants.pop(combatant_id)
+        del self._keys[combatant_id]
+        if self.current == combatant_id:
+            self.current = None
+        return combatant
+
+    def next_turn(self) -> Optional[str]:
+        """Advance to the next combatant's turn, starting a new round when needed
+
+        Returns the id of the combatant whose turn it is, or None when no
+        combatants are left.
+        """
+        while True:
+            while self._pending:
+                key, combatant_id = heapq.heappop(self._pending)
+                if self._keys.get(combatant_id) == key:
+                    self.current = combatant_id
+                    self._turn_key = key
+                    return combatant_id
+            if not self.combatants:
+                self.current = None
+                return None
+            self.round += 1
+            self.current = self._turn_key = None
+            self._pending = [(key, combatant_id) for combatant_id, key in self._keys.items()]
+            heapq.heapify(self._pending)
+
+    def apply(self, amounts: Dict[str, int]) -> List[HitPointChange]:
+        """Apply damage (positive) or healing (negative) to many combatants
+
+        Hit points are clamped to 0..max. Raises ValueError, changing
+        nothing, if any id is not in the encounter.
+        """
+        unknown = [combatant_id for combatant_id in amounts if combatant_id not in self.combatants]
+        if unknown:
+            raise ValueError(f"Unknown combatants: {unknown}")
+
+        changes = []
+        for combatant_id, amount in amounts.items():
+            combatant = self.combatants[combatant_id]
+            old = combatant.current_hp
+            new = min(max(old - amount, 0), combatant.max_hp)
+            combatant.hit_points["current"] = new
+            defeated = new == 0 and combatant.character_id is None
+            if defeated:
+                self.remove(combatant_id)
+            changes.append(HitPointChange(combatant_id, old, new, defeated))
+        return changes
+
+    def order(self) -> List[str]:
+        """Combatant ids in initiative order"""
+        return sorted(self._keys, key=self._keys.__getitem__)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact state: round, current turn and [id, initiative, hp, max hp] rows"""
+        return {
+            "encounter": self.name,
+            "round": self.round,
+            "turn": self.current,
+            "order": [
+                [combatant_id, self.combatants[combatant_id].initiative,
+                 self.combatants[combatant_id].current_hp, self.combatants[combatant_id].max_hp]
+                for combatant_id in self.order()
+            ]
+        }
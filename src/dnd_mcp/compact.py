@@ -0,0 +1,386 @@
+"""
+Compact character representation for large NPC and monster rosters.
+
+CompactCharacter holds the same data as Character in a fraction of the memory:
+core fields live in __slots__, ability scores are packed into six bytes, skill
+and saving throw proficiencies into integer bitmasks, and every other section
+is kept as one compact UTF-8 JSON blob that is only decoded when accessed.
+to_dict(), to_json() and write() produce exactly what Character would.
+
+CharacterRegistry(compact=True) keeps evicted characters in this form instead
+of spilling them to disk, and bulk_load(compact=True) yields it for rosters
+kept by the caller. The server tools work on Character only (they rely on
+its version counter and derived-stat caches); convert with to_character() to
+hand a roster entry to them.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    from .character import Character, RollBonus
+    from .constants import SKILL_ABILITIES
+except ImportError:
+    from src.dnd_mcp.character import Character, RollBonus
+    from src.dnd_mcp.constants import SKILL_ABILITIES
+
+
+ABILITIES = ("str", "dex", "con", "int", "wis", "cha")
+SKILLS = tuple(SKILL_ABILITIES)
+
+# Sections kept in the encoded blob, with the defaults Character uses when absent
+_SECTION_DEFAULTS = {
+    "player": lambda: {"name": "NPC", "id": None},
+    "race": dict,
+    "classes": list,
+    "background": dict,
+    "details": dict,
+    "speed": lambda: {"Walk": 30},
+    "weapon_proficiencies": list,
+    "armor_proficiencies": list,
+    "tool_proficiencies": list,
+    "feats": list,
+    "spells": list,
+    "weapons": list,
+    "equipment": list,
+    "languages": list,
+    "treasure": lambda: {"pp": 0, "ep": 0, "gp": 0, "sp": 0, "cp": 0},
+    # Fallbacks for packed fields whose data does not fit the packed form
+    "ability_scores": None,
+    "skills": None,
+    "saving_throws": None,
+    "hit_points": None,
+    "armor_class": None,
+}
+
+
+def _encode(sections: Dict[str, Any]) -> bytes:
+    return json.dumps(sections, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _pack_flags(flags: Dict[str, Any], names: tuple) -> Optional[int]:
+    """Pack {name: bool} into 2 bits per name (present, value)
+
+    Returns None unless every key is one of names, in that order, with a bool
+    value, since anything else could not be reproduced exactly.
+    """
+    bits = 0
+    last = -1
+    for key, value in flags.items():
+        if key not in names or not isinstance(value, bool):
+            return None
+        index = names.index(key)
+        if index <= last:
+            return None
+        last = index
+        bits |= (1 | (value << 1)) << (2 * index)
+    return bits
+
+
+def _unpack_flags(bits: int, names: tuple) -> Dict[str, bool]:
+    return {name: bool(bits >> (2 * i + 1) & 1) for i, name in enumerate(names) if bits >> (2 * i) & 1}
+
+
+def _total_level(classes: List[Dict[str, Any]]) -> int:
+    return sum(cls.get("level", 0) for cls in classes)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _section_property(name: str):
+    """Property decoding a blob section on first access"""
+    def getter(self):
+        sections = self._decoded_sections()
+        if name not in sections:
+            sections[name] = _SECTION_DEFAULTS[name]()
+        return sections[name]
+
+    def setter(self, value):
+        self._decoded_sections()[name] = value
+
+    return property(getter, setter, doc=f"The {name} section (decoded on first access)")
+
+
+class CompactCharacter:
+    """Memory-compact, slot-based equivalent of Character
+
+    Packed fields (ability_scores, skills, saving_throws, hit_points,
+    armor_class) are rebuilt as new dicts on every access, so update them by
+    assignment, e.g. npc.hit_points = {"max": 12, "current": 4}. Other
+    sections decode once and can be mutated in place; call compact() to
+    re-encode them. Use to_character() for extensive editing.
+    """
+    __slots__ = (
+        "name", "nickname", "alignment", "xp", "_level",
+        "_abilities", "_skill_bits", "_save_bits",
+        "_hp_max", "_hp_current", "_ac_value", "_ac_description",
+        "_sections",
+    )
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.nickname: Optional[str] = None
+        self.alignment: Optional[str] = None
+        self.xp: int = 0
+        self._level = 0
+        self._abilities: Optional[bytes] = bytes([10] * 6)
+        self._skill_bits: Optional[int] = 0
+        self._save_bits: Optional[int] = 0
+        self._hp_max: Optional[int] = 0
+        self._hp_current: Optional[int] = 0
+        self._ac_value: Optional[int] = 10
+        self._ac_description: Optional[str] = ""
+        self._sections: Any = b"{}"
+
+    @classmethod
+    def from_character(cls, character: Character) -> "CompactCharacter":
+        """Pack an existing Character"""
+        compact = cls()
+        compact._pack(character)
+        return compact
+
+    def load(self, file_path: str) -> None:
+        """Load character data from a JSON file."""
+        character = Character()
+        character.load(file_path)
+        self._pack(character)
+
+    def load_from_json(self, json_string: str) -> None:
+        """Load character data from a JSON string."""
+        character = Character()
+        character.load_from_json(json_string)
+        self._pack(character)
+
+    def to_character(self) -> Character:
+        """Expand into a regular Character"""
+        character = Character()
+        character._load_from_dict(self.to_dict())
+        return character
+
+    def _pack(self, character: Character) -> None:
+        """Pack a Character's data into this instance's slots"""
+        self.name = character.name
+        self.nickname = character.nickname
+        self.alignment = character.alignment
+        self.xp = character.xp
+        self._level = character.get_level()
+
+        sections = {}
+        for name, default in _SECTION_DEFAULTS.items():
+            if default is not None:
+                value = getattr(character, name)
+                if value != default():
+                    sections[name] = value
+
+        scores = character.ability_scores
+        if list(scores) == list(ABILITIES) and all(_is_int(v) and 0 <= v <= 255 for v in scores.values()):
+            self._abilities = bytes(scores.values())
+        else:
+            self._abilities = None
+            sections["ability_scores"] = scores
+
+        self._skill_bits = _pack_flags(character.skills, SKILLS)
+        if self._skill_bits is None:
+            sections["skills"] = character.skills
+
+        self._save_bits = _pack_flags(character.saving_throws, ABILITIES)
+        if self._save_bits is None:
+            sections["saving_throws"] = character.saving_throws
+
+        hp = character.hit_points
+        if list(hp) == ["max", "current"] and _is_int(hp["max"]) and _is_int(hp["current"]):
+            self._hp_max, self._hp_current = hp["max"], hp["current"]
+        else:
+            self._hp_max = self._hp_current = None
+            sections["hit_points"] = hp
+
+        ac = character.armor_class
+        if (list(ac) == ["value", "description"] and _is_int(ac["value"])
+                and isinstance(ac["description"], str)):
+            self._ac_value, self._ac_description = ac["value"], ac["description"]
+        else:
+            self._ac_value = self._ac_description = None
+            sections["armor_class"] = ac
+
+        self._sections = _encode(sections)
+
+    def _decoded_sections(self) -> Dict[str, Any]:
+        if isinstance(self._sections, bytes):
+            self._sections = json.loads(self._sections)
+        return self._sections
+
+    def compact(self) -> None:
+        """Re-encode decoded sections to release their memory"""
+        if not isinstance(self._sections, bytes):
+            # Classes may have been edited in place since they were decoded
+            self._level = _total_level(self._sections.get("classes", []))
+            sections = {name: value for name, value in self._sections.items()
+                        if _SECTION_DEFAULTS[name] is None or value != _SECTION_DEFAULTS[name]()}
+            self._sections = _encode(sections)
+
+    player = _section_property("player")
+    race = _section_property("race")
+    classes = _section_property("classes")
+
+    @classes.setter
+    def classes(self, classes: List[Dict[str, Any]]) -> None:
+        self._decoded_sections()["classes"] = classes
+        self._level = _total_level(classes)
+
+    background = _section_property("background")
+    details = _section_property("details")
+    speed = _section_property("speed")
+    weapon_proficiencies = _section_property("weapon_proficiencies")
+    armor_proficiencies = _section_property("armor_proficiencies")
+    tool_proficiencies = _section_property("tool_proficiencies")
+    feats = _section_property("feats")
+    spells = _section_property("spells")
+    weapons = _section_property("weapons")
+    equipment = _section_property("equipment")
+    languages = _section_property("languages")
+    treasure = _section_property("treasure")
+
+    @property
+    def ability_scores(self) -> Dict[str, Any]:
+        if self._abilities is None:
+            return self._decoded_sections()["ability_scores"]
+        return dict(zip(ABILITIES, self._abilities))
+
+    @ability_scores.setter
+    def ability_scores(self, scores: Dict[str, Any]) -> None:
+        if list(scores) == list(ABILITIES) and all(_is_int(v) and 0 <= v <= 255 for v in scores.values()):
+            self._abilities = bytes(scores.values())
+            self._decoded_sections().pop("ability_scores", None)
+        else:
+            self._abilities = None
+            self._decoded_sections()["ability_scores"] = scores
+
+    @property
+    def skills(self) -> Dict[str, Any]:
+        if self._skill_bits is None:
+            return self._decoded_sections()["skills"]
+        return _unpack_flags(self._skill_bits, SKILLS)
+
+    @skills.setter
+    def skills(self, skills: Dict[str, Any]) -> None:
+        self._skill_bits = _pack_flags(skills, SKILLS)
+        if self._skill_bits is None:
+            self._decoded_sections()["skills"] = skills
+        else:
+            self._decoded_sections().pop("skills", None)
+
+    @property
+    def saving_throws(self) -> Dict[str, Any]:
+        if self._save_bits is None:
+            return self._decoded_sections()["saving_throws"]
+        return _unpack_flags(self._save_bits, ABILITIES)
+
+    @saving_throws.setter
+    def saving_throws(self, saving_throws: Dict[str, Any]) -> None:
+        self._save_bits = _pack_flags(saving_throws, ABILITIES)
+        if self._save_bits is None:
+            self._decoded_sections()["saving_throws"] = saving_throws
+        else:
+            self._decoded_sections().pop("saving_throws", None)
+
+    @property
+    def hit_points(self) -> Dict[str, Any]:
+        if self._hp_max is None:
+            return self._decoded_sections()["hit_points"]
+        return {"max": self._hp_max, "current": self._hp_current}
+
+    @hit_points.setter
+    def hit_points(self, hit_points: Dict[str, Any]) -> None:
+        if (list(hit_points) == ["max", "current"] and _is_int(hit_points["max"])
+                and _is_int(hit_points["current"])):
+            self._hp_max, self._hp_current = hit_points["max"], hit_points["current"]
+            self._decoded_sections().pop("hit_points", None)
+        else:
+            self._hp_max = self._hp_current = None
+            self._decoded_sections()["hit_points"] = hit_points
+
+    @property
+    def armor_class(self) -> Dict[str, Any]:
+        if self._ac_value is None:
+            return self._decoded_sections()["armor_class"]
+        return {"value": self._ac_value, "description": self._ac_description}
+
+    @armor_class.setter
+    def armor_class(self, armor_class: Dict[str, Any]) -> None:
+        if (list(armor_class) == ["value", "description"] and _is_int(armor_class["value"])
+                and isinstance(armor_class["description"], str)):
+            self._ac_value, self._ac_description = armor_class["value"], armor_class["description"]
+            self._decoded_sections().pop("armor_class", None)
+        else:
+            self._ac_value = self._ac_description = None
+            self._decoded_sections()["armor_class"] = armor_class
+
+    def set_current_hit_points(self, current: int) -> None:
+        """Update current hit points without unpacking"""
+        if self._hp_max is None:
+            self._decoded_sections()["hit_points"]["current"] = current
+        else:
+            self._hp_current = current
+
+    # Serialization is shared with Character, so output is identical
+    to_dict = Character.to_dict
+    to_json = Character.to_json
+    write = Character.write
+
+    def get_level(self) -> int:
+        """Calculate total character level from all classes."""
+        if isinstance(self._sections, bytes):
+            return self._level
+        return _total_level(self.classes)
+
+    def get_ability_modifier(self, ability: str) -> int:
+        """Calculate ability modifier for a given ability score."""
+        ability = ability.lower()
+        if self._abilities is not None:
+            if ability not in ABILITIES:
+                return 0
+            return (self._abilities[ABILITIES.index(ability)] - 10) // 2
+        scores = {key.lower(): value for key, value in self.ability_scores.items()}
+        return (scores[ability] - 10) // 2 if ability in scores else 0
+
+    def get_proficiency_bonus(self) -> int:
+        """Calculate proficiency bonus based on character level."""
+        return 2 + ((self.get_level() - 1) // 4)
+
+    def _bonus(self, ability: str, is_proficient: bool) -> RollBonus:
+        modifier = self.get_ability_modifier(ability)
+        bonus = self.get_proficiency_bonus() if is_proficient else 0
+        return RollBonus(modifier + bonus, ability, modifier, bonus, is_proficient)
+
+    def get_skill_bonus(self, skill: str) -> Optional[RollBonus]:
+        """Get the bonus for a skill check, or None for unknown skills."""
+        skill = skill.lower().replace(" ", "_")
+        if skill not in SKILL_ABILITIES:
+            return None
+        if self._skill_bits is not None:
+            index = SKILLS.index(skill)
+            is_proficient = bool(self._skill_bits >> (2 * index + 1) & 1)
+        else:
+            is_proficient = any(value and key.lower().replace(" ", "_") == skill
+                                for key, value in self.skills.items())
+        return self._bonus(SKILL_ABILITIES[skill], is_proficient)
+
+    def get_saving_throw_bonus(self, ability: str) -> Optional[RollBonus]:
+        """Get the bonus for a saving throw, or None for unknown abilities."""
+        ability = ability.lower()
+        if ability not in {key.lower() for key in self.ability_scores}:
+            return None
+        if self._save_bits is not None and ability in ABILITIES:
+            is_proficient = bool(self._save_bits >> (2 * ABILITIES.index(ability) + 1) & 1)
+        else:
+            is_proficient = any(value and key.lower() == ability
+                                for key, value in self.saving_throws.items())
+        return self._bonus(ability, is_proficient)
+
+    def __str__(self) -> str:
+        return Character.__str__(self)
+
+    def __repr__(self) -> str:
+        return f"CompactCharacter(name='{self.name}', level={self.get_level()})"
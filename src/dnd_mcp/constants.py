@@ -53,3 +53,44 @@ COMMON_MODIFIERS = {
         "description": "Feat allowing rerolls (use advantage/disadvantage)"
     }
 }
+
+# D&D 5e weapon categories, used when a weapon on a sheet has no "type"
+WEAPON_TYPES: Dict[str, str] = {
+    "club": "Simple Melee",
+    "dagger": "Simple Melee",
+    "greatclub": "Simple Melee",
+    "handaxe": "Simple Melee",
+    "javelin": "Simple Melee",
+    "light hammer": "Simple Melee",
+    "mace": "Simple Melee",
+    "quarterstaff": "Simple Melee",
+    "sickle": "Simple Melee",
+    "spear": "Simple Melee",
+    "light crossbow": "Simple Ranged",
+    "dart": "Simple Ranged",
+    "shortbow": "Simple Ranged",
+    "sling": "Simple Ranged",
+    "battleaxe": "Martial Melee",
+    "flail": "Martial Melee",
+    "glaive": "Martial Melee",
+    "greataxe": "Martial Melee",
+    "greatsword": "Martial Melee",
+    "halberd": "Martial Melee",
+    "lance": "Martial Melee",
+    "longsword": "Martial Melee",
+    "maul": "Martial Melee",
+    "morningstar": "Martial Melee",
+    "pike": "Martial Melee",
+    "rapier": "Martial Melee",
+    "scimitar": "Martial Melee",
+    "shortsword": "Martial Melee",
+    "trident": "Martial Melee",
+    "war pick": "Martial Melee",
+    "warhammer": "Martial Melee",
+    "whip": "Martial Melee",
+    "blowgun": "Martial Ranged",
+    "hand crossbow": "Martial Ranged",
+    "heavy crossbow": "Martial Ranged",
+    "longbow": "Martial Ranged",
+    "net": "Martial Ranged"
+}
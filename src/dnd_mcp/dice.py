@@ -5,11 +5,51 @@ This module provides classes and functions for handling complex D&D 5e dice roll
 including advantage, disadvantage, and various modifiers like bardic inspiration.
 """
 
-import random
-from typing import Dict, List, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python engine is used instead
+    np = None
+
+try:
+    from .rng import DiceRNG, ReplayRNG
+except ImportError:
+    from src.dnd_mcp.rng import DiceRNG, ReplayRNG
+
+
+# Below this many dice per draw, random.choices beats NumPy's per-call overhead
+NUMPY_BATCH_THRESHOLD = 64
+
+# Faces of every die up to a d100, built once rather than on every draw
+_FACES = [range(1, sides + 1) for sides in range(101)]
+
+# Number of distinct modifier strings whose compiled plans are kept
+MODIFIER_PLAN_CACHE_SIZE = 1024
+
+# Stream rolls draw from unless one is passed in; use_rng() swaps it for a block
+_current_rng: ContextVar[Union[DiceRNG, ReplayRNG]] = ContextVar("dice_rng", default=DiceRNG())
+
+
+def get_rng() -> Union[DiceRNG, ReplayRNG]:
+    """The dice stream rolls currently draw from"""
+    return _current_rng.get()
+
+
+@contextmanager
+def use_rng(rng: Union[DiceRNG, ReplayRNG]):
+    """Draw every roll inside the block from rng (per thread and async task)"""
+    token = _current_rng.set(rng)
+    try:
+        yield rng
+    finally:
+        _current_rng.reset(token)
+
 
 class RollType(Enum):
     """Type of d20 roll"""
@@ -22,21 +62,16 @@ class RollType(Enum):
 class DiceModifier:
     """Represents a dice modifier like bardic inspiration, guidance, etc."""
     name: str
-    dice: str  # e.g., "1d4", "1d6", "1d8", "1d10", "1d12"
+    dice: str  # e.g., "1d4", "1d8", or any dice expression such as "2d6r2" or "4d6kh3"
     description: str = ""
     
-    def roll(self) -> Dict[str, Any]:
+    def compile(self) -> "DiceExpression":
+        """Compile the dice string (cached per expression)"""
+        return compile_dice(self.dice)
+    
+    def roll(self, rng=None) -> Dict[str, Any]:
         """Roll this dice modifier"""
-        # Parse dice string (e.g., "1d6" -> num=1, sides=6)
-        if 'd' not in self.dice:
-            raise ValueError(f"Invalid dice format: {self.dice}")
-        
-        num_str, sides_str = self.dice.split('d')
-        num_dice = int(num_str) if num_str else 1
-        sides = int(sides_str)
-        
-        rolls = [random.randint(1, sides) for _ in range(num_dice)]
-        total = sum(rolls)
+        total, rolls = self.compile().roll(rng)
         
         return {
             "name": self.name,
@@ -72,21 +107,194 @@ class RollModifiers:
         """Get total of all flat modifiers"""
         return sum(mod.value for mod in self.flat_modifiers)
     
-    def roll_dice_modifiers(self) -> List[Dict[str, Any]]:
+    def roll_dice_modifiers(self, rng=None) -> List[Dict[str, Any]]:
         """Roll all dice modifiers and return results"""
-        return [mod.roll() for mod in self.dice_modifiers]
+        return [mod.roll(rng) for mod in self.dice_modifiers]
     
-    def get_dice_total(self) -> int:
+    def get_dice_total(self, rng=None) -> int:
         """Get total from all dice modifier rolls"""
-        return sum(result["total"] for result in self.roll_dice_modifiers())
+        return sum(result["total"] for result in self.roll_dice_modifiers(rng))
+    
+    def roll_dice_modifiers_batch(self, n: int, rng=None):
+        """Roll all dice modifiers n times and return the n combined totals"""
+        return self.compile().roll_dice_modifiers_batch(n, rng)
+    
+    def compile(self) -> "RollPlan":
+        """Pre-parse these modifiers into an immutable RollPlan"""
+        flat_total = 0
+        flat_breakdown = []
+        for mod in self.flat_modifiers:
+            flat_total += mod.value
+            sign = "+" if mod.value >= 0 else ""
+            flat_breakdown.append(f"{sign}{mod.value} ({mod.name})")
+        
+        return RollPlan(
+            roll_type=self.roll_type,
+            flat_modifiers=tuple((mod.name, mod.value, mod.description)
+                                 for mod in self.flat_modifiers),
+            dice_modifiers=tuple((mod.name, mod.dice, mod.description, mod.compile())
+                                 for mod in self.dice_modifiers),
+            flat_total=flat_total,
+            flat_breakdown=tuple(flat_breakdown)
+        )
+
+
+@dataclass(frozen=True)
+class RollPlan:
+    """Immutable, hashable, pre-parsed form of RollModifiers
+    
+    Dice expressions are already compiled, flat modifiers are summed
+    and their breakdown fragments rendered, so rolling does no parsing.
+    """
+    roll_type: RollType = RollType.NORMAL
+    flat_modifiers: Tuple[Tuple[str, int, str], ...] = ()  # (name, value, description)
+    dice_modifiers: Tuple[Tuple[str, str, str, "DiceExpression"], ...] = ()  # (name, dice, description, compiled)
+    flat_total: int = 0
+    flat_breakdown: Tuple[str, ...] = ()
+    
+    @property
+    def dice(self) -> Tuple["DiceExpression", ...]:
+        """Compiled expression of every dice modifier"""
+        return tuple(expression for _, _, _, expression in self.dice_modifiers)
+    
+    def get_flat_total(self) -> int:
+        """Get total of all flat modifiers"""
+        return self.flat_total
+    
+    def roll_dice_modifiers(self, rng=None) -> List[Dict[str, Any]]:
+        """Roll all dice modifiers and return results"""
+        results = []
+        for name, dice, description, expression in self.dice_modifiers:
+            total, rolls = expression.roll(rng)
+            results.append({
+                "name": name,
+                "dice": dice,
+                "rolls": rolls,
+                "total": total,
+                "description": description
+            })
+        return results
+    
+    def roll_dice_modifiers_batch(self, n: int, rng=None):
+        """Roll all dice modifiers n times and return the n combined totals"""
+        totals = _zeros(n)
+        for expression in self.dice:
+            totals = _add(totals, expression.evaluate_batch(n, rng))
+        return totals
+    
+    def to_modifiers(self) -> RollModifiers:
+        """Expand back into a mutable RollModifiers object"""
+        return RollModifiers(
+            [FlatModifier(name, value, description) for name, value, description in self.flat_modifiers],
+            [DiceModifier(name, dice, description) for name, dice, description, _ in self.dice_modifiers],
+            self.roll_type
+        )
+
+
+def _as_plan(modifiers) -> RollPlan:
+    """Accept either RollModifiers or an already compiled RollPlan"""
+    return modifiers if isinstance(modifiers, RollPlan) else modifiers.compile()
 
 
-def roll_d20(roll_type: RollType = RollType.NORMAL) -> Dict[str, Any]:
-    """Roll a d20 with optional advantage/disadvantage"""
-    roll1 = random.randint(1, 20)
+def _draw_faces(sides: int, size: int, rng=None) -> Sequence[int]:
+    """Draw `size` independent faces of a die with `sides` sides.
+    
+    Small draws go through the stream's `choices`, which is cheaper than a
+    NumPy call; large draws are vectorized when NumPy is
+    installed.
+    """
+    if rng is None:
+        rng = _current_rng.get()
+    if size < NUMPY_BATCH_THRESHOLD or np is None:
+        return rng.choices(_FACES[sides] if 0 <= sides <= 100 else range(1, sides + 1), k=size)
+    return rng.integers(1, sides + 1, size=size)
+
+
+def _zeros(n: int):
+    return np.zeros(n, dtype=np.int64) if np is not None else [0] * n
+
+
+def _add(left, right):
+    if np is not None:
+        return left + right
+    return [a + b for a, b in zip(left, right)]
+
+
+def roll_dice_batch(sides: int, count: int, n: int, rng=None):
+    """Roll n groups of `count` dice with `sides` faces in a single draw
+    
+    Returns an (n, count) integer array when NumPy is installed,
+    otherwise a list of n lists.
+    """
+    if sides < 1 or count < 1 or n < 0:
+        raise ValueError(f"Invalid batch roll: {n} x {count}d{sides}")
+    faces = _draw_faces(sides, n * count, rng)
+    if np is not None:
+        return np.asarray(faces, dtype=np.int64).reshape(n, count)
+    return [faces[i * count:(i + 1) * count] for i in range(n)]
+
+
+def roll_d20_batch(n: int, roll_type: RollType = RollType.NORMAL, rng=None) -> Dict[str, Any]:
+    """Roll n d20s with optional advantage/disadvantage applied to each
+    
+    Returns a dict with "result" (the n used rolls) and "rolls" (n rows of
+    one or two raw d20s), as arrays when NumPy is installed.
+    """
+    width = 1 if roll_type == RollType.NORMAL else 2
+    rolls = roll_dice_batch(20, width, n, rng)
+    
+    if np is not None:
+        if roll_type == RollType.ADVANTAGE:
+            results = rolls.max(axis=1)
+        elif roll_type == RollType.DISADVANTAGE:
+            results = rolls.min(axis=1)
+        else:
+            results = rolls[:, 0]
+    else:
+        if roll_type == RollType.ADVANTAGE:
+            results = [max(row) for row in rolls]
+        elif roll_type == RollType.DISADVANTAGE:
+            results = [min(row) for row in rolls]
+        else:
+            results = [row[0] for row in rolls]
+    
+    return {"result": results, "rolls": rolls, "type": roll_type.value}
+
+
+def perform_roll_batch(base_modifier: int, modifiers: Union[RollModifiers, RollPlan],
+                       n: int, rng=None) -> Dict[str, Any]:
+    """Perform n complete rolls at once, without per-roll breakdowns
+    
+    Returns the n d20 results, dice modifier totals and final totals.
+    """
+    modifiers = _as_plan(modifiers)
+    d20_results = roll_d20_batch(n, modifiers.roll_type, rng)["result"]
+    dice_totals = modifiers.roll_dice_modifiers_batch(n, rng)
+    offset = base_modifier + modifiers.get_flat_total()
+    
+    if np is not None:
+        totals = d20_results + dice_totals + offset
+    else:
+        totals = [d20 + dice + offset for d20, dice in zip(d20_results, dice_totals)]
+    
+    return {
+        "d20": d20_results,
+        "dice_total": dice_totals,
+        "total": totals
+    }
+
+
+def roll_d20(roll_type: RollType = RollType.NORMAL, rng=None) -> Dict[str, Any]:
+    """Roll a d20 with optional advantage/disadvantage
+    
+    Draws from rng, or the current stream (get_rng()) when not given.
+    """
+    if roll_type == RollType.NORMAL:
+        roll1, = _draw_faces(20, 1, rng)
+    else:
+        roll1, roll2 = _draw_faces(20, 2, rng)
     
     if roll_type == RollType.ADVANTAGE:
-        roll2 = random.randint(1, 20)
         result = max(roll1, roll2)
         return {
             "result": result,
@@ -95,7 +303,6 @@ def roll_d20(roll_type: RollType = RollType.NORMAL) -> Dict[str, Any]:
             "used_roll": result
         }
     elif roll_type == RollType.DISADVANTAGE:
-        roll2 = random.randint(1, 20)
         result = min(roll1, roll2)
         return {
             "result": result,
@@ -112,27 +319,33 @@ def roll_d20(roll_type: RollType = RollType.NORMAL) -> Dict[str, Any]:
         }
 
 
-def perform_roll(base_modifier: int, modifiers: RollModifiers, roll_name: str) -> Dict[str, Any]:
-    """Perform a complete roll with all modifiers"""
+def perform_roll(base_modifier: int, modifiers: Union[RollModifiers, RollPlan],
+                 roll_name: str, rng=None) -> Dict[str, Any]:
+    """Perform a complete roll with all modifiers
+    
+    Pass a RollPlan from compile_modifiers() to skip all modifier parsing.
+    Every die is drawn from rng, or the current stream when not given.
+    """
+    modifiers = _as_plan(modifiers)
+    if rng is None:
+        rng = _current_rng.get()
+    
     # Roll the d20
-    d20_result = roll_d20(modifiers.roll_type)
+    d20_result = roll_d20(modifiers.roll_type, rng)
     
     # Roll dice modifiers
-    dice_results = modifiers.roll_dice_modifiers()
+    dice_results = modifiers.roll_dice_modifiers(rng)
     dice_total = sum(result["total"] for result in dice_results)
     
     # Calculate totals
-    flat_total = modifiers.get_flat_total()
-    total = d20_result["result"] + base_modifier + flat_total + dice_total
+    total = d20_result["result"] + base_modifier + modifiers.flat_total + dice_total
     
     # Build breakdown string
     breakdown_parts = [f"{d20_result['result']} (d20)"]
     if base_modifier != 0:
         breakdown_parts.append(f"{base_modifier} (base)")
     
-    for mod in modifiers.flat_modifiers:
-        sign = "+" if mod.value >= 0 else ""
-        breakdown_parts.append(f"{sign}{mod.value} ({mod.name})")
+    breakdown_parts.extend(modifiers.flat_breakdown)
     
     for result in dice_results:
         breakdown_parts.append(f"{result['total']} ({result['name']})")
@@ -144,8 +357,8 @@ def perform_roll(base_modifier: int, modifiers: RollModifiers, roll_name: str) -
         "roll_name": roll_name,
         "d20_roll": d20_result,
         "base_modifier": base_modifier,
-        "flat_modifiers": [{"name": mod.name, "value": mod.value, "description": mod.description} 
-                          for mod in modifiers.flat_modifiers],
+        "flat_modifiers": [{"name": name, "value": value, "description": description}
+                          for name, value, description in modifiers.flat_modifiers],
         "dice_modifiers": dice_results,
         "total": total,
         "breakdown": breakdown
@@ -187,3 +400,502 @@ def parse_modifiers_string(modifiers_str: str) -> RollModifiers:
             flat_mods.append(FlatModifier("Modifier", value, f"Flat modifier +{part}"))
     
     return RollModifiers(flat_mods, dice_mods, roll_type)
+
+
+@lru_cache(maxsize=MODIFIER_PLAN_CACHE_SIZE)
+def compile_modifiers(modifiers_str: str) -> RollPlan:
+    """Parse a modifiers string into a RollPlan, caching the result
+    
+    Accepts the same format as parse_modifiers_string. Repeated strings are
+    served from a bounded LRU cache, so the roll tools do no parsing on a hit.
+    """
+    return parse_modifiers_string(modifiers_str).compile()
+
+
+@dataclass
+class RollDistribution:
+    """Exact probability distribution of a roll total
+    
+    probabilities[i] is the chance that the total equals minimum + i.
+    """
+    minimum: int
+    probabilities: List[float]
+    
+    @property
+    def maximum(self) -> int:
+        """Highest possible total"""
+        return self.minimum + len(self.probabilities) - 1
+    
+    def shift(self, offset: int) -> "RollDistribution":
+        """Distribution of the total plus a constant"""
+        return RollDistribution(self.minimum + offset, self.probabilities)
+    
+    def convolve(self, other: "RollDistribution") -> "RollDistribution":
+        """Distribution of the sum of two independent totals"""
+        combined = [0.0] * (len(self.probabilities) + len(other.probabilities) - 1)
+        for i, p in enumerate(self.probabilities):
+            if p == 0.0:
+                continue
+            for j, q in enumerate(other.probabilities):
+                combined[i + j] += p * q
+        return RollDistribution(self.minimum + other.minimum, combined)
+    
+    def probability_at_least(self, target: int) -> float:
+        """Chance that the total meets or beats target"""
+        start = max(target - self.minimum, 0)
+        return min(sum(self.probabilities[start:]), 1.0)
+    
+    def mean(self) -> float:
+        """Expected total"""
+        return sum((self.minimum + i) * p for i, p in enumerate(self.probabilities))
+    
+    def percentile(self, fraction: float) -> int:
+        """Smallest total t with P(total <= t) >= fraction"""
+        cumulative = 0.0
+        for i, p in enumerate(self.probabilities):
+            cumulative += p
+            if cumulative >= fraction - 1e-12:
+                return self.minimum + i
+        return self.maximum
+
+
+def die_distribution(sides: int, count: int = 1) -> RollDistribution:
+    """Exact distribution of the sum of `count` dice with `sides` faces"""
+    single = RollDistribution(1, [1.0 / sides] * sides)
+    result = single
+    for _ in range(count - 1):
+        result = result.convolve(single)
+    return result
+
+
+def d20_distribution(roll_type: RollType = RollType.NORMAL) -> RollDistribution:
+    """Exact distribution of a d20 with optional advantage/disadvantage"""
+    if roll_type == RollType.ADVANTAGE:
+        # P(max of two = k) = (2k - 1) / 400
+        return RollDistribution(1, [(2 * k - 1) / 400 for k in range(1, 21)])
+    if roll_type == RollType.DISADVANTAGE:
+        # P(min of two = k) = (41 - 2k) / 400
+        return RollDistribution(1, [(41 - 2 * k) / 400 for k in range(1, 21)])
+    return die_distribution(20)
+
+
+def check_distribution(base_modifier: int,
+                       modifiers: Union[RollModifiers, RollPlan]) -> RollDistribution:
+    """Exact distribution of perform_roll's total, computed by convolution"""
+    modifiers = _as_plan(modifiers)
+    distribution = d20_distribution(modifiers.roll_type)
+    for expression in modifiers.dice:
+        distribution = distribution.convolve(expression.distribution())
+    return distribution.shift(base_modifier + modifiers.flat_total)
+
+
+# Dice expression language
+#
+#   expression := term (("+" | "-") term)*
+#   term       := factor (("*" | "/") factor)*
+#   factor     := "-" factor | "(" expression ")" | dice | number
+#   dice       := [number] "d" (number | "%") modifier*
+#   modifier   := "kh" [number] | "kl" [number] | "r" number | "!"
+#
+# "kh"/"kl" keep the highest/lowest dice (default 1), "rN" rerolls dice
+# showing N or lower once, "!" explodes dice that roll their maximum and
+# "/" divides rounding down. Examples: "4d6kh3", "2d6r2+3", "1d8!", "d%".
+
+MAX_DICE_COUNT = 1000
+MAX_DICE_SIDES = 1000
+MAX_EXPLOSIONS = 100
+
+# Number of distinct expressions whose compiled evaluators are kept
+DICE_EXPRESSION_CACHE_SIZE = 1024
+
+# Exact distributions of keep-highest/lowest dice enumerate every outcome;
+# larger pools are left to simulation
+MAX_ENUMERATED_OUTCOMES = 1_000_000
+
+
+class DiceExpressionError(ValueError):
+    """Raised for dice expressions that cannot be parsed or evaluated"""
+
+
+class DiceExpression:
+    """A dice expression compiled once into evaluation closures
+    
+    Use compile_dice() rather than constructing this directly, so compiled
+    expressions are shared through the cache.
+    """
+    __slots__ = ("text", "_evaluate", "_evaluate_batch", "_distribution", "_cached_distribution")
+    
+    def __init__(self, text: str, evaluate, evaluate_batch, distribution):
+        self.text = text
+        self._evaluate = evaluate
+        self._evaluate_batch = evaluate_batch
+        self._distribution = distribution
+        self._cached_distribution = None
+    
+    def roll(self, rng=None) -> Tuple[int, List[int]]:
+        """Evaluate once, returning the total and every kept die
+        
+        rng is a random.Random or dice stream (defaults to the current stream).
+        """
+        rolls: List[int] = []
+        total = self._evaluate(rng if rng is not None else _current_rng.get(), rolls)
+        return total, rolls
+    
+    def evaluate_batch(self, n: int, generator=None):
+        """Evaluate n times, returning the n totals
+        
+        Vectorized when NumPy is installed (generator is then a NumPy
+        Generator or dice stream); otherwise a list, with generator a
+        random.Random or dice stream. Defaults to the current stream.
+        """
+        if generator is None:
+            generator = _current_rng.get()
+        if np is not None:
+            return self._evaluate_batch(generator, n)
+        return [self._evaluate(generator, []) for _ in range(n)]
+    
+    def distribution(self) -> RollDistribution:
+        """Exact distribution of the total"""
+        if self._cached_distribution is None:
+            self._cached_distribution = self._distribution()
+        return self._cached_distribution
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DiceExpression) and other.text == self.text
+    
+    def __hash__(self) -> int:
+        return hash(self.text)
+    
+    def __reduce__(self):
+        # Closures cannot be pickled; recompile from the text instead
+        return compile_dice, (self.text,)
+    
+    def __repr__(self) -> str:
+        return f"DiceExpression('{self.text}')"
+
+
+def compile_dice(expression: str) -> DiceExpression:
+    """Compile a dice expression, reusing cached compilations"""
+    if not isinstance(expression, str):
+        raise DiceExpressionError(f"Dice expression must be a string, not {type(expression).__name__}")
+    return _compile_dice_cached(expression.replace(" ", "").lower())
+
+
+@lru_cache(maxsize=DICE_EXPRESSION_CACHE_SIZE)
+def _compile_dice_cached(text: str) -> DiceExpression:
+    if not text:
+        raise DiceExpressionError("Empty dice expression")
+    return _DiceParser(text).parse()
+
+
+def _from_outcomes(outcomes: Dict[int, float]) -> RollDistribution:
+    """Build a distribution from a {total: probability} mapping"""
+    low, high = min(outcomes), max(outcomes)
+    probabilities = [0.0] * (high - low + 1)
+    for total, p in outcomes.items():
+        probabilities[total - low] += p
+    return RollDistribution(low, probabilities)
+
+
+def _combine(left: RollDistribution, right: RollDistribution, operator) -> RollDistribution:
+    """Distribution of operator(a, b) for independent totals a and b"""
+    outcomes: Dict[int, float] = {}
+    for i, p in enumerate(left.probabilities):
+        if p == 0.0:
+            continue
+        for j, q in enumerate(right.probabilities):
+            if q == 0.0:
+                continue
+            total = operator(left.minimum + i, right.minimum + j)
+            outcomes[total] = outcomes.get(total, 0.0) + p * q
+    return _from_outcomes(outcomes)
+
+
+def _negate(distribution: RollDistribution) -> RollDistribution:
+    return RollDistribution(-distribution.maximum, distribution.probabilities[::-1])
+
+
+def _floor_divide(left: int, right: int) -> int:
+    if right == 0:
+        raise DiceExpressionError("Division by zero in dice expression")
+    return left // right
+
+
+def _compile_number(value: int):
+    def evaluate(rng, rolls):
+        return value
+    
+    def evaluate_batch(generator, n):
+        return np.full(n, value, dtype=np.int64)
+    
+    def distribution():
+        return RollDistribution(value, [1.0])
+    
+    return evaluate, evaluate_batch, distribution
+
+
+def _compile_binary(operator: str, left, right):
+    left_eval, left_batch, left_dist = left
+    right_eval, right_batch, right_dist = right
+    
+    if operator == "+":
+        def evaluate(rng, rolls):
+            return left_eval(rng, rolls) + right_eval(rng, rolls)
+        
+        def evaluate_batch(generator, n):
+            return left_batch(generator, n) + right_batch(generator, n)
+        
+        def distribution():
+            return left_dist().convolve(right_dist())
+    elif operator == "-":
+        def evaluate(rng, rolls):
+            return left_eval(rng, rolls) - right_eval(rng, rolls)
+        
+        def evaluate_batch(generator, n):
+            return left_batch(generator, n) - right_batch(generator, n)
+        
+        def distribution():
+            return left_dist().convolve(_negate(right_dist()))
+    elif operator == "*":
+        def evaluate(rng, rolls):
+            return left_eval(rng, rolls) * right_eval(rng, rolls)
+        
+        def evaluate_batch(generator, n):
+            return left_batch(generator, n) * right_batch(generator, n)
+        
+        def distribution():
+            return _combine(left_dist(), right_dist(), lambda a, b: a * b)
+    else:  # "/"
+        def evaluate(rng, rolls):
+            return _floor_divide(left_eval(rng, rolls), right_eval(rng, rolls))
+        
+        def evaluate_batch(generator, n):
+            divisor = right_batch(generator, n)
+            if (divisor == 0).any():
+                raise DiceExpressionError("Division by zero in dice expression")
+            return np.floor_divide(left_batch(generator, n), divisor)
+        
+        def distribution():
+            return _combine(left_dist(), right_dist(), _floor_divide)
+    
+    return evaluate, evaluate_batch, distribution
+
+
+def _compile_negation(operand):
+    operand_eval, operand_batch, operand_dist = operand
+    
+    def evaluate(rng, rolls):
+        return -operand_eval(rng, rolls)
+    
+    def evaluate_batch(generator, n):
+        return -operand_batch(generator, n)
+    
+    def distribution():
+        return _negate(operand_dist())
+    
+    return evaluate, evaluate_batch, distribution
+
+
+def _single_die_distribution(sides: int, reroll: int, explode: bool) -> RollDistribution:
+    """Distribution of one die after rerolling and exploding"""
+    base = [1.0 / sides] * sides
+    if reroll:
+        # Dice at or below the threshold are rerolled once and the new roll kept
+        rerolled = reroll / sides
+        base = [(0.0 if face <= reroll else 1.0 / sides) + rerolled / sides
+                for face in range(1, sides + 1)]
+    if not explode:
+        return RollDistribution(1, base)
+    
+    # A maximum roll adds another (unrerolled) die; stop once the remaining mass is negligible
+    outcomes: Dict[int, float] = {}
+    carry, weight = 0, 1.0
+    faces = base
+    for _ in range(MAX_EXPLOSIONS + 1):
+        for face, p in enumerate(faces[:-1], start=1):
+            outcomes[carry + face] = outcomes.get(carry + face, 0.0) + weight * p
+        carry += sides
+        weight *= faces[-1]
+        faces = [1.0 / sides] * sides
+        if weight < 1e-15:
+            break
+    outcomes[carry] = outcomes.get(carry, 0.0) + weight
+    return _from_outcomes(outcomes)
+
+
+def _compile_dice_term(count: int, sides: int, keep: Optional[int], keep_highest: bool,
+                       reroll: int, explode: bool):
+    faces = range(1, sides + 1)
+    
+    def evaluate(rng, rolls):
+        values = rng.choices(faces, k=count)
+        if reroll:
+            values = [rng.choices(faces)[0] if value <= reroll else value for value in values]
+        if explode:
+            exploded = []
+            for value in values:
+                total, explosions = value, 0
+                while value == sides and explosions < MAX_EXPLOSIONS:
+                    value = rng.choices(faces)[0]
+                    total += value
+                    explosions += 1
+                exploded.append(total)
+            values = exploded
+        if keep is not None:
+            values = sorted(values, reverse=keep_highest)[:keep]
+        rolls.extend(values)
+        return sum(values)
+    
+    def evaluate_batch(generator, n):
+        values = generator.integers(1, sides + 1, size=(n, count))
+        if reroll:
+            low = values <= reroll
+            values[low] = generator.integers(1, sides + 1, size=int(low.sum()))
+        if explode:
+            last = values.copy()
+            for _ in range(MAX_EXPLOSIONS):
+                live = last == sides
+                if not live.any():
+                    break
+                fresh = generator.integers(1, sides + 1, size=int(live.sum()))
+                values[live] += fresh
+                last = np.zeros_like(last)
+                last[live] = fresh
+        if keep is not None:
+            values = np.sort(values, axis=1)
+            values = values[:, count - keep:] if keep_highest else values[:, :keep]
+        return values.sum(axis=1)
+    
+    def distribution():
+        single = _single_die_distribution(sides, reroll, explode)
+        if keep is None or keep >= count:
+            result = single
+            for _ in range(count - 1):
+                result = result.convolve(single)
+            return result
+        
+        support = [(single.minimum + i, p) for i, p in enumerate(single.probabilities) if p > 0.0]
+        if len(support) ** count > MAX_ENUMERATED_OUTCOMES:
+            raise DiceExpressionError(
+                f"Too many outcomes to compute exact odds for {count}d{sides} keep {keep}; "
+                "use simulation instead"
+            )
+        # Keep the sorted multiset of dice as state, trimmed to the kept dice
+        states: Dict[Tuple[int, ...], float] = {(): 1.0}
+        for _ in range(count):
+            next_states: Dict[Tuple[int, ...], float] = {}
+            for state, p in states.items():
+                for value, q in support:
+                    merged = sorted(state + (value,), reverse=keep_highest)[:keep]
+                    key = tuple(merged)
+                    next_states[key] = next_states.get(key, 0.0) + p * q
+            states = next_states
+        outcomes: Dict[int, float] = {}
+        for state, p in states.items():
+            outcomes[sum(state)] = outcomes.get(sum(state), 0.0) + p
+        return _from_outcomes(outcomes)
+    
+    return evaluate, evaluate_batch, distribution
+
+
+class _DiceParser:
+    """Recursive-descent parser producing evaluation closures"""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+    
+    def error(self, message: str) -> DiceExpressionError:
+        return DiceExpressionError(f"Invalid dice expression '{self.text}': {message} at position {self.pos + 1}")
+    
+    def peek(self, token: str) -> bool:
+        return self.text.startswith(token, self.pos)
+    
+    def parse(self) -> DiceExpression:
+        node = self.expression()
+        if self.pos < len(self.text):
+            raise self.error(f"unexpected '{self.text[self.pos]}'")
+        return DiceExpression(self.text, *node)
+    
+    def expression(self):
+        node = self.term()
+        while self.pos < len(self.text) and self.text[self.pos] in "+-":
+            operator = self.text[self.pos]
+            self.pos += 1
+            node = _compile_binary(operator, node, self.term())
+        return node
+    
+    def term(self):
+        node = self.factor()
+        while self.pos < len(self.text) and self.text[self.pos] in "*/":
+            operator = self.text[self.pos]
+            self.pos += 1
+            node = _compile_binary(operator, node, self.factor())
+        return node
+    
+    def factor(self):
+        if self.pos >= len(self.text):
+            raise self.error("expression ends early")
+        if self.peek("-"):
+            self.pos += 1
+            return _compile_negation(self.factor())
+        if self.peek("("):
+            self.pos += 1
+            node = self.expression()
+            if not self.peek(")"):
+                raise self.error("missing ')'")
+            self.pos += 1
+            return node
+        
+        number = self.number()
+        if self.peek("d"):
+            return self.dice(1 if number is None else number)
+        if number is None:
+            raise self.error(f"unexpected '{self.text[self.pos]}'")
+        return _compile_number(number)
+    
+    def number(self) -> Optional[int]:
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos].isdigit():
+            self.pos += 1
+        return int(self.text[start:self.pos]) if self.pos > start else None
+    
+    def dice(self, count: int):
+        self.pos += 1  # "d"
+        if self.peek("%"):
+            self.pos += 1
+            sides = 100
+        else:
+            sides = self.number()
+            if sides is None:
+                raise self.error("expected number of sides")
+        if not 1 <= count <= MAX_DICE_COUNT:
+            raise self.error(f"dice count must be between 1 and {MAX_DICE_COUNT}")
+        if not 1 <= sides <= MAX_DICE_SIDES:
+            raise self.error(f"dice sides must be between 1 and {MAX_DICE_SIDES}")
+        
+        keep, keep_highest, reroll, explode = None, True, 0, False
+        while self.pos < len(self.text):
+            if self.peek("kh") or self.peek("kl"):
+                keep_highest = self.peek("kh")
+                self.pos += 2
+                keep = self.number()
+                keep = 1 if keep is None else keep
+                if not 1 <= keep <= count:
+                    raise self.error(f"can only keep between 1 and {count} dice")
+            elif self.peek("r"):
+                self.pos += 1
+                reroll = self.number()
+                if reroll is None:
+                    raise self.error("expected reroll threshold")
+                if not 1 <= reroll < sides:
+                    raise self.error(f"reroll threshold must be between 1 and {sides - 1}")
+            elif self.peek("!"):
+                self.pos += 1
+                if sides == 1:
+                    raise self.error("cannot explode a one-sided die")
+                explode = True
+            else:
+                break
+        
+        return _compile_dice_term(count, sides, keep, keep_highest, reroll, explode)
@@ -0,0 +1,275 @@
+"""
+Append-only journal of character changes.
+
+Instead of rewriting a whole character file after every change, each change
+is appended to a journal next to it ("thorin.json.journal") as one compact
+JSON line setting a value at a key path:
+
+    {"set": ["hit_points", "current"], "value": 12}
+
+Loading a character replays its journal on top of the file. Once a journal
+grows long, or the character is saved to its own file, the journal is
+checkpointed: it is rotated to "*.journal.compacting", the full character is
+written atomically in the background, and the rotated journal is deleted.
+Replaying a journal leaves each key at its last recorded value, so replaying
+a rotated journal that outlived a crash over the newer file is harmless.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .saver import write_atomically
+    from .serialization import dumps
+except ImportError:
+    from src.dnd_mcp.saver import write_atomically
+    from src.dnd_mcp.serialization import dumps
+
+
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".journal.compacting"
+
+# When appended records reach the disk: after every record, at most every
+# `fsync_interval` seconds, or whenever the operating system decides
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC_POLICY = "interval"
+DEFAULT_FSYNC_INTERVAL = 1.0
+
+# Records appended before the character file is compacted
+DEFAULT_COMPACT_AFTER = 1000
+
+KeyPath = List[Union[str, int]]
+
+# Full contents of a character file: JSON text or the binary format
+FileContents = Union[str, bytes]
+
+# Writes a checkpoint: (character path, file contents, callback once written,
+# callback with the error message if the write fails)
+SubmitWrite = Callable[[str, FileContents, Callable[[], None], Callable[[str], None]], None]
+
+# Checkpoints without a save queue run one at a time off the request path
+_compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dnd-journal")
+
+
+def _write_in_background(path: str, text: FileContents, on_written: Callable[[], None],
+                         on_failed: Callable[[str], None]) -> None:
+    def write():
+        try:
+            write_atomically(path, text)
+        except Exception as e:
+            on_failed(str(e))
+        else:
+            on_written()
+    _compactor.submit(write)
+
+
+def journal_paths(character_path: str) -> Tuple[str, str]:
+    """The rotated and current journal files of a character file, in replay order"""
+    return character_path + COMPACTING_SUFFIX, character_path + JOURNAL_SUFFIX
+
+
+def read_journal(journal_path: str) -> Iterator[Tuple[KeyPath, Any]]:
+    """Yield (key path, value) records, stopping at a torn final line"""
+    try:
+        file = open(journal_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        for line in file:
+            if not line.endswith("\n"):
+                break  # Interrupted write
+            try:
+                record = json.loads(line)
+                yield record["set"], record["value"]
+            except (ValueError, KeyError, TypeError):
+                break
+
+
+def apply_change(data: Dict[str, Any], keys: KeyPath, value: Any) -> None:
+    """Set `value` at the key path inside nested dicts and lists"""
+    target = data
+    for key in keys[:-1]:
+        if isinstance(target, dict):
+            target = target.setdefault(key, {})
+        else:
+            target = target[key]
+    target[keys[-1]] = value
+
+
+def replay(data: Dict[str, Any], character_path: str) -> int:
+    """Apply every journaled change of a character file to its data
+
+    Returns the number of records applied.
+    """
+    applied = 0
+    for journal_path in journal_paths(character_path):
+        for keys, value in read_journal(journal_path):
+            apply_change(data, keys, value)
+            applied += 1
+    return applied
+
+
+def has_journal(character_path: str) -> bool:
+    """Whether a character file has changes that are not yet compacted into it"""
+    return any(os.path.exists(path) for path in journal_paths(character_path))
+
+
+class CharacterJournal:
+    """Journal of changes to one character file
+
+    Checkpoints are written by `submit` (for example SaveQueue.submit), or by
+    a private background thread when it is not given.
+    """
+
+    def __init__(self, character_path: str, fsync: str = DEFAULT_FSYNC_POLICY,
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+                 compact_after: int = DEFAULT_COMPACT_AFTER,
+                 submit: Optional[SubmitWrite] = None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        if compact_after < 1:
+            raise ValueError("compact_after must be at least 1")
+        self.character_path = character_path
+        self.compacting_path, self.journal_path = journal_paths(character_path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.compact_after = compact_after
+        self.records = self._repair()
+        self._submit = submit or _write_in_background
+        self._file = None
+        self._last_sync = time.monotonic()
+        self._checkpoints = 0  # Submitted but not yet written
+        self._rotated = False  # A rotated journal waits for its checkpoint
+        self._condition = threading.Condition()
+
+    def _repair(self) -> int:
+        """Cut a torn tail off the journal so new records start on a fresh line
+
+        Returns the number of intact records.
+        """
+        records = length = 0
+        try:
+            with open(self.journal_path, 'rb') as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        break
+                    records += 1
+                    length += len(line)
+                size = file.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return 0
+        if length < size:
+            os.truncate(self.journal_path, length)
+        return records
+
+    def record(self, keys: KeyPath, value: Any, snapshot: Callable[[], FileContents]) -> None:
+        """Append one change, checkpointing when the journal is long
+
+        `snapshot` returns the full contents of the character file (for
+        example Character.serialize); it is only called when a checkpoint
+        starts.
+        """
+        line = dumps({"set": keys, "value": value}) + "\n"
+        with self._condition:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+            if self.fsync == "always" or (self.fsync == "interval" and
+                                          time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+            if self.records >= self.compact_after and not self._rotated:
+                self.checkpoint(snapshot())
+
+    def checkpoint(self, text: FileContents) -> None:
+        """Write the full character contents to its file, superseding the journal
+
+        Records appended from now on go to a fresh journal. If an earlier
+        checkpoint is still being written, the current journal is kept until
+        a later checkpoint. If the write fails, the journal is kept and the
+        next checkpoint folds it in again.
+        """
+        with self._condition:
+            if self._rotated:
+                # This text also supersedes the rotated journal
+                self._submit_checkpoint(text)
+                return
+            if self._file is not None:
+                self._file.flush()
+                self._sync()
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.journal_path):
+                if os.path.exists(self.compacting_path):
+                    # Left over from an interrupted checkpoint; keep its records too
+                    with open(self.journal_path, 'r', encoding='utf-8') as source, \
+                            open(self.compacting_path, 'a', encoding='utf-8') as target:
+                        target.write(source.read())
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, self.compacting_path)
+            self._rotated = True
+            self.records = 0
+            self._submit_checkpoint(text)
+
+    def _submit_checkpoint(self, text: FileContents) -> None:
+        self._checkpoints += 1
+        try:
+            self._submit(self.character_path, text, self._checkpoint_written, self._checkpoint_failed)
+        except BaseException as e:
+            self._checkpoint_failed(str(e))
+            raise
+
+    def _checkpoint_written(self) -> None:
+        with self._condition:
+            try:
+                if os.path.exists(self.compacting_path):
+                    os.remove(self.compacting_path)
+            finally:
+                self._rotated = False
+                self._checkpoints -= 1
+                self._condition.notify_all()
+
+    def _checkpoint_failed(self, error: str) -> None:
+        # The rotated journal stays on disk, still needed for replay; once no
+        # checkpoint is in flight, the next one merges the current journal
+        # into it and tries again
+        with self._condition:
+            self._checkpoints -= 1
+            if not self._checkpoints:
+                self._rotated = False
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Force appended records to disk"""
+        with self._condition:
+            if self._file is not None:
+                self._file.flush()
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until submitted checkpoints are written; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._checkpoints == 0, timeout)
+
+    def close(self) -> None:
+        """Sync and close the journal file"""
+        with self._condition:
+            if self._file is not None:
+                self._file.flush()
+                self._sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,281 @@
+"""
+Call counts, errors, latency and response sizes of server tools.
+
+ToolMetrics wraps tool functions as they are registered. Each call is
+counted and its latency and response size are added to fixed-bucket
+histograms: log-linear buckets as in HDR histograms, four per power of two
+(so a bucket is at most 25% wide) from 1 microsecond to about a minute.
+Percentiles read from them are the upper bound of the bucket they fall in,
+capped at the largest value recorded.
+
+Recording takes no lock: each thread writes to its own shard of counters,
+and snapshots add the shards up. A snapshot taken while calls are running
+may miss the calls still being recorded, but never double counts one.
+
+MetricsDumper periodically writes metrics in the Prometheus text format to
+a local file, for node_exporter's textfile collector or plain inspection.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .saver import write_atomically
+except ImportError:
+    from src.dnd_mcp.saver import write_atomically
+
+
+def _log_linear_bounds(low: float, octaves: int, steps: int) -> List[float]:
+    """Upper bounds of `steps` linear buckets in each of `octaves` powers of two from `low`"""
+    return [low * 2 ** octave * (1 + step / steps) for octave in range(octaves) for step in range(1, steps + 1)]
+
+
+# Upper bounds of the latency buckets, in seconds: 1us to 2**26us (~67s)
+LATENCY_BOUNDS = _log_linear_bounds(1e-6, 26, 4)
+
+# Upper bounds of the response size buckets, in bytes: 64B to 16MiB
+SIZE_BOUNDS = [float(2 ** exponent) for exponent in range(6, 25)]
+
+# Percentiles reported by snapshots
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(bounds: Sequence[float], counts: Sequence[int], q: float) -> float:
+    """Upper bound of the bucket holding the q-th percentile (inf past the last bound)"""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = q / 100 * total
+    seen = 0
+    for bound, count in zip(list(bounds) + [float("inf")], counts):
+        seen += count
+        if seen >= rank and count:
+            return bound
+    return float("inf")
+
+
+class _Shard:
+    """One thread's counters for one tool"""
+    __slots__ = ("calls", "errors", "latency", "latency_sum", "latency_max", "sizes", "bytes", "bytes_max")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.sizes = [0] * (len(SIZE_BOUNDS) + 1)
+        self.bytes = 0
+        self.bytes_max = 0
+
+
+class ToolStats:
+    """Counters and histograms of one tool, summed over the threads that called it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._shards: List[_Shard] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()  # Only taken when a thread makes its first call
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards = self._shards + [shard]
+        return shard
+
+    def record(self, seconds: float, size: int, error: bool) -> None:
+        shard = self._shard()
+        shard.latency[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        shard.latency_sum += seconds
+        if seconds > shard.latency_max:
+            shard.latency_max = seconds
+        shard.sizes[bisect.bisect_left(SIZE_BOUNDS, size)] += 1
+        shard.bytes += size
+        if size > shard.bytes_max:
+            shard.bytes_max = size
+        if error:
+            shard.errors += 1
+        # Counted last, so a concurrent snapshot never sees more calls than latencies
+        shard.calls += 1
+
+    def totals(self) -> Dict[str, Any]:
+        """Counters and histogram buckets added up over every thread"""
+        latency = [0] * (len(LATENCY_BOUNDS) + 1)
+        sizes = [0] * (len(SIZE_BOUNDS) + 1)
+        totals = {"calls": 0, "errors": 0, "latency_sum": 0.0, "latency_max": 0.0, "bytes": 0, "bytes_max": 0}
+        for shard in self._shards:
+            totals["calls"] += shard.calls
+            totals["errors"] += shard.errors
+            totals["latency_sum"] += shard.latency_sum
+            totals["latency_max"] = max(totals["latency_max"], shard.latency_max)
+            totals["bytes"] += shard.bytes
+            totals["bytes_max"] = max(totals["bytes_max"], shard.bytes_max)
+            for i, count in enumerate(shard.latency):
+                latency[i] += count
+            for i, count in enumerate(shard.sizes):
+                sizes[i] += count
+        totals["latency"] = latency
+        totals["sizes"] = sizes
+        return totals
+
+
+def _size(result: Any) -> int:
+    """Bytes of a response that is not text"""
+    return len(result) if isinstance(result, (bytes, bytearray)) else 0
+
+
+class ToolMetrics:
+    """Metrics of every tool wrapped by instrument()"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.tools: Dict[str, ToolStats] = {}
+
+    def instrument(self, tool: Callable, name: Optional[str] = None) -> Callable:
+        """Wrap a tool function so every call is recorded under `name` (its own by default)
+
+        Calls that raise, and text responses starting with "Error" (how tools
+        report failures), are recorded as errors; exceptions are re-raised.
+        """
+        stats = self.tools.setdefault(name or tool.__name__, ToolStats(name or tool.__name__))
+        clock = time.perf_counter
+
+        @functools.wraps(tool)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                result = tool(*args, **kwargs)
+            except BaseException:
+                stats.record(clock() - start, 0, True)
+                raise
+            if isinstance(result, str):
+                stats.record(clock() - start, len(result) if result.isascii() else len(result.encode("utf-8")),
+                             result.startswith("Error"))
+            else:
+                stats.record(clock() - start, _size(result), False)
+            return result
+        return wrapper
+
+    def instrument_registrations(self, register: Callable[..., Callable[[Callable], Callable]]) -> Callable:
+        """Wrap a tool registration decorator (such as FastMCP.tool) so that every
+        tool it registers is instrumented, and the instrumented function is returned"""
+        @functools.wraps(register)
+        def tool(name: Optional[str] = None, *args, **kwargs):
+            def decorator(function: Callable) -> Callable:
+                instrumented = self.instrument(function, name)
+                register(name, *args, **kwargs)(instrumented)
+                return instrumented
+            return decorator
+        return tool
+
+    def snapshot(self, tools: Optional[Iterable[str]] = None, histograms: bool = False) -> Dict[str, Any]:
+        """Calls, errors, latency (ms) and response sizes of each tool that has been called
+
+        With histograms, the non-empty buckets are included as
+        [upper bound, count] pairs (the last bound is null for overflow).
+        """
+        names = self.tools if tools is None else [name for name in tools if name in self.tools]
+        result = {}
+        for name in names:
+            totals = self.tools[name].totals()
+            calls = totals["calls"]
+            if not calls:
+                continue
+            latency = {"mean": round(totals["latency_sum"] / calls * 1000, 4)}
+            for q in PERCENTILES:
+                value = min(percentile(LATENCY_BOUNDS, totals["latency"], q), totals["latency_max"])
+                latency[f"p{q}"] = round(value * 1000, 4)
+            latency["max"] = round(totals["latency_max"] * 1000, 4)
+            entry = {
+                "calls": calls,
+                "errors": totals["errors"],
+                "latency_ms": latency,
+                "response_bytes": {
+                    "total": totals["bytes"],
+                    "mean": round(totals["bytes"] / calls, 1),
+                    "p99": int(min(percentile(SIZE_BOUNDS, totals["sizes"], 99), totals["bytes_max"])),
+                    "max": totals["bytes_max"]
+                }
+            }
+            if histograms:
+                entry["latency_buckets_ms"] = _buckets(LATENCY_BOUNDS, totals["latency"], 1000)
+                entry["response_buckets_bytes"] = _buckets(SIZE_BOUNDS, totals["sizes"], 1)
+            result[name] = entry
+        return result
+
+    def prometheus(self, prefix: str = "dnd_mcp") -> str:
+        """Every tool's counters, and histograms of the tools called, in the Prometheus text format"""
+        totals = {name: stats.totals() for name, stats in self.tools.items()}
+        lines = []
+        for metric, key, help_text in (("tool_calls_total", "calls", "Tool calls"),
+                                       ("tool_errors_total", "errors", "Tool calls that failed")):
+            lines += [f"# HELP {prefix}_{metric} {help_text}.", f"# TYPE {prefix}_{metric} counter"]
+            lines += [f'{prefix}_{metric}{{tool="{name}"}} {tool[key]}' for name, tool in totals.items()]
+        for metric, bounds, key, total_key, help_text in (
+                ("tool_latency_seconds", LATENCY_BOUNDS, "latency", "latency_sum", "Tool call latency"),
+                ("tool_response_bytes", SIZE_BOUNDS, "sizes", "bytes", "Tool response size")):
+            lines += [f"# HELP {prefix}_{metric} {help_text}.", f"# TYPE {prefix}_{metric} histogram"]
+            for name, tool in totals.items():
+                if not tool["calls"]:
+                    continue  # Tools never called would only add empty buckets
+                cumulative = 0
+                for bound, count in zip(bounds, tool[key]):
+                    cumulative += count
+                    lines.append(f'{prefix}_{metric}_bucket{{tool="{name}",le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{prefix}_{metric}_bucket{{tool="{name}",le="+Inf"}} {tool["calls"]}')
+                lines.append(f'{prefix}_{metric}_sum{{tool="{name}"}} {tool[total_key]:.9g}')
+                lines.append(f'{prefix}_{metric}_count{{tool="{name}"}} {tool["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _buckets(bounds: Sequence[float], counts: Sequence[int], scale: float) -> List[Tuple[Optional[float], int]]:
+    return [(round(bound * scale, 6) if i < len(bounds) else None, count)
+            for i, (bound, count) in enumerate(zip(list(bounds) + [None], counts)) if count]
+
+
+def prometheus_values(values: Dict[str, Tuple[str, str, float]], prefix: str = "dnd_mcp") -> str:
+    """Single values ({name: (counter or gauge, help, value)}) in the Prometheus text format"""
+    lines = []
+    for name, (kind, help_text, value) in values.items():
+        lines += [f"# HELP {prefix}_{name} {help_text}.", f"# TYPE {prefix}_{name} {kind}",
+                  f"{prefix}_{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsDumper:
+    """Writes render() to a file every `interval` seconds from a daemon thread"""
+
+    def __init__(self, path: str, render: Callable[[], str], interval: float):
+        if interval <= 0:
+            raise ValueError("The metrics interval must be positive")
+        self.path = path
+        self.render = render
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dnd-metrics", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and write the final metrics"""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.dump()
+
+    def dump(self) -> None:
+        write_atomically(self.path, self.render())
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.dump()
+            except OSError:
+                pass  # Retried at the next interval
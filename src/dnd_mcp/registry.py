@@ -0,0 +1,195 @@
+"""
+Registry of loaded characters for multi-session servers.
+
+This module keeps every character a server process is working with, keyed by
+character id, so one process can serve a whole campaign. Only a bounded number
+of characters stay resident; the least recently used ones are written to a
+spill directory and transparently reloaded on their next access. With
+compact=True they are instead kept in memory as CompactCharacter, a fraction
+of their resident size, and expanded again on access.
+
+Spill files are only a cache of this process's memory, so they are written
+without fsync. Without a spill_dir they go to a temporary directory that is
+removed by close() or at interpreter exit.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .binary import BINARY_SUFFIX
+    from .character import Character
+    from .compact import CompactCharacter
+except ImportError:
+    from src.dnd_mcp.binary import BINARY_SUFFIX
+    from src.dnd_mcp.character import Character
+    from src.dnd_mcp.compact import CompactCharacter
+
+
+# Default number of characters kept in memory before eviction
+DEFAULT_MAX_RESIDENT = 256
+
+
+def make_character_id(text: str) -> str:
+    """Turn a character name or file name into an id, e.g. "Thorin Ironforge" -> "thorin_ironforge" """
+    slug = re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+    return slug or "character"
+
+
+class CharacterRegistry:
+    """Loaded characters keyed by id, with least-recently-used eviction to disk
+    (or to compact in-memory copies)
+
+    One character is "active" at a time; lookups without an id resolve to it,
+    which keeps single-character clients working unchanged.
+    """
+
+    def __init__(self, max_resident: int = DEFAULT_MAX_RESIDENT, spill_dir: Optional[str] = None,
+                 compact: bool = False):
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        self.max_resident = max_resident
+        self.spill_dir = spill_dir
+        self.compact = compact
+        self._temporary_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.active_id: Optional[str] = None
+        self._resident: "OrderedDict[str, Character]" = OrderedDict()
+        self._evicted: Dict[str, str] = {}  # id -> file to reload from
+        self._packed: Dict[str, CompactCharacter] = {}  # id -> compact copy, when compact
+        self._lock = threading.RLock()
+
+    def __contains__(self, character_id: str) -> bool:
+        return character_id in self._resident or character_id in self._evicted or character_id in self._packed
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._evicted) + len(self._packed)
+
+    def ids(self) -> List[str]:
+        """Ids of every registered character, resident or evicted"""
+        with self._lock:
+            return list(self._resident) + list(self._evicted) + list(self._packed)
+
+    def peek(self, character_id: str) -> Optional[Character]:
+        """Return a resident character without reloading or touching LRU order"""
+        return self._resident.get(character_id)
+
+    def add(self, character: Character, character_id: Optional[str] = None,
+            activate: bool = True) -> str:
+        """Register a character, replacing any character with the same id
+
+        Returns the id used, derived from the character name when not given.
+        """
+        character_id = character_id or make_character_id(character.name or "character")
+        with self._lock:
+            self._evicted.pop(character_id, None)
+            self._packed.pop(character_id, None)
+            self._resident[character_id] = character
+            self._resident.move_to_end(character_id)
+            if activate or self.active_id is None:
+                self.active_id = character_id
+            self._evict_if_needed()
+        return character_id
+
+    def load(self, file_path: str, character_id: Optional[str] = None,
+             activate: bool = True) -> Tuple[str, Character]:
+        """Load a character file and register it
+        
+        Binary files are loaded lazily; JSON is parsed in full, which is faster
+        than splitting it into sections.
+        """
+        character = Character()
+        character.load(file_path, lazy=file_path.endswith(BINARY_SUFFIX))
+        character_id = character_id or make_character_id(
+            character.name or os.path.splitext(os.path.basename(file_path))[0]
+        )
+        return self.add(character, character_id, activate), character
+
+    def get(self, character_id: Optional[str] = None) -> Optional[Character]:
+        """Look up a character by id (the active character when omitted)
+
+        Evicted characters are reloaded from disk or expanded from their
+        compact copy. Returns None for unknown ids.
+        """
+        with self._lock:
+            character_id = character_id or self.active_id
+            if character_id is None:
+                return None
+
+            character = self._resident.get(character_id)
+            if character is not None:
+                self._resident.move_to_end(character_id)
+                return character
+
+            packed = self._packed.pop(character_id, None)
+            if packed is not None:
+                character = packed.to_character()
+            else:
+                path = self._evicted.get(character_id)
+                if path is None:
+                    return None
+                character = Character()
+                character.load(path, lazy=True)  # Spill files are binary
+                del self._evicted[character_id]
+            self._resident[character_id] = character
+            self._evict_if_needed()
+            return character
+
+    def activate(self, character_id: str) -> bool:
+        """Make a registered character the active one"""
+        with self._lock:
+            if character_id not in self:
+                return False
+            self.active_id = character_id
+            return True
+
+    def remove(self, character_id: str) -> bool:
+        """Forget a character, deleting its spill file if it was evicted"""
+        with self._lock:
+            found = self._resident.pop(character_id, None) is not None
+            found = self._packed.pop(character_id, None) is not None or found
+            path = self._evicted.pop(character_id, None)
+            if path is not None:
+                found = True
+                if os.path.exists(path):
+                    os.remove(path)
+            if self.active_id == character_id:
+                self.active_id = next(reversed(self._resident), None)
+            return found
+
+    def _spill_path(self, character_id: str) -> str:
+        if self.spill_dir is None:
+            # Cleaned up by close() or, failing that, at interpreter exit
+            self._temporary_dir = tempfile.TemporaryDirectory(prefix="dnd_mcp_registry_")
+            self.spill_dir = self._temporary_dir.name
+        os.makedirs(self.spill_dir, exist_ok=True)
+        # Ids are caller-supplied; keep them out of the path itself
+        digest = hashlib.sha1(character_id.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.spill_dir, f"{make_character_id(character_id)}_{digest}{BINARY_SUFFIX}")
+
+    def _evict_if_needed(self) -> None:
+        """Write least recently used characters to disk (or pack them) until within the limit"""
+        while len(self._resident) > self.max_resident:
+            character_id, character = self._resident.popitem(last=False)
+            if self.compact:
+                self._packed[character_id] = CompactCharacter.from_character(character)
+                continue
+            path = self._spill_path(character_id)
+            # A plain write: the file only has to outlive this process's memory, not a crash
+            with open(path, "wb") as file:
+                file.write(character.to_binary())
+            self._evicted[character_id] = path
+
+    def close(self) -> None:
+        """Forget evicted characters and remove a temporary spill directory"""
+        with self._lock:
+            self._evicted.clear()
+            self._packed.clear()
+            if self._temporary_dir is not None:
+                self._temporary_dir.cleanup()
+                self._temporary_dir = None
+                self.spill_dir = None
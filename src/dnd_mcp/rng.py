@@ -0,0 +1,231 @@
+"""
+Seedable random streams for dice rolls.
+
+Every roll draws from a DiceRNG: a random.Random for the small draws that
+make up most rolls and, when NumPy is installed, a PCG64 generator for
+vectorized batches, both seeded from one 64-bit seed. The server keeps one
+stream per client session, so concurrent sessions no longer interleave
+draws from a single process-wide stream, and a session seeded the same way
+rolls the same way.
+
+A recording stream also keeps every value it draws. A ReplayRNG hands the
+recorded values back in the same order, reproducing a session's rolls
+exactly; it stops with ReplayError as soon as the replayed session asks for
+a different die than the record holds.
+
+Single dice are drawn with one random.Random.random() call each, giving the
+same values as random.Random.choices without its argument handling. A
+stream can instead draw them from an entropy pool: a block of uniform values
+in [0, POOL_MODULUS), drawn ahead in one call (optionally by a background
+thread) and consumed one value per die. POOL_MODULUS is divisible by every
+die size from 1 to 20 and by 100, so `value % sides` is exactly uniform for
+all of them without rejecting any value; other sizes skip the pool. The
+pool is off by default: per die it costs about the same as the direct draw
+(see benchmarks/bench_dice_pool.py).
+
+Both stream types provide the two calls dice code draws with: `choices`
+like random.Random, and `integers` like numpy.random.Generator.
+"""
+
+import random
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batches then draw through `choices`
+    np = None
+
+
+# lcm(1..20) * 5: a multiple of every die size up to d20, and of d100
+POOL_MODULUS = 1163962800
+
+# Values drawn per pool refill; 0 (the default) turns the pool off
+DEFAULT_POOL_SIZE = 0
+
+# Pools refilled in the background get their next block from this thread
+_refiller: Optional[ThreadPoolExecutor] = None
+
+# A recorded draw: number of die faces, then the values drawn (nested lists
+# for multi-dimensional batches)
+Draw = Tuple[int, Any]
+
+Size = Union[int, Tuple[int, ...]]
+
+
+class ReplayError(ValueError):
+    """Raised when a replayed session draws differently from its record"""
+
+
+def new_seed() -> int:
+    """A fresh random 64-bit seed"""
+    return secrets.randbits(64)
+
+
+def _shape(size: Size) -> Tuple[int, ...]:
+    return (size,) if isinstance(size, int) else tuple(size)
+
+
+def uniform_choices(random_: Callable[[], float]) -> Callable[..., List[Any]]:
+    """`choices` drawing from random_ (such as random.Random.random)
+
+    Returns the same values as random.Random.choices without weights, with
+    less overhead per call.
+    """
+    def choices(population: Sequence[Any], k: int = 1) -> List[Any]:
+        n = len(population)
+        if k == 1:
+            return [population[int(random_() * n)]]
+        if k == 2:  # Advantage and disadvantage
+            return [population[int(random_() * n)], population[int(random_() * n)]]
+        return [population[int(random_() * n)] for _ in range(k)]
+    return choices
+
+
+class EntropyPool:
+    """Pre-drawn uniform values in [0, POOL_MODULUS), mapped to die faces by modulo
+
+    The pool has its own generator, so its values depend only on the seed,
+    never on how draws from the rest of the stream interleave with refills.
+    Draws are serialized by a lock, so a stream can be shared by threads.
+    """
+
+    def __init__(self, seed: int, size: int = DEFAULT_POOL_SIZE, background: bool = False,
+                 fallback: Optional[Callable[..., List[int]]] = None):
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+        self.size = size
+        if np is not None:
+            # Jumped far ahead of the stream's own PCG64, so the two never overlap
+            generator = np.random.Generator(np.random.PCG64(seed).jumped())
+            self._draw_block = lambda: generator.integers(0, POOL_MODULUS, size=size).tolist()
+        else:
+            randrange = random.Random(f"pool-{seed}").randrange
+            self._draw_block = lambda: [randrange(POOL_MODULUS) for _ in range(size)]
+        self._fallback = fallback or uniform_choices(random.Random(seed).random)
+        self._next: Optional[Future] = None
+        if background:
+            global _refiller
+            if _refiller is None:
+                _refiller = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dnd-dice-pool")
+            self._refiller = _refiller
+            self._next = self._refiller.submit(self._draw_block)
+        self._block: List[int] = self._draw_block() if self._next is None else self._next_block()
+        self._index = 0
+        self._lock = threading.Lock()
+        self.refills = 0
+
+    def _next_block(self) -> List[int]:
+        if self._next is None:
+            return self._draw_block()
+        block = self._next.result()
+        self._next = self._refiller.submit(self._draw_block)
+        return block
+
+    def choices(self, population: Sequence[int], k: int = 1) -> List[int]:
+        """k values drawn with replacement from population, like random.Random.choices"""
+        sides = len(population)
+        if POOL_MODULUS % sides or k > self.size:
+            return self._fallback(population, k=k)
+        with self._lock:
+            block = self._block
+            index = self._index
+            end = index + k
+            if end > self.size:
+                # The rest of the block is too short; start on the next one
+                block = self._block = self._next_block()
+                self.refills += 1
+                index, end = 0, k
+            self._index = end
+        if k == 1:
+            return [population[block[index] % sides]]
+        return [population[value % sides] for value in block[index:end]]
+
+
+class DiceRNG:
+    """A seeded random stream, optionally recording every value it draws
+
+    Single dice are drawn from random.Random one call at a time, or with
+    pool_size > 0 from an EntropyPool of that many values (refilled on a
+    background thread when background is set).
+    """
+
+    def __init__(self, seed: Optional[int] = None, record: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE, background: bool = False):
+        seed = new_seed() if seed is None else int(seed)
+        if seed < 0:
+            raise ValueError("Seeds must not be negative")
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._generator = np.random.Generator(np.random.PCG64(seed)) if np is not None else None
+        random_choices = uniform_choices(self._random.random)
+        self.pool = EntropyPool(seed, pool_size, background, random_choices) if pool_size else None
+        self._choices = self.pool.choices if self.pool is not None else random_choices
+        self.draws: Optional[List[Draw]] = [] if record else None
+        if not record:
+            # Draw straight from the underlying sources: no wrapper on the hot path
+            self.choices = self._choices
+            if self._generator is not None:
+                self.integers = self._generator.integers
+
+    @property
+    def recording(self) -> bool:
+        return self.draws is not None
+
+    def choices(self, population: Sequence[int], k: int = 1) -> List[int]:
+        """k values drawn with replacement from population (dice faces)"""
+        values = self._choices(population, k=k)
+        self.draws.append((len(population), values))
+        return values
+
+    def integers(self, low: int, high: int, size: Size):
+        """An array of values drawn uniformly from low..high-1 (NumPy only)"""
+        values = self._generator.integers(low, high, size=size)
+        self.draws.append((high - low, values.tolist()))
+        return values
+
+    def record(self) -> Dict[str, Any]:
+        """The seed and every recorded draw, for ReplayRNG"""
+        if self.draws is None:
+            raise ValueError("This dice stream is not recording")
+        return {"seed": self.seed, "draws": self.draws}
+
+
+class ReplayRNG:
+    """A stream that hands back the draws of a recorded session in order"""
+
+    def __init__(self, record: Dict[str, Any]):
+        try:
+            self.seed = record.get("seed")
+            self._draws = [(int(sides), values) for sides, values in record["draws"]]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ReplayError("A dice record needs a list of [sides, values] draws")
+        self.position = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self._draws) - self.position
+
+    def _next(self, sides: int) -> Any:
+        if self.position >= len(self._draws):
+            raise ReplayError(f"The dice record ran out after {self.position} draws")
+        recorded_sides, values = self._draws[self.position]
+        if recorded_sides != sides:
+            raise ReplayError(f"Replay diverged at draw {self.position}: "
+                              f"the record rolled d{recorded_sides}, the session d{sides}")
+        self.position += 1
+        return values
+
+    def choices(self, population: Sequence[int], k: int = 1) -> List[int]:
+        values = self._next(len(population))
+        if not isinstance(values, list) or len(values) != k or any(isinstance(v, list) for v in values):
+            raise ReplayError(f"Replay diverged at draw {self.position - 1}: expected {k} values")
+        return list(values)
+
+    def integers(self, low: int, high: int, size: Size):
+        values = np.array(self._next(high - low), dtype=np.int64)
+        if values.shape != _shape(size):
+            raise ReplayError(f"Replay diverged at draw {self.position - 1}: expected shape {_shape(size)}")
+        return values
@@ -0,0 +1,221 @@
+"""
+Background, coalesced and atomic file saves.
+
+Tools hand finished file contents (JSON text or binary) to a SaveQueue and
+return immediately; a writer thread puts them on disk. Saves to the same
+path within the debounce window are coalesced so only the last one is
+written. Every write goes to a temporary file in the target directory which
+is then renamed over the target, so a crash leaves either the old or the new
+file, never a truncated one. The new file keeps the permissions of the one
+it replaces (new files get the usual ones for the process umask), and the
+directory is synced after the rename so the rename itself survives a crash.
+"""
+
+import os
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+# Seconds a save waits for newer saves of the same path before it is written
+DEFAULT_DEBOUNCE = 0.5
+
+# Read once at import: os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: str) -> int:
+    """Permissions for a new version of `path`: those of the current file, if any"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _sync_directory(directory: str) -> None:
+    """Flush a directory's entries (such as a rename) to disk, where the platform allows it"""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on Windows
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass  # Some file systems do not support syncing directories
+    finally:
+        os.close(descriptor)
+
+
+def write_atomically(path: str, text: Union[str, bytes]) -> None:
+    """Replace a file's contents so readers see either the old or new version
+
+    `text` is written as UTF-8, or as is when it is bytes.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with (os.fdopen(descriptor, 'wb') if isinstance(text, bytes)
+              else os.fdopen(descriptor, 'w', encoding='utf-8')) as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates files readable by their owner only
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _sync_directory(directory)
+
+
+class _PendingSave:
+    __slots__ = ("text", "due", "callbacks", "failure_callbacks")
+
+    def __init__(self, text: Union[str, bytes], due: float):
+        self.text = text
+        self.due = due
+        self.callbacks: List[Callable[[], None]] = []
+        self.failure_callbacks: List[Callable[[str], None]] = []
+
+
+class SaveQueue:
+    """Queue of file saves written by one background thread"""
+
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE):
+        if debounce < 0:
+            raise ValueError("debounce must not be negative")
+        self.debounce = debounce
+        self._pending: Dict[str, _PendingSave] = {}
+        self._writing = 0
+        self._flushing = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        self.requested = 0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.errors: Dict[str, str] = {}  # path -> last error
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def submit(self, path: str, text: Union[str, bytes], on_written: Optional[Callable[[], None]] = None,
+               on_failed: Optional[Callable[[str], None]] = None) -> None:
+        """Queue `text` to be written to `path`, replacing any queued save of it
+
+        `on_written` runs on the writer thread once text at least this new
+        has been written; `on_failed` runs there instead, with the error
+        message, if that write fails.
+        """
+        path = os.path.abspath(path)
+        with self._condition:
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = _PendingSave(text, time.monotonic() + self.debounce)
+            else:
+                # Last write wins; the debounce window is not extended
+                pending.text = text
+                self.coalesced += 1
+            if on_written is not None:
+                pending.callbacks.append(on_written)
+            if on_failed is not None:
+                pending.failure_callbacks.append(on_failed)
+            self.requested += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dnd-saver", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write every queued save now and wait for them
+
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                while self._pending or self._writing:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                return True
+            finally:
+                self._flushing -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, save counts and write latency"""
+        with self._condition:
+            return {
+                "queue_depth": len(self._pending) + self._writing,
+                "saves_requested": self.requested,
+                "saves_written": self.written,
+                "saves_coalesced": self.coalesced,
+                "saves_failed": self.failed,
+                "write_latency_ms": {
+                    "last": round(self.last_latency * 1000, 3),
+                    "mean": round(self.total_latency / self.written * 1000, 3) if self.written else 0.0,
+                    "max": round(self.max_latency * 1000, 3)
+                },
+                "errors": dict(self.errors)
+            }
+
+    def _next_due(self) -> Optional[str]:
+        """Path of the save to write next, if one is due"""
+        if not self._pending:
+            return None
+        path = min(self._pending, key=lambda item: self._pending[item].due)
+        if self._flushing or self._pending[path].due <= time.monotonic():
+            return path
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                path = self._next_due()
+                while path is None:
+                    timeout = None
+                    if self._pending:
+                        earliest = min(pending.due for pending in self._pending.values())
+                        timeout = max(0.0, earliest - time.monotonic())
+                    self._condition.wait(timeout)
+                    path = self._next_due()
+                pending = self._pending.pop(path)
+                self._writing += 1
+
+            start = time.perf_counter()
+            error = None
+            try:
+                write_atomically(path, pending.text)
+            except Exception as e:
+                error = str(e)
+            try:
+                if error is None:
+                    for callback in pending.callbacks:
+                        callback()
+                else:
+                    for callback in pending.failure_callbacks:
+                        callback(error)
+            except Exception as e:
+                error = error or str(e)
+            latency = time.perf_counter() - start
+
+            with self._condition:
+                self._writing -= 1
+                if error is None:
+                    self.written += 1
+                    self.errors.pop(path, None)
+                    self.total_latency += latency
+                    self.last_latency = latency
+                    self.max_latency = max(self.max_latency, latency)
+                else:
+                    self.failed += 1
+                    self.errors[path] = error
+                self._condition.notify_all()
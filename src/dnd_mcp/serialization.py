@@ -0,0 +1,104 @@
+"""
+JSON serialization backend.
+
+Tool responses and character files are serialized with dumps(), which uses
+the fastest installed backend: orjson, then ujson, then the standard
+library. Every backend produces the same data; only the text differs
+(non-ASCII characters are written as UTF-8 rather than escaped by all of
+them). Set DND_MCP_JSON_BACKEND to "orjson", "ujson" or "json" to force one.
+
+Output is either compact (indent=None, no whitespace) or indented. orjson
+only indents by two spaces, so other indents fall back to the next backend.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# In order of preference
+BACKENDS = ("orjson", "ujson", "json")
+
+
+def _tuple_as_list(value: Any) -> Any:
+    # orjson only handles plain tuples; the stdlib writes NamedTuples as lists too
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps_orjson(value: Any, indent: Optional[int]) -> Optional[str]:
+    if indent not in (None, 2):
+        return None
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(value, default=_tuple_as_list, option=option).decode("utf-8")
+    except TypeError:  # orjson.JSONEncodeError, e.g. integers wider than 64 bits
+        return None
+
+
+def _dumps_ujson(value: Any, indent: Optional[int]) -> Optional[str]:
+    try:
+        return ujson.dumps(value, indent=indent or 0, ensure_ascii=False, escape_forward_slashes=False)
+    except (TypeError, OverflowError):
+        return None  # e.g. keys or integers ujson does not support
+
+
+def _dumps_json(value: Any, indent: Optional[int]) -> str:
+    if indent is None:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(value, indent=indent, ensure_ascii=False)
+
+
+_DUMPERS: Dict[str, Callable[[Any, Optional[int]], Optional[str]]] = {
+    "orjson": _dumps_orjson,
+    "ujson": _dumps_ujson,
+    "json": _dumps_json,
+}
+
+_INSTALLED = {"orjson": orjson is not None, "ujson": ujson is not None, "json": True}
+
+
+def available_backends() -> List[str]:
+    """Installed backends, in order of preference"""
+    return [name for name in BACKENDS if _INSTALLED[name]]
+
+
+def select_backend(preferred: Optional[str] = None) -> str:
+    """The preferred backend if it is installed, else the fastest installed one"""
+    if preferred:
+        if preferred not in BACKENDS:
+            raise ValueError(f"JSON backend must be one of {', '.join(BACKENDS)}")
+        if _INSTALLED[preferred]:
+            return preferred
+    return available_backends()[0]
+
+
+JSON_BACKEND = select_backend(os.environ.get("DND_MCP_JSON_BACKEND"))
+
+
+def dumps(value: Any, indent: Optional[int] = None, backend: Optional[str] = None) -> str:
+    """Serialize `value` to JSON text, compact when indent is None
+
+    Uses JSON_BACKEND unless `backend` is given, falling back to the next
+    installed backend for output the chosen one cannot produce.
+    """
+    start = BACKENDS.index(backend or JSON_BACKEND)
+    for name in BACKENDS[start:]:
+        if _INSTALLED[name]:
+            text = _DUMPERS[name](value, indent)
+            if text is not None:
+                return text
+    return _dumps_json(value, indent)
@@ -5,10 +5,14 @@ This module provides the main MCP server implementation with tools for
 character management, dice rolling, and game mechanics.
 """
 
-import json
+import atexit
+import functools
 import os
 import sys
-from typing import Optional
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # Add the src directory to Python path for imports
 if __name__ == "__main__":
@@ -23,35 +27,259 @@ from mcp.server.fastmcp import FastMCP
 # Try relative imports first, fall back to absolute imports
 try:
     from .character import Character
-    from .dice import parse_modifiers_string, perform_roll, DiceModifier, FlatModifier
+    from .dice import compile_modifiers, compile_dice, perform_roll, perform_roll_batch, roll_d20, check_distribution, use_rng, DiceModifier, FlatModifier
+    from .rng import DEFAULT_POOL_SIZE, DiceRNG, ReplayRNG
     from .constants import SKILL_ABILITIES, COMMON_MODIFIERS
+    from .simulation import RollScenario, simulate
+    from .registry import CharacterRegistry, DEFAULT_MAX_RESIDENT, make_character_id
+    from .bulk import bulk_load
+    from .catalog import Catalog
+    from .journal import CharacterJournal, DEFAULT_FSYNC_POLICY, DEFAULT_COMPACT_AFTER
+    from .saver import SaveQueue, DEFAULT_DEBOUNCE
+    from .metrics import MetricsDumper, ToolMetrics, prometheus_values
+    from .serialization import dumps
+    from .combat import Combatant, Encounter
+    from .attacks import AttackProfile, DPR_ARMOR_CLASSES, attack_hits, attack_name, damage_table, generic_attack_profile, resolve_attack
 except ImportError:
     # Fallback for when running as standalone script
     from src.dnd_mcp.character import Character
-    from src.dnd_mcp.dice import parse_modifiers_string, perform_roll, DiceModifier, FlatModifier
+    from src.dnd_mcp.dice import compile_modifiers, compile_dice, perform_roll, perform_roll_batch, roll_d20, check_distribution, use_rng, DiceModifier, FlatModifier
+    from src.dnd_mcp.rng import DEFAULT_POOL_SIZE, DiceRNG, ReplayRNG
     from src.dnd_mcp.constants import SKILL_ABILITIES, COMMON_MODIFIERS
+    from src.dnd_mcp.simulation import RollScenario, simulate
+    from src.dnd_mcp.registry import CharacterRegistry, DEFAULT_MAX_RESIDENT, make_character_id
+    from src.dnd_mcp.bulk import bulk_load
+    from src.dnd_mcp.catalog import Catalog
+    from src.dnd_mcp.journal import CharacterJournal, DEFAULT_FSYNC_POLICY, DEFAULT_COMPACT_AFTER
+    from src.dnd_mcp.saver import SaveQueue, DEFAULT_DEBOUNCE
+    from src.dnd_mcp.metrics import MetricsDumper, ToolMetrics, prometheus_values
+    from src.dnd_mcp.serialization import dumps
+    from src.dnd_mcp.combat import Combatant, Encounter
+    from src.dnd_mcp.attacks import AttackProfile, DPR_ARMOR_CLASSES, attack_hits, attack_name, damage_table, generic_attack_profile, resolve_attack
 
 # Create the MCP server
 server = FastMCP("dnd-character-server")
 
-# Global character storage
-current_character: Optional[Character] = None
+# Calls, errors, latency and response sizes of every tool registered below
+# (DND_MCP_METRICS=0 turns this off)
+METRICS_ENABLED = os.environ.get("DND_MCP_METRICS", "1") != "0"
+metrics = ToolMetrics()
+if METRICS_ENABLED:
+    server.tool = metrics.instrument_registrations(server.tool)
+
+# With DND_MCP_METRICS_FILE set, metrics are also written to that file in the
+# Prometheus text format every DND_MCP_METRICS_INTERVAL seconds and at exit
+DEFAULT_METRICS_INTERVAL = 15.0
+METRICS_FILE = os.environ.get("DND_MCP_METRICS_FILE")
+METRICS_INTERVAL = float(os.environ.get("DND_MCP_METRICS_INTERVAL", DEFAULT_METRICS_INTERVAL))
+
+# Loaded characters, keyed by character id; tools default to the active one
+registry = CharacterRegistry(
+    max_resident=int(os.environ.get("DND_MCP_MAX_CHARACTERS", DEFAULT_MAX_RESIDENT)),
+    spill_dir=os.environ.get("DND_MCP_SPILL_DIR"),
+    compact=os.environ.get("DND_MCP_COMPACT_EVICTED", "0") == "1"
+)
+atexit.register(registry.close)
+
+NO_CHARACTER_MESSAGE = "No character currently loaded. Use load_character() first."
+
+# JSON responses are indented ("pretty", the default) or without any
+# whitespace ("compact"), which saves bytes and tokens on every call
+RESPONSE_FORMATS = ("pretty", "compact")
+RESPONSE_FORMAT = os.environ.get("DND_MCP_RESPONSE_FORMAT", "pretty")
+if RESPONSE_FORMAT not in RESPONSE_FORMATS:
+    raise ValueError(f"DND_MCP_RESPONSE_FORMAT must be one of {', '.join(RESPONSE_FORMATS)}")
+
+# Import errors listed individually before the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+# Most rolls accepted by one roll_batch call, and the kinds it rolls
+MAX_BATCH_ROLLS = 1000
+BATCH_ROLL_KINDS = ("skill", "ability", "save", "attack")
+
+# Named parties: party name -> ids of its loaded members, in order
+parties: Dict[str, List[str]] = {}
+
+# Running encounters by name; combat tools default to DEFAULT_ENCOUNTER
+DEFAULT_ENCOUNTER = "default"
+encounters: Dict[str, Encounter] = {}
+
+# Dice streams of client sessions, so sessions neither share nor interleave
+# draws; calls made outside a client request (scripts, tests) use local_rng.
+# With DICE_POOL_SIZE > 0, single dice come from a pool of that many pre-drawn values per stream
+DICE_POOL_SIZE = int(os.environ.get("DND_MCP_DICE_POOL", DEFAULT_POOL_SIZE))
+DICE_POOL_BACKGROUND = os.environ.get("DND_MCP_DICE_POOL_BACKGROUND", "0") == "1"
+session_rngs: "weakref.WeakKeyDictionary[Any, Union[DiceRNG, ReplayRNG]]" = weakref.WeakKeyDictionary()
+
+
+def _new_rng(seed: Optional[int] = None, record: bool = False) -> DiceRNG:
+    return DiceRNG(seed, record=record, pool_size=DICE_POOL_SIZE, background=DICE_POOL_BACKGROUND)
+
+
+local_rng: Union[DiceRNG, ReplayRNG] = _new_rng()
+
+# Catalogs of character directories, keyed by absolute directory path
+catalogs: Dict[str, Catalog] = {}
+
+# Character files are written by a background thread; saves of the same file
+# within the debounce window are coalesced
+saves = SaveQueue(debounce=float(os.environ.get("DND_MCP_SAVE_DEBOUNCE", DEFAULT_DEBOUNCE)))
+atexit.register(saves.flush)
+
+# Changes to characters loaded from a file are journaled next to that file
+JOURNAL_ENABLED = os.environ.get("DND_MCP_JOURNAL", "1") != "0"
+JOURNAL_FSYNC = os.environ.get("DND_MCP_JOURNAL_FSYNC", DEFAULT_FSYNC_POLICY)
+JOURNAL_COMPACT_AFTER = int(os.environ.get("DND_MCP_JOURNAL_COMPACT_AFTER", DEFAULT_COMPACT_AFTER))
+
+# Source file of each character id, and its journal once the character changed
+sources: Dict[str, str] = {}
+journals: Dict[str, CharacterJournal] = {}
+
+
+def _response(value: Any) -> str:
+    """Serialize a tool's JSON response in the server-wide RESPONSE_FORMAT"""
+    return dumps(value, indent=None if RESPONSE_FORMAT == "compact" else 2)
+
+
+# Encoded responses of tools whose output never changes, keyed by tool and format
+_static_responses: Dict[Tuple[str, str], str] = {}
+
+# Encoded responses of tools whose output depends only on a character's data:
+# character -> tool -> (character version, format, response). Entries go away
+# with the character object; each character keeps the most recently used
+# MAX_CHARACTER_RESPONSES, as keys may include arguments such as modifiers.
+MAX_CHARACTER_RESPONSES = 64
+_character_responses: "weakref.WeakKeyDictionary[Character, OrderedDict[str, Tuple[int, str, str]]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _static_response(tool: str, build: Callable[[], Any]) -> str:
+    """The encoded response of a tool over immutable data, built on first use"""
+    key = (tool, RESPONSE_FORMAT)
+    response = _static_responses.get(key)
+    if response is None:
+        response = _static_responses[key] = _response(build())
+    return response
+
+
+def _character_response(character: Character, tool: str, build: Callable[[], str]) -> str:
+    """A tool's response for a character, rebuilt only after the character changes"""
+    responses = _character_responses.get(character)
+    if responses is None:
+        responses = _character_responses[character] = OrderedDict()
+    version = character.version
+    cached = responses.get(tool)
+    if cached is not None and cached[0] == version and cached[1] == RESPONSE_FORMAT:
+        responses.move_to_end(tool)
+        return cached[2]
+    response = build()
+    responses[tool] = (version, RESPONSE_FORMAT, response)
+    responses.move_to_end(tool)
+    if len(responses) > MAX_CHARACTER_RESPONSES:
+        responses.popitem(last=False)
+    return response
+
+
+def _current_session() -> Any:
+    """The client session of the request being handled, or None outside requests"""
+    try:
+        return server.get_context().session
+    except ValueError:
+        return None
+
+
+def _session_rng() -> Union[DiceRNG, ReplayRNG]:
+    """The dice stream of the calling session, created (randomly seeded) on first use"""
+    session = _current_session()
+    if session is None:
+        return local_rng
+    rng = session_rngs.get(session)
+    if rng is None:
+        rng = session_rngs[session] = _new_rng()
+    return rng
+
+
+def _set_session_rng(rng: Union[DiceRNG, ReplayRNG]) -> None:
+    global local_rng
+    session = _current_session()
+    if session is None:
+        local_rng = rng
+    else:
+        session_rngs[session] = rng
+
+
+def _session_dice(tool: Callable) -> Callable:
+    """Draw every die a tool rolls from the calling session's stream"""
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        with use_rng(_session_rng()):
+            return tool(*args, **kwargs)
+    return wrapper
+
+
+def _get_character(character_id: str = "") -> Tuple[Optional[Character], str]:
+    """Resolve a character id, or the active character when empty
+    
+    Returns the character and an empty string, or None and an error message.
+    """
+    if character_id and character_id not in registry:
+        return None, f"Unknown character id: {character_id}. Loaded characters: {registry.ids()}"
+    
+    character = registry.get(character_id or None)
+    if character is None:
+        return None, NO_CHARACTER_MESSAGE
+    return character, ""
+
+
+def _record_change(character_id: str, character: Character,
+                   keys: List[Union[str, int]], value: Any) -> str:
+    """Record one change made in place to a character, journaling it if the
+    character was loaded from a file
+    
+    Returns an empty string, or an error message if the journal could not be written.
+    """
+    character.touch()
+    character_id = character_id or registry.active_id
+    if not JOURNAL_ENABLED or character_id not in sources:
+        return ""
+    try:
+        journal = journals.get(character_id)
+        if journal is None:
+            journal = journals[character_id] = CharacterJournal(
+                sources[character_id], fsync=JOURNAL_FSYNC, compact_after=JOURNAL_COMPACT_AFTER,
+                submit=saves.submit)
+        journal.record(keys, value, lambda: character.serialize(journal.character_path))
+    except OSError as e:
+        return f"Error: change not journaled: {e}"
+    return ""
+
+
+def _forget_source(character_id: str) -> None:
+    """Close the journal of a character that is unloaded or replaced"""
+    sources.pop(character_id, None)
+    journal = journals.pop(character_id, None)
+    if journal is not None:
+        journal.close()
 
 
 @server.tool()
-def load_character(file_path: str) -> str:
-    """Load a D&D character from a JSON file"""
-    global current_character
+def load_character(file_path: str, character_id: str = "") -> str:
+    """Load a D&D character from a JSON or binary file and make it the active character
     
+    Args:
+        file_path: Path to the character file (JSON, or binary as written by the converter)
+        character_id: Id to register the character under (defaults to one derived from its name)
+    """
     try:
         # Handle relative paths
         if not os.path.isabs(file_path):
             file_path = os.path.join(os.getcwd(), file_path)
             
-        current_character = Character()
-        current_character.load(file_path)
+        character_id, character = registry.load(file_path, character_id or None)
+        _forget_source(character_id)
+        sources[character_id] = file_path
         
-        return f"Successfully loaded character: {current_character.name} (Level {current_character.get_level()})"
+        return f"Successfully loaded character: {character.name} (Level {character.get_level()}) [id: {character_id}]"
     except FileNotFoundError:
         return f"Error: Character file not found at {file_path}"
     except Exception as e:
@@ -59,29 +287,225 @@ def load_character(file_path: str) -> str:
 
 
 @server.tool()
-def get_character_info() -> str:
-    """Get basic information about the currently loaded character"""
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+def list_characters() -> str:
+    """List every loaded character id, marking the active one"""
+    characters = []
+    for character_id in registry.ids():
+        character = registry.peek(character_id)
+        entry = {
+            "id": character_id,
+            "active": character_id == registry.active_id,
+            "resident": character is not None
+        }
+        if character is not None:
+            entry["name"] = character.name
+        characters.append(entry)
     
-    info = {
-        "name": current_character.name,
-        "nickname": current_character.nickname,
-        "race": current_character.race.get("name", "Unknown"),
-        "level": current_character.get_level(),
-        "classes": [f"{cls.get('name', 'Unknown')} {cls.get('level', 1)}" for cls in current_character.classes],
-        "alignment": current_character.alignment,
-        "hit_points": current_character.hit_points,
-        "armor_class": current_character.armor_class.get("value", 10),
-        "ability_scores": current_character.ability_scores,
-        "proficiency_bonus": current_character.get_proficiency_bonus()
-    }
+    return _response(characters)
+
+
+@server.tool()
+def select_character(character_id: str) -> str:
+    """Make a loaded character the active one used when no character_id is given"""
+    if not registry.activate(character_id):
+        return f"Error: Unknown character id: {character_id}. Loaded characters: {registry.ids()}"
+    return f"Active character: {character_id}"
+
+
+@server.tool()
+def unload_character(character_id: str) -> str:
+    """Remove a character from the server (unsaved changes are discarded)"""
+    if not registry.remove(character_id):
+        return f"Error: Unknown character id: {character_id}. Loaded characters: {registry.ids()}"
+    _forget_source(character_id)
+    for members in parties.values():
+        if character_id in members:
+            members.remove(character_id)
+    return f"Unloaded character: {character_id}"
+
+
+@server.tool()
+def import_characters(source: str, processes: bool = False, party: str = "") -> str:
+    """Load every character in a directory, glob pattern or JSONL file
+    
+    Characters are registered under ids derived from their names; repeated
+    names within one import get a numeric suffix. Files that fail to load are
+    reported without stopping the import.
     
-    return json.dumps(info, indent=2)
+    Args:
+        source: Directory of .json and .dndb files, glob pattern (e.g. "party/*.json") or .jsonl file
+        processes: Parse in worker processes instead of threads
+        party: Name of a party to create from the imported characters (optional)
+    """
+    if not os.path.isabs(source):
+        source = os.path.join(os.getcwd(), source)
+    
+    start = time.time()
+    loaded = 0
+    errors = []
+    seen = {}
+    imported = []
+    try:
+        for result in bulk_load(source, processes=processes):
+            if result.error is not None:
+                errors.append(f"{result.source}: {result.error}")
+                continue
+            base_id = make_character_id(result.character.name or
+                                        os.path.splitext(os.path.basename(result.source))[0])
+            seen[base_id] = seen.get(base_id, 0) + 1
+            character_id = base_id if seen[base_id] == 1 else f"{base_id}_{seen[base_id]}"
+            registry.add(result.character, character_id, activate=False)
+            _forget_source(character_id)
+            if os.path.isfile(result.source):
+                sources[character_id] = result.source
+            imported.append(character_id)
+            loaded += 1
+    except Exception as e:
+        return f"Error importing characters: {str(e)}"
+    
+    if not loaded and not errors:
+        return f"Error: No character files found at {source}"
+    
+    lines = [f"Imported {loaded} characters from {source} in {time.time() - start:.2f}s"
+             f" ({len(errors)} failed)"]
+    lines.extend(errors[:MAX_REPORTED_ERRORS])
+    if len(errors) > MAX_REPORTED_ERRORS:
+        lines.append(f"... and {len(errors) - MAX_REPORTED_ERRORS} more errors")
+    if party and imported:
+        parties[party] = imported
+        lines.append(f"Party {party}: {len(imported)} members")
+    return "\n".join(lines)
 
 
 @server.tool()
-def roll_ability_check(ability: str, modifiers: str = "") -> str:
+def create_party(name: str, character_ids: List[str]) -> str:
+    """Group loaded characters into a named party, replacing any party of that name
+    
+    Args:
+        name: Name of the party
+        character_ids: Ids of loaded characters to include
+    """
+    if not name:
+        return "Error: a party needs a name"
+    unknown = [character_id for character_id in character_ids if character_id not in registry]
+    if unknown:
+        return f"Error: Unknown character ids: {unknown}. Loaded characters: {registry.ids()}"
+    if not character_ids:
+        return "Error: a party needs at least one member"
+    
+    parties[name] = list(dict.fromkeys(character_ids))
+    return f"Party {name}: {len(parties[name])} members"
+
+
+@server.tool()
+def list_parties() -> str:
+    """List every party with its member ids"""
+    return _response(parties)
+
+
+@server.tool()
+def disband_party(name: str) -> str:
+    """Remove a party (its members stay loaded)"""
+    if parties.pop(name, None) is None:
+        return f"Error: Unknown party: {name}. Parties: {list(parties)}"
+    return f"Disbanded party: {name}"
+
+
+def _get_catalog(directory: str = "", refresh: bool = False) -> Catalog:
+    """Catalog of a character directory, rescanned when files were added, removed or changed
+    
+    Defaults to DND_MCP_CHARACTER_DIR, or the working directory.
+    """
+    directory = os.path.abspath(directory or os.environ.get("DND_MCP_CHARACTER_DIR", os.getcwd()))
+    catalog = catalogs.get(directory)
+    if catalog is None:
+        catalog = catalogs[directory] = Catalog(directory)
+        refresh = True
+    if refresh or catalog.is_stale():
+        catalog.refresh()
+    return catalog
+
+
+@server.tool()
+def search_characters(query: str = "", race: str = "", class_name: str = "",
+                      min_level: int = 0, max_level: int = 20, directory: str = "",
+                      refresh: bool = False) -> str:
+    """Search the character files in a directory without opening them
+    
+    Args:
+        query: Text to find in character names (empty matches every character)
+        race: Text to find in the race name
+        class_name: Text to find in the class names
+        min_level: Lowest total level to include
+        max_level: Highest total level to include
+        directory: Character directory (defaults to DND_MCP_CHARACTER_DIR or the working directory)
+        refresh: Rescan files for edits made since the last scan
+    """
+    try:
+        catalog = _get_catalog(directory, refresh)
+        matches = catalog.search(query, race, class_name, min_level, max_level)
+    except Exception as e:
+        return f"Error searching characters: {str(e)}"
+    
+    return _response([{
+        "name": entry.name,
+        "race": entry.race,
+        "classes": entry.classes,
+        "level": entry.level,
+        "path": entry.path
+    } for entry in matches])
+
+
+@server.tool()
+def load_character_by_name(name: str, directory: str = "", character_id: str = "") -> str:
+    """Load a character from a directory by its name and make it the active character
+    
+    Args:
+        name: Character name (case-insensitive); a unique partial name also works
+        directory: Character directory (defaults to DND_MCP_CHARACTER_DIR or the working directory)
+        character_id: Id to register the character under (defaults to one derived from its name)
+    """
+    try:
+        catalog = _get_catalog(directory)
+        matches = catalog.find(name) or catalog.search(name)
+    except Exception as e:
+        return f"Error searching characters: {str(e)}"
+    
+    if not matches:
+        return f"Error: No character named '{name}' in {catalog.directory}"
+    if len(matches) > 1:
+        options = ", ".join(f"{entry.name} ({os.path.basename(entry.path)})" for entry in matches)
+        return f"Error: '{name}' matches several characters: {options}. Use load_character with a path."
+    return load_character(matches[0].path, character_id)
+
+
+@server.tool()
+def get_character_info(character_id: str = "") -> str:
+    """Get basic information about a loaded character
+    
+    Args:
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
+    return _character_response(character, "get_character_info", lambda: _response({
+        "name": character.name,
+        "nickname": character.nickname,
+        "race": character.race.get("name", "Unknown"),
+        "level": character.get_level(),
+        "classes": [f"{cls.get('name', 'Unknown')} {cls.get('level', 1)}" for cls in character.classes],
+        "alignment": character.alignment,
+        "hit_points": character.hit_points,
+        "armor_class": character.armor_class.get("value", 10),
+        "ability_scores": character.ability_scores,
+        "proficiency_bonus": character.get_proficiency_bonus()
+    }))
+
+
+@server.tool()
+@_session_dice
+def roll_ability_check(ability: str, modifiers: str = "", character_id: str = "") -> str:
     """Roll an ability check for a specific ability score
     
     Args:
@@ -90,29 +514,35 @@ def roll_ability_check(ability: str, modifiers: str = "") -> str:
             - "advantage +2" 
             - "disadvantage guidance:1d4"
             - "+3 bardic:1d4 bless:1d4"
+        character_id: Id of the character to use (defaults to the active character)
     """
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
     ability = ability.lower()
-    if ability not in current_character.ability_scores:
-        return f"Invalid ability: {ability}. Valid abilities: {list(current_character.ability_scores.keys())}"
+    if ability not in character.ability_scores:
+        return f"Error: Invalid ability: {ability}. Valid abilities: {list(character.ability_scores.keys())}"
     
-    # Parse modifiers
-    roll_modifiers = parse_modifiers_string(modifiers)
+    # Parse modifiers (compiled plans are cached per modifiers string)
+    try:
+        roll_modifiers = compile_modifiers(modifiers)
+    except ValueError as e:
+        return f"Error: {e}"
     
     # Calculate base modifier
-    ability_modifier = current_character.get_ability_modifier(ability)
+    ability_modifier = character.get_ability_modifier(ability)
     
     # Perform the roll
     result = perform_roll(ability_modifier, roll_modifiers, f"{ability.upper()} Check")
     result["ability"] = ability.upper()
     
-    return json.dumps(result, indent=2)
+    return _response(result)
 
 
 @server.tool()
-def roll_skill_check(skill: str, modifiers: str = "") -> str:
+@_session_dice
+def roll_skill_check(skill: str, modifiers: str = "", character_id: str = "") -> str:
     """Roll a skill check for a specific skill
     
     Args:
@@ -121,42 +551,44 @@ def roll_skill_check(skill: str, modifiers: str = "") -> str:
             - "advantage +2"
             - "disadvantage guidance:1d4" 
             - "+3 bardic:1d8 inspiration:1d4"
+        character_id: Id of the character to use (defaults to the active character)
     """
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
     skill = skill.lower().replace(" ", "_")
     
     if skill not in SKILL_ABILITIES:
         available_skills = list(SKILL_ABILITIES.keys())
-        return f"Invalid skill: {skill}. Available skills: {available_skills}"
+        return f"Error: Invalid skill: {skill}. Available skills: {available_skills}"
     
     # Get the ability this skill uses
     ability = SKILL_ABILITIES[skill]
     
-    # Parse modifiers
-    roll_modifiers = parse_modifiers_string(modifiers)
-    
-    # Calculate base modifier (ability + proficiency if applicable)
-    ability_modifier = current_character.get_ability_modifier(ability)
-    proficiency_bonus = current_character.get_proficiency_bonus()
-    is_proficient = current_character.skills.get(skill, False)
+    # Parse modifiers (compiled plans are cached per modifiers string)
+    try:
+        roll_modifiers = compile_modifiers(modifiers)
+    except ValueError as e:
+        return f"Error: {e}"
     
-    base_modifier = ability_modifier + (proficiency_bonus if is_proficient else 0)
+    # Look up the precomputed base modifier (ability + proficiency if applicable)
+    bonus = character.get_skill_bonus(skill)
     
     # Perform the roll
-    result = perform_roll(base_modifier, roll_modifiers, f"{skill.replace('_', ' ').title()} Check")
+    result = perform_roll(bonus.total, roll_modifiers, f"{skill.replace('_', ' ').title()} Check")
     result["skill"] = skill.replace("_", " ").title()
     result["ability"] = ability.upper()
-    result["ability_modifier"] = ability_modifier
-    result["proficiency_bonus"] = proficiency_bonus if is_proficient else 0
-    result["is_proficient"] = is_proficient
+    result["ability_modifier"] = bonus.ability_modifier
+    result["proficiency_bonus"] = bonus.proficiency_bonus
+    result["is_proficient"] = bonus.is_proficient
     
-    return json.dumps(result, indent=2)
+    return _response(result)
 
 
 @server.tool()
-def roll_saving_throw(ability: str, modifiers: str = "") -> str:
+@_session_dice
+def roll_saving_throw(ability: str, modifiers: str = "", character_id: str = "") -> str:
     """Roll a saving throw for a specific ability
     
     Args:
@@ -165,157 +597,846 @@ def roll_saving_throw(ability: str, modifiers: str = "") -> str:
             - "advantage +2"
             - "disadvantage bless:1d4"
             - "+1 guidance:1d4 bardic:1d8"
+        character_id: Id of the character to use (defaults to the active character)
     """
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
     ability = ability.lower()
-    if ability not in current_character.ability_scores:
-        return f"Invalid ability: {ability}. Valid abilities: {list(current_character.ability_scores.keys())}"
-    
-    # Parse modifiers
-    roll_modifiers = parse_modifiers_string(modifiers)
+    if ability not in character.ability_scores:
+        return f"Error: Invalid ability: {ability}. Valid abilities: {list(character.ability_scores.keys())}"
     
-    # Calculate base modifier (ability + proficiency if applicable)
-    ability_modifier = current_character.get_ability_modifier(ability)
-    proficiency_bonus = current_character.get_proficiency_bonus()
-    is_proficient = current_character.saving_throws.get(ability, False)
+    # Parse modifiers (compiled plans are cached per modifiers string)
+    try:
+        roll_modifiers = compile_modifiers(modifiers)
+    except ValueError as e:
+        return f"Error: {e}"
     
-    base_modifier = ability_modifier + (proficiency_bonus if is_proficient else 0)
+    # Look up the precomputed base modifier (ability + proficiency if applicable)
+    bonus = character.get_saving_throw_bonus(ability)
     
     # Perform the roll
-    result = perform_roll(base_modifier, roll_modifiers, f"{ability.upper()} Saving Throw")
+    result = perform_roll(bonus.total, roll_modifiers, f"{ability.upper()} Saving Throw")
     result["saving_throw"] = ability.upper()
-    result["ability_modifier"] = ability_modifier
-    result["proficiency_bonus"] = proficiency_bonus if is_proficient else 0
-    result["is_proficient"] = is_proficient
+    result["ability_modifier"] = bonus.ability_modifier
+    result["proficiency_bonus"] = bonus.proficiency_bonus
+    result["is_proficient"] = bonus.is_proficient
     
-    return json.dumps(result, indent=2)
+    return _response(result)
 
 
 @server.tool()
-def roll_attack(weapon_name: str = "", modifiers: str = "") -> str:
-    """Roll an attack roll
+@_session_dice
+def roll_attack(weapon_name: str = "", modifiers: str = "", character_id: str = "",
+                target_ac: Optional[int] = None) -> str:
+    """Roll an attack with one of the character's weapons, and its damage
+    
+    The weapon decides the ability (finesse weapons use the better of STR
+    and DEX, ranged weapons DEX), proficiency, magic bonus and damage dice.
+    Critical hits (natural 20, or 19-20 for Champions) roll the damage dice
+    twice. Damage is rolled unless the attack misses.
     
     Args:
-        weapon_name: Name of weapon to attack with (optional)
+        weapon_name: Name of weapon to attack with (optional; without one,
+            a generic STR + proficiency attack without damage is rolled)
         modifiers: Space-separated modifiers string. Examples:
             - "advantage +1"
             - "disadvantage bless:1d4"
             - "+2 guidance:1d4"
+        character_id: Id of the character to use (defaults to the active character)
+        target_ac: Armor class of the target, to decide hit or miss (optional)
     """
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
-    # For now, just roll a generic attack (could be enhanced to use weapon stats)
-    # Assuming STR-based attack for simplicity
-    ability = "str"
+    # Parse modifiers (compiled plans are cached per modifiers string)
+    try:
+        roll_modifiers = compile_modifiers(modifiers)
+        profile = _get_attack_profile(character, weapon_name)
+    except ValueError as e:
+        return f"Error: {e}"
     
-    # Parse modifiers
-    roll_modifiers = parse_modifiers_string(modifiers)
+    result = resolve_attack(profile, roll_modifiers, target_ac)
+    result["weapon"] = profile.weapon
+    result["ability"] = profile.ability.upper()
+    result["ability_modifier"] = profile.ability_modifier
+    result["proficiency_bonus"] = profile.proficiency_bonus
+    if profile.magic_bonus:
+        result["magic_bonus"] = profile.magic_bonus
     
-    # Calculate base modifier (ability + proficiency)
-    ability_modifier = current_character.get_ability_modifier(ability)
-    proficiency_bonus = current_character.get_proficiency_bonus()
-    base_modifier = ability_modifier + proficiency_bonus
+    return _response(result)
+
+
+def _get_attack_profile(character: Character, weapon_name: str) -> AttackProfile:
+    """The cached attack profile of a character's weapon, or a generic attack without a name
     
-    # Perform the roll
-    result = perform_roll(base_modifier, roll_modifiers, f"Attack Roll")
-    result["weapon"] = weapon_name if weapon_name else "Generic Attack"
-    result["ability"] = ability.upper()
-    result["ability_modifier"] = ability_modifier
-    result["proficiency_bonus"] = proficiency_bonus
+    Raises ValueError with a user-facing message for weapons the character lacks
+    or whose sheet entry cannot be parsed.
+    """
+    if not weapon_name:
+        return generic_attack_profile(character)
+    profile = character.get_attack_profile(weapon_name)
+    if profile is None:
+        error = character.attack_profile_errors.get(weapon_name.lower())
+        if error is not None:
+            raise ValueError(f"Invalid weapon {weapon_name}: {error}")
+        weapons = [profile.weapon for profile in character.attack_profiles.values()]
+        raise ValueError(f"Unknown weapon: {weapon_name}. Weapons: {weapons}")
+    return profile
+
+
+@server.tool()
+def get_damage_per_round(weapon_name: str = "", modifiers: str = "", attacks: int = 1,
+                         character_id: str = "") -> str:
+    """Exact hit chance and expected damage per round against AC 5 to 30
+    
+    Computed analytically (no rolling) for each weapon, with the same rules
+    as roll_attack. Each weapon's "hit" and "dpr" lists line up with "ac".
+    
+    Args:
+        weapon_name: Weapon to compute (defaults to every weapon of the character)
+        modifiers: Attack modifiers string, as for roll_attack (e.g. "advantage bless:1d4")
+        attacks: Attacks made per round with the weapon (e.g. 2 with Extra Attack)
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
+    if attacks < 1:
+        return "Error: attacks must be at least 1"
+    
+    key = f"get_damage_per_round:{weapon_name.lower()}:{' '.join(modifiers.split())}:{attacks}"
+    try:
+        return _character_response(character, key,
+                                   lambda: _damage_per_round_response(character, weapon_name, modifiers, attacks))
+    except ValueError as e:
+        return f"Error: {e}"
+
+
+def _damage_per_round_response(character: Character, weapon_name: str, modifiers: str, attacks: int) -> str:
+    plan = compile_modifiers(modifiers)
+    if weapon_name:
+        profiles = [_get_attack_profile(character, weapon_name)]
+    else:
+        profiles = list(character.attack_profiles.values())
+        if not profiles:
+            raise ValueError("Character has no usable weapons")
+    
+    weapons = {}
+    for profile in profiles:
+        table = damage_table(profile, plan)
+        weapons[profile.weapon] = {
+            "attack_bonus": profile.attack_bonus,
+            "damage": f"{profile.damage_dice}{profile.damage_bonus:+d}" if profile.damage_dice
+                      else str(profile.damage_bonus),
+            "crit_chance": round(table.crit_chance, 4),
+            "hit": [round(chance, 4) for chance in table.hit_chances],
+            "dpr": [round(damage * attacks, 2) for damage in table.damage_per_round]
+        }
+    result = {
+        "modifiers": modifiers,
+        "attacks": attacks,
+        "ac": list(DPR_ARMOR_CLASSES),
+        "weapons": weapons
+    }
+    if not weapon_name and character.attack_profile_errors:
+        result["invalid_weapons"] = character.attack_profile_errors
+    return _response(result)
+
+
+def _get_check_modifier(character: Character, check_type: str, name: str):
+    """Resolve the roll name and base modifier for a skill, ability or save check
+    
+    Raises ValueError with a user-facing message for unknown checks.
+    """
+    check_type = check_type.lower()
+    
+    if check_type == "skill":
+        skill = name.lower().replace(" ", "_")
+        if skill not in SKILL_ABILITIES:
+            raise ValueError(f"Invalid skill: {skill}. Available skills: {list(SKILL_ABILITIES.keys())}")
+        return f"{skill.replace('_', ' ').title()} Check", character.get_skill_bonus(skill).total
+    
+    if check_type in ("ability", "save"):
+        ability = name.lower()
+        if ability not in character.ability_scores:
+            raise ValueError(f"Invalid ability: {ability}. Valid abilities: {list(character.ability_scores.keys())}")
+        if check_type == "save":
+            return f"{ability.upper()} Saving Throw", character.get_saving_throw_bonus(ability).total
+        return f"{ability.upper()} Check", character.get_ability_modifier(ability)
+    
+    raise ValueError(f"Invalid check type: {check_type}. Valid types: ['skill', 'ability', 'save']")
+
+
+@server.tool()
+def get_check_odds(check_type: str, name: str, dc: int, modifiers: str = "",
+                   character_id: str = "") -> str:
+    """Compute the exact odds of a check without rolling
+    
+    Args:
+        check_type: "skill", "ability" or "save"
+        name: Skill name (e.g., "perception") or ability (str, dex, con, int, wis, cha)
+        dc: Difficulty class to meet or beat
+        modifiers: Space-separated modifiers string, as for the roll tools.
+            Examples: "advantage bless:1d4", "+2 bardic:1d8"
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
+    
+    try:
+        roll_name, base_modifier = _get_check_modifier(character, check_type, name)
+        distribution = check_distribution(base_modifier, compile_modifiers(modifiers))
+    except ValueError as e:
+        return f"Error: {e}"
+    
+    odds = {
+        "roll_name": roll_name,
+        "dc": dc,
+        "base_modifier": base_modifier,
+        "modifiers": modifiers,
+        "success_chance": round(distribution.probability_at_least(dc), 4),
+        "expected_total": round(distribution.mean(), 2),
+        "min_total": distribution.minimum,
+        "max_total": distribution.maximum,
+        "percentiles": {str(p): distribution.percentile(p / 100) for p in (10, 25, 50, 75, 90)}
+    }
+    
+    return _response(odds)
+
+
+@server.tool()
+def simulate_check(check_type: str, name: str, dc: int, modifiers: str = "",
+                   attempts: int = 1, reroll_ones: bool = False, minimum_d20: int = 1,
+                   trials: int = 1000000, time_budget: float = 2.0, character_id: str = "") -> str:
+    """Estimate the odds of a check by Monte Carlo simulation
+    
+    Use this for scenarios get_check_odds cannot compute exactly.
+    
+    Args:
+        check_type: "skill", "ability" or "save"
+        name: Skill name (e.g., "stealth") or ability (str, dex, con, int, wis, cha)
+        dc: Difficulty class to meet or beat
+        modifiers: Space-separated modifiers string, as for the roll tools
+        attempts: Number of tries; succeeds if any try meets the DC
+        reroll_ones: Reroll natural 1s on the d20 once (Halfling Lucky)
+        minimum_d20: Treat d20 results below this as this (10 for Reliable Talent)
+        trials: Maximum number of trials to simulate (at most 100,000,000)
+        time_budget: Maximum seconds to spend simulating
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
+    
+    if not 1 <= minimum_d20 <= 20:
+        return "Error: minimum_d20 must be between 1 and 20"
+    
+    try:
+        roll_name, base_modifier = _get_check_modifier(character, check_type, name)
+        scenario = RollScenario.from_modifiers(
+            base_modifier, compile_modifiers(modifiers), dc,
+            reroll_ones=reroll_ones, minimum_d20=minimum_d20, attempts=attempts
+        )
+        result = simulate(scenario, trials=trials, time_budget=time_budget)
+    except ValueError as e:
+        return f"Error: {e}"
+    
+    success_low, success_high = result.success_interval()
+    mean_low, mean_high = result.mean_interval()
+    
+    summary = {
+        "roll_name": roll_name,
+        "dc": dc,
+        "base_modifier": base_modifier,
+        "modifiers": modifiers,
+        "trials": result.trials,
+        "success_chance": round(result.success_rate(), 4),
+        "success_chance_95ci": [round(success_low, 4), round(success_high, 4)],
+        "expected_total": round(result.mean(), 2),
+        "expected_total_95ci": [round(mean_low, 2), round(mean_high, 2)],
+        "histogram": {str(total): result.histogram[total] for total in sorted(result.histogram)},
+        "elapsed_seconds": round(result.elapsed, 3),
+        "workers": result.workers
+    }
+    
+    return _response(summary)
+
+
+@server.tool()
+@_session_dice
+def roll_batch(rolls: List[Dict[str, Any]], breakdown: bool = False) -> str:
+    """Roll many checks, saves and attacks in one call
+    
+    Each result holds the roll's name, character id, total and natural d20,
+    plus the DC and whether it succeeded when a DC was given. Attacks also
+    report whether they are critical hits, and follow roll_attack's rules: a
+    natural 1 misses and a critical hit hits, whatever the target AC. A roll
+    that cannot be made gets an "error" entry instead; the others still roll.
+    
+    Args:
+        rolls: Roll specs, each a dict with:
+            - kind: "skill", "ability", "save" or "attack"
+            - name: Skill or ability name, or weapon name for attacks (also
+              accepted as "skill", "ability" or "weapon")
+            - modifiers: Modifiers string, as for the roll tools (optional)
+            - character_id: Character to roll for (optional, defaults to the active character)
+            - dc: Difficulty class or target AC (optional)
+        breakdown: Include each roll's breakdown string
+    """
+    if not rolls:
+        return "Error: no rolls given"
+    if len(rolls) > MAX_BATCH_ROLLS:
+        return f"Error: at most {MAX_BATCH_ROLLS} rolls per batch"
+    
+    # Characters, modifier plans and base modifiers are resolved once per batch
+    characters: Dict[str, Tuple[Optional[Character], str]] = {}
+    # (roll name, base modifier, critical range of attacks or None)
+    resolved: Dict[Tuple[str, str, str], Tuple[str, int, Optional[int]]] = {}
+    results = []
+    for spec in rolls:
+        try:
+            if not isinstance(spec, dict):
+                raise ValueError("Each roll must be an object")
+            kind = str(spec.get("kind", "")).lower()
+            if kind not in BATCH_ROLL_KINDS:
+                raise ValueError(f"Invalid roll kind: {kind}. Valid kinds: {list(BATCH_ROLL_KINDS)}")
+            name = str(spec.get("name") or spec.get("skill") or spec.get("ability") or spec.get("weapon") or "")
+            character_id = spec.get("character_id") or registry.active_id or ""
+            
+            if character_id not in characters:
+                characters[character_id] = _get_character(character_id)
+            character, error = characters[character_id]
+            if character is None:
+                raise ValueError(error)
+            
+            key = (character_id, kind, name)
+            if key not in resolved:
+                if kind == "attack":
+                    profile = _get_attack_profile(character, name)
+                    resolved[key] = (attack_name(profile), profile.attack_bonus, profile.crit_range)
+                else:
+                    resolved[key] = _get_check_modifier(character, kind, name) + (None,)
+            roll_name, base_modifier, crit_range = resolved[key]
+            plan = compile_modifiers(spec.get("modifiers") or "")
+            dc = spec.get("dc")
+            if dc is not None:
+                dc = int(dc)
+        except (ValueError, TypeError) as e:
+            results.append({"error": str(e)})
+            continue
+        
+        if breakdown:
+            roll = perform_roll(base_modifier, plan, roll_name)
+            natural, total = roll["d20_roll"]["result"], roll["total"]
+        else:
+            natural = roll_d20(plan.roll_type)["result"]
+            dice_total = sum(result["total"] for result in plan.roll_dice_modifiers())
+            total = natural + base_modifier + plan.flat_total + dice_total
+        
+        result = {
+            "roll": roll_name,
+            "character_id": character_id,
+            "total": total,
+            "natural": natural
+        }
+        if crit_range is not None:
+            result["critical"] = natural >= crit_range
+        if dc is not None:
+            result["dc"] = dc
+            result["success"] = (attack_hits(natural, total, crit_range, dc) if crit_range is not None
+                                 else total >= dc)
+        if breakdown:
+            result["breakdown"] = roll["breakdown"]
+        results.append(result)
     
-    return json.dumps(result, indent=2)
+    return _response(results)
 
 
 @server.tool()
-def get_character_spells() -> str:
-    """Get all spells known by the character"""
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+@_session_dice
+def roll_group_check(check_type: str, name: str, dc: int, party: str = "",
+                     character_ids: Optional[List[str]] = None, modifiers: str = "") -> str:
+    """Roll the same check or save for every member of a group against one DC
+    
+    Every member rolls with the same modifiers in a single batch. Following
+    the 5e group check rule, the group succeeds when at least half of its
+    members succeed. Members that cannot roll are listed under "errors".
+    
+    Args:
+        check_type: Type of check ("skill", "ability", or "save")
+        name: Skill name (e.g. "stealth") or ability name (e.g. "wis")
+        dc: Difficulty class every member rolls against
+        party: Name of a party to roll for (see create_party)
+        character_ids: Ids of loaded characters to roll for, instead of a party
+        modifiers: Modifiers applied to every member's roll, as for the roll tools
+    """
+    if party:
+        if party not in parties:
+            return f"Error: Unknown party: {party}. Parties: {list(parties)}"
+        members = parties[party]
+    else:
+        members = character_ids or []
+    if not members:
+        return "Error: no group members given"
+    
+    try:
+        plan = compile_modifiers(modifiers)
+        roll_name = ""
+        rolled: List[Tuple[str, int]] = []
+        errors = []
+        for character_id in members:
+            character, error = _get_character(character_id) if character_id else (None, "Empty character id")
+            if character is None:
+                errors.append({"character_id": character_id, "error": error})
+                continue
+            roll_name, base_modifier = _get_check_modifier(character, check_type, name)
+            rolled.append((character_id, base_modifier))
+    except ValueError as e:
+        return f"Error: {e}"
+    if not rolled:
+        return f"Error: no group member could roll: {errors}"
+    
+    # One vectorized batch for the whole group; each member adds their own bonus
+    rolls = perform_roll_batch(0, plan, len(rolled))
+    results = []
+    for (character_id, base_modifier), natural, total in zip(rolled, rolls["d20"], rolls["total"]):
+        total = int(total) + base_modifier
+        results.append({
+            "character_id": character_id,
+            "total": total,
+            "natural": int(natural),
+            "success": total >= dc
+        })
+    
+    successes = sum(result["success"] for result in results)
+    summary = {
+        "roll": roll_name,
+        "party": party or None,
+        "dc": dc,
+        "successes": successes,
+        "failures": len(results) - successes,
+        "success": successes * 2 >= len(results),
+        "members": results
+    }
+    if errors:
+        summary["errors"] = errors
+    return _response(summary)
+
+
+def _make_combatants(encounter: Encounter, character_ids: List[str],
+                     monsters: List[Dict[str, Any]]) -> List[Tuple[str, Combatant]]:
+    """Combatants for loaded characters and monster specs, with ids unique in the encounter
     
-    if not current_character.spells:
+    Raises ValueError with a user-facing message for unknown characters or bad specs.
+    """
+    combatants = []
+    taken = set(encounter.combatants)
+    for character_id in character_ids:
+        character, error = _get_character(character_id) if character_id else (None, "Empty character id")
+        if character is None:
+            raise ValueError(error)
+        if character_id in taken:
+            raise ValueError(f"Duplicate combatant id: {character_id}")
+        taken.add(character_id)
+        combatants.append((character_id, Combatant(
+            name=character.name or character_id,
+            hit_points=character.hit_points,
+            initiative_bonus=character.get_ability_modifier("dex"),
+            armor_class=character.armor_class.get("value"),
+            character_id=character_id
+        )))
+    
+    for spec in monsters:
+        if not isinstance(spec, dict) or not spec.get("name"):
+            raise ValueError("Each monster must be an object with a name")
+        hp = int(spec.get("hp", 1))
+        initiative = spec.get("initiative")
+        base_id = make_character_id(str(spec["name"]))
+        number = 0
+        for _ in range(int(spec.get("count", 1))):
+            combatant_id = base_id
+            while combatant_id in taken:
+                number += 1
+                combatant_id = f"{base_id}_{number}"
+            taken.add(combatant_id)
+            combatants.append((combatant_id, Combatant(
+                name=str(spec["name"]),
+                hit_points={"max": hp, "current": hp},
+                initiative_bonus=int(spec.get("initiative_bonus", 0)),
+                armor_class=None if spec.get("ac") is None else int(spec["ac"]),
+                initiative=None if initiative is None else int(initiative)
+            )))
+    return combatants
+
+
+def _get_encounter(encounter: str) -> Tuple[Optional[Encounter], str]:
+    fight = encounters.get(encounter or DEFAULT_ENCOUNTER)
+    if fight is None:
+        return None, f"Unknown encounter: {encounter or DEFAULT_ENCOUNTER}. Encounters: {list(encounters)}"
+    return fight, ""
+
+
+def _turn_state(fight: Encounter, new_round: bool) -> Dict[str, Any]:
+    """Whose turn it is, with the full order only when a round begins"""
+    if fight.current is None:
+        return {"encounter": fight.name, "round": fight.round, "turn": None}
+    combatant = fight.combatants[fight.current]
+    state = {
+        "encounter": fight.name,
+        "round": fight.round,
+        "turn": fight.current,
+        "name": combatant.name,
+        "hp": [combatant.current_hp, combatant.max_hp],
+        "ac": combatant.armor_class
+    }
+    if new_round:
+        state["order"] = fight.snapshot()["order"]
+    return state
+
+
+@server.tool()
+@_session_dice
+def start_encounter(party: str = "", character_ids: Optional[List[str]] = None,
+                    monsters: Optional[List[Dict[str, Any]]] = None,
+                    encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Start a fight: roll initiative for everyone at once and begin the first turn
+    
+    Replaces any running encounter of the same name. Character combatants
+    use (and update) the hit points on their character sheets.
+    
+    Args:
+        party: Name of a party whose members join the fight
+        character_ids: Ids of loaded characters that join the fight
+        monsters: Monster specs, each a dict with "name" and optionally "hp",
+            "ac", "initiative_bonus", "initiative" (skips the roll) and "count"
+        encounter: Name of the encounter
+    """
+    if party and party not in parties:
+        return f"Error: Unknown party: {party}. Parties: {list(parties)}"
+    members = list(parties.get(party, [])) + list(character_ids or [])
+    
+    fight = Encounter(encounter or DEFAULT_ENCOUNTER)
+    try:
+        fight.add(_make_combatants(fight, members, monsters or []))
+    except (ValueError, TypeError) as e:
+        return f"Error: {e}"
+    if not fight.combatants:
+        return "Error: an encounter needs at least one combatant"
+    
+    encounters[fight.name] = fight
+    fight.next_turn()
+    return _response(_turn_state(fight, new_round=True))
+
+
+@server.tool()
+def next_turn(encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Advance to the next combatant's turn
+    
+    The response includes the full initiative order, with hit points,
+    whenever a new round begins.
+    
+    Args:
+        encounter: Name of the encounter
+    """
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    
+    round_before = fight.round
+    fight.next_turn()
+    return _response(_turn_state(fight, new_round=fight.round != round_before))
+
+
+@server.tool()
+def apply_damage_batch(amounts: Dict[str, int], encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Apply damage or healing to many combatants at once
+    
+    Monsters dropping to 0 hit points leave the initiative order; characters
+    stay in it. Changes to characters are saved like update_hit_points.
+    
+    Args:
+        amounts: Combatant id -> damage (positive) or healing (negative)
+        encounter: Name of the encounter
+    """
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    
+    characters = {}
+    try:
+        amounts = {combatant_id: int(amount) for combatant_id, amount in amounts.items()}
+        for combatant_id in amounts:
+            combatant = fight.combatants.get(combatant_id)
+            if combatant is not None and combatant.character_id is not None:
+                character, error = _get_character(combatant.character_id)
+                if character is None:
+                    raise ValueError(error)
+                # A character reloaded after eviction has a new hit points dict
+                combatant.hit_points = character.hit_points
+                characters[combatant_id] = character
+        changes = fight.apply(amounts)
+    except (ValueError, TypeError) as e:
+        return f"Error: {e}"
+    
+    errors = []
+    for change in changes:
+        if change.combatant_id in characters:
+            error = _record_change(change.combatant_id, characters[change.combatant_id],
+                                   ["hit_points", "current"], change.new)
+            if error:
+                errors.append(error)
+    
+    result = {
+        "changes": [[change.combatant_id, change.old, change.new] for change in changes],
+        "defeated": [change.combatant_id for change in changes if change.defeated]
+    }
+    if errors:
+        result["errors"] = errors
+    return _response(result)
+
+
+@server.tool()
+@_session_dice
+def add_combatants(character_ids: Optional[List[str]] = None,
+                   monsters: Optional[List[Dict[str, Any]]] = None,
+                   encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Add characters or monsters (e.g. summoned creatures) to a running encounter
+    
+    Newcomers roll initiative; those whose initiative has already passed this
+    round first act next round.
+    
+    Args:
+        character_ids: Ids of loaded characters that join the fight
+        monsters: Monster specs, as for start_encounter
+        encounter: Name of the encounter
+    """
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    
+    try:
+        combatants = _make_combatants(fight, list(character_ids or []), monsters or [])
+        fight.add(combatants)
+    except (ValueError, TypeError) as e:
+        return f"Error: {e}"
+    return _response({combatant_id: combatant.initiative for combatant_id, combatant in combatants})
+
+
+@server.tool()
+def remove_combatant(combatant_id: str, encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Take a combatant out of an encounter (fled, dismissed or dead)"""
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    if combatant_id not in fight:
+        return f"Error: Unknown combatant: {combatant_id}"
+    fight.remove(combatant_id)
+    return f"Removed {combatant_id} from {fight.name}"
+
+
+@server.tool()
+def get_encounter(encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """Get the round, current turn and initiative order with hit points
+    
+    Each order row is [combatant id, initiative, current hp, max hp].
+    """
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    return _response(fight.snapshot())
+
+
+@server.tool()
+def end_encounter(encounter: str = DEFAULT_ENCOUNTER) -> str:
+    """End an encounter (hit points on character sheets are kept)"""
+    fight, error = _get_encounter(encounter)
+    if fight is None:
+        return f"Error: {error}"
+    del encounters[fight.name]
+    return f"Ended encounter {fight.name} after {fight.round} rounds"
+
+
+@server.tool()
+def get_character_spells(character_id: str = "") -> str:
+    """Get all spells known by the character
+    
+    Args:
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
+    
+    return _character_response(character, "get_character_spells", lambda: _spells_response(character))
+
+
+def _spells_response(character: Character) -> str:
+    if not character.spells:
         return "Character has no spells."
     
     spells_by_level = {}
-    for spell in current_character.spells:
+    for spell in character.spells:
         level = spell.get("level", 0)
         if level not in spells_by_level:
             spells_by_level[level] = []
         spells_by_level[level].append(spell)
     
-    return json.dumps(spells_by_level, indent=2)
+    return _response(spells_by_level)
 
 
 @server.tool()
-def get_character_equipment() -> str:
-    """Get all equipment carried by the character"""
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+def get_character_equipment(character_id: str = "") -> str:
+    """Get all equipment carried by the character
     
-    equipment_info = {
-        "weapons": current_character.weapons,
-        "equipment": current_character.equipment,
-        "treasure": current_character.treasure
-    }
+    Args:
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
-    return json.dumps(equipment_info, indent=2)
+    return _character_response(character, "get_character_equipment", lambda: _response({
+        "weapons": character.weapons,
+        "equipment": character.equipment,
+        "treasure": character.treasure
+    }))
 
 
 @server.tool()
-def update_hit_points(new_current: int) -> str:
-    """Update the character's current hit points"""
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+def update_hit_points(new_current: int, character_id: str = "") -> str:
+    """Update the character's current hit points
+    
+    Args:
+        new_current: New current hit points (clamped to 0..max)
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
-    max_hp = current_character.hit_points.get("max", 0)
+    max_hp = character.hit_points.get("max", 0)
     
     if new_current < 0:
         new_current = 0
     elif new_current > max_hp:
         new_current = max_hp
     
-    old_hp = current_character.hit_points.get("current", 0)
-    current_character.hit_points["current"] = new_current
+    old_hp = character.hit_points.get("current", 0)
+    character.hit_points["current"] = new_current
+    error = _record_change(character_id, character, ["hit_points", "current"], new_current)
     
-    return f"Hit points updated: {old_hp} -> {new_current} (Max: {max_hp})"
+    result = f"Hit points updated: {old_hp} -> {new_current} (Max: {max_hp})"
+    return f"{result}\n{error}" if error else result
 
 
 @server.tool()
-def save_character(file_path: str) -> str:
-    """Save the current character to a JSON file"""
-    if not current_character:
-        return "No character currently loaded. Use load_character() first."
+def save_character(file_path: str, character_id: str = "") -> str:
+    """Save a character to a JSON file, or a compact binary file for *.dndb paths
+    
+    The file is written in the background; use flush() to wait for it.
+    
+    Args:
+        file_path: Path where to save the character
+        character_id: Id of the character to use (defaults to the active character)
+    """
+    character, error = _get_character(character_id)
+    if character is None:
+        return f"Error: {error}"
     
     try:
         # Handle relative paths
         if not os.path.isabs(file_path):
             file_path = os.path.join(os.getcwd(), file_path)
-            
-        current_character.write(file_path)
-        return f"Character saved successfully to {file_path}"
+        
+        text = character.serialize(file_path)
+        # A full save to the source file supersedes its journal
+        journal = journals.get(character_id or registry.active_id)
+        if journal is not None and os.path.abspath(journal.character_path) == os.path.abspath(file_path):
+            journal.checkpoint(text)
+        else:
+            saves.submit(file_path, text)
+        return f"Character save queued for {file_path}"
     except Exception as e:
         return f"Error saving character: {str(e)}"
 
 
+@server.tool()
+def flush(timeout: float = 30.0) -> str:
+    """Wait until every queued save is written and journals are on disk
+    
+    Args:
+        timeout: Seconds to wait at most
+    """
+    for journal in list(journals.values()):
+        journal.flush()
+    if not saves.flush(timeout):
+        return f"Error: saves still pending after {timeout}s\n" + _response(saves.metrics())
+    return _response(saves.metrics())
+
+
+@server.tool()
+def get_save_metrics() -> str:
+    """Report the save queue depth, save counts and write latency"""
+    return _response(saves.metrics())
+
+
+@server.tool()
+def get_server_metrics(tools: Optional[List[str]] = None, histograms: bool = False) -> str:
+    """Report call counts, errors, latency and response sizes of each tool, and save metrics
+    
+    Args:
+        tools: Only report these tools (defaults to every tool called so far)
+        histograms: Include the non-empty latency and response size histogram buckets
+    """
+    if not METRICS_ENABLED:
+        return "Error: tool metrics are disabled (DND_MCP_METRICS=0)"
+    return _response({
+        "uptime_s": round(time.time() - metrics.started, 3),
+        "tools": metrics.snapshot(tools, histograms),
+        "saves": saves.metrics()
+    })
+
+
+def _prometheus_metrics() -> str:
+    """Tool and save metrics in the Prometheus text format"""
+    save_metrics = saves.metrics()
+    return metrics.prometheus() + prometheus_values({
+        "save_queue_depth": ("gauge", "Saves waiting to be written", save_metrics["queue_depth"]),
+        "saves_requested_total": ("counter", "Saves requested", save_metrics["saves_requested"]),
+        "saves_written_total": ("counter", "Saves written", save_metrics["saves_written"]),
+        "saves_coalesced_total": ("counter", "Saves replaced by a newer one", save_metrics["saves_coalesced"]),
+        "saves_failed_total": ("counter", "Saves that failed", save_metrics["saves_failed"]),
+        "save_write_latency_max_seconds": ("gauge", "Slowest save write",
+                                           save_metrics["write_latency_ms"]["max"] / 1000),
+    })
+
+
+if METRICS_FILE:
+    metrics_dumper = MetricsDumper(METRICS_FILE, _prometheus_metrics, METRICS_INTERVAL)
+    metrics_dumper.start()
+    atexit.register(metrics_dumper.stop)
+
+
 @server.tool()
 def list_available_skills() -> str:
     """List all available D&D 5e skills and their associated abilities"""
-    skills_info = {}
-    for skill, ability in SKILL_ABILITIES.items():
-        skills_info[skill.replace("_", " ").title()] = ability.upper()
-    
-    return json.dumps(skills_info, indent=2)
+    return _static_response("list_available_skills", lambda: {
+        skill.replace("_", " ").title(): ability.upper() for skill, ability in SKILL_ABILITIES.items()
+    })
 
 
 @server.tool()
+@_session_dice
 def create_custom_modifier(name: str, dice: str = "", flat: int = 0, description: str = "") -> str:
     """Create and apply a custom modifier for testing
     
     Args:
         name: Name of the modifier
-        dice: Dice expression (e.g., "1d4", "2d6") 
+        dice: Dice expression (e.g., "1d4", "2d6", "2d6r2", "1d8!")
         flat: Flat numeric bonus
         description: Description of what this modifier represents
     """
@@ -334,19 +1455,94 @@ def create_custom_modifier(name: str, dice: str = "", flat: int = 0, description
         modifiers.append(f"Flat: +{flat} ({name})")
     
     if not modifiers:
-        return "No modifier created. Specify either dice or flat value."
+        return "Error: No modifier created. Specify either dice or flat value."
     
-    return json.dumps({
+    return _response({
         "modifier_name": name,
         "description": description,
         "results": modifiers
-    }, indent=2)
+    })
+
+
+@server.tool()
+@_session_dice
+def roll_dice(expression: str, count: int = 1) -> str:
+    """Roll a dice expression
+    
+    Args:
+        expression: Dice expression. Supports NdM, keep highest/lowest ("4d6kh3",
+            "2d20kl1"), rerolls of low dice ("2d6r2"), exploding dice ("1d8!"),
+            "d%" and arithmetic with + - * / and parentheses ("2d6+1d4+3")
+        count: Number of times to roll the expression (up to 10000)
+    """
+    if not 1 <= count <= 10000:
+        return "Error: count must be between 1 and 10000"
+    
+    try:
+        compiled = compile_dice(expression)
+        if count == 1:
+            total, rolls = compiled.roll()
+            return _response({"expression": compiled.text, "rolls": rolls, "total": total})
+        totals = [int(total) for total in compiled.evaluate_batch(count)]
+    except ValueError as e:
+        return f"Error: {e}"
+    
+    return _response({
+        "expression": compiled.text,
+        "count": count,
+        "totals": totals,
+        "sum": sum(totals)
+    })
+
+
+@server.tool()
+def seed_dice(seed: Optional[int] = None, record: bool = False) -> str:
+    """Restart this session's dice from a seed, for reproducible rolls
+    
+    Args:
+        seed: Non-negative integer seed (a random one is chosen, and reported, when omitted)
+        record: Keep every value drawn, for get_dice_record() and replay_dice()
+    """
+    try:
+        rng = _new_rng(seed, record=record)
+    except (TypeError, ValueError) as e:
+        return f"Error: {e}"
+    _set_session_rng(rng)
+    return f"Dice seeded with {rng.seed}" + (" (recording)" if record else "")
+
+
+@server.tool()
+def get_dice_record() -> str:
+    """Get this session's seed and every value drawn since seed_dice(record=True)"""
+    rng = _session_rng()
+    if not isinstance(rng, DiceRNG) or not rng.recording:
+        return "Error: dice are not being recorded. Use seed_dice(record=True) first."
+    return _response(rng.record())
+
+
+@server.tool()
+def replay_dice(record: Dict[str, Any]) -> str:
+    """Replay a recorded session: its rolls draw the recorded values, in order
+    
+    Repeating the recorded session's calls reproduces every roll exactly.
+    Rolls fail once the record runs out or asks for a different die; call
+    seed_dice() to return to random rolls.
+    
+    Args:
+        record: A record from get_dice_record()
+    """
+    try:
+        rng = ReplayRNG(record)
+    except ValueError as e:
+        return f"Error: {e}"
+    _set_session_rng(rng)
+    return f"Replaying {rng.remaining} recorded draws (seed {rng.seed})"
 
 
 @server.tool()
 def list_common_modifiers() -> str:
     """List common D&D modifiers and their typical dice"""
-    return json.dumps(COMMON_MODIFIERS, indent=2)
+    return _static_response("list_common_modifiers", lambda: COMMON_MODIFIERS)
 
 
 def run_server():
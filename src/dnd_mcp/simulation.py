@@ -0,0 +1,293 @@
+"""
+Monte Carlo simulation of D&D 5e rolls.
+
+This module samples roll scenarios that the exact distributions in the dice
+module cannot express, such as rerolled natural ones, minimum d20 results and
+repeated attempts. Trials are spread over worker processes, each with its own
+independently seeded random stream, and skip all breakdown formatting. The
+worker processes are started on first use and reused by later simulations.
+"""
+
+import atexit
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+try:
+    from .dice import RollType, RollModifiers, RollPlan, DiceExpression, np
+except ImportError:
+    from src.dnd_mcp.dice import RollType, RollModifiers, RollPlan, DiceExpression, np
+
+
+# Trials simulated per vectorized block, and per task handed to a worker
+BLOCK_SIZE = 65536
+CHUNK_SIZE = 262144
+
+# Largest number of trials one simulation may ask for
+MAX_TRIALS = 100_000_000
+
+# z-score for 95% confidence intervals
+Z_95 = 1.959963984540054
+
+
+@dataclass(frozen=True)
+class RollScenario:
+    """A d20 roll scenario to simulate
+
+    Attributes:
+        base_modifier: Ability/proficiency modifier added to the roll
+        dc: Total needed for success
+        roll_type: Normal, advantage or disadvantage
+        flat_total: Sum of flat modifiers
+        dice: Compiled expression of every dice modifier added to the roll
+        reroll_ones: Reroll each natural 1 on the d20 once (Halfling Lucky)
+        minimum_d20: Treat d20 results below this as this (Reliable Talent uses 10)
+        attempts: Number of tries; the scenario succeeds if any try meets the dc
+    """
+    base_modifier: int
+    dc: int
+    roll_type: RollType = RollType.NORMAL
+    flat_total: int = 0
+    dice: Tuple[DiceExpression, ...] = ()
+    reroll_ones: bool = False
+    minimum_d20: int = 1
+    attempts: int = 1
+
+    @classmethod
+    def from_modifiers(cls, base_modifier: int, modifiers: Union[RollModifiers, RollPlan],
+                       dc: int, **options) -> "RollScenario":
+        """Build a scenario from parsed modifiers or a compiled plan"""
+        plan = modifiers if isinstance(modifiers, RollPlan) else modifiers.compile()
+        return cls(base_modifier, dc, plan.roll_type, plan.flat_total, plan.dice, **options)
+
+
+@dataclass
+class SimulationResult:
+    """Aggregated outcome of a simulation run"""
+    trials: int = 0
+    successes: int = 0
+    histogram: Dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+    workers: int = 1
+
+    def merge(self, trials: int, successes: int, histogram: Dict[int, int]) -> None:
+        """Fold one worker's partial counts into this result"""
+        self.trials += trials
+        self.successes += successes
+        for total, count in histogram.items():
+            self.histogram[total] = self.histogram.get(total, 0) + count
+
+    def success_rate(self) -> float:
+        """Observed fraction of successful trials"""
+        return self.successes / self.trials if self.trials else 0.0
+
+    def success_interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """Wilson score interval for the success rate"""
+        if not self.trials:
+            return 0.0, 1.0
+        n = self.trials
+        p = self.success_rate()
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        spread = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, center - spread), min(1.0, center + spread)
+
+    def mean(self) -> float:
+        """Mean reported total"""
+        if not self.trials:
+            return 0.0
+        return sum(total * count for total, count in self.histogram.items()) / self.trials
+
+    def stdev(self) -> float:
+        """Sample standard deviation of the reported total"""
+        if self.trials < 2:
+            return 0.0
+        mean = self.mean()
+        squares = sum(count * (total - mean) ** 2 for total, count in self.histogram.items())
+        return math.sqrt(squares / (self.trials - 1))
+
+    def mean_interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """Normal-approximation confidence interval for the mean total"""
+        if not self.trials:
+            return 0.0, 0.0
+        spread = z * self.stdev() / math.sqrt(self.trials)
+        return self.mean() - spread, self.mean() + spread
+
+
+def _simulate_numpy(scenario: RollScenario, seed, trials: int,
+                    deadline: float) -> Tuple[int, int, Dict[int, int]]:
+    """Simulate trials in vectorized blocks with a NumPy generator"""
+    rng = np.random.default_rng(seed)
+    width = 1 if scenario.roll_type == RollType.NORMAL else 2
+    offset = scenario.base_modifier + scenario.flat_total
+    histogram: Dict[int, int] = {}
+    done = successes = 0
+
+    while done < trials and time.time() < deadline:
+        n = min(BLOCK_SIZE, trials - done)
+        pending = np.ones(n, dtype=bool)
+        reported = np.zeros(n, dtype=np.int64)
+
+        for _ in range(scenario.attempts):
+            d20s = rng.integers(1, 21, size=(n, width))
+            if scenario.reroll_ones:
+                ones = d20s == 1
+                d20s[ones] = rng.integers(1, 21, size=int(ones.sum()))
+            if scenario.roll_type == RollType.ADVANTAGE:
+                d20 = d20s.max(axis=1)
+            elif scenario.roll_type == RollType.DISADVANTAGE:
+                d20 = d20s.min(axis=1)
+            else:
+                d20 = d20s[:, 0]
+            totals = np.maximum(d20, scenario.minimum_d20) + offset
+            for expression in scenario.dice:
+                totals += expression.evaluate_batch(n, rng)
+
+            reported = np.where(pending, totals, reported)
+            pending &= totals < scenario.dc
+
+        values, counts = np.unique(reported, return_counts=True)
+        for total, count in zip(values.tolist(), counts.tolist()):
+            histogram[total] = histogram.get(total, 0) + count
+        successes += n - int(pending.sum())
+        done += n
+
+    return done, successes, histogram
+
+
+def _simulate_python(scenario: RollScenario, seed, trials: int,
+                     deadline: float) -> Tuple[int, int, Dict[int, int]]:
+    """Simulate trials one at a time with a private random.Random stream"""
+    rng = random.Random(seed)
+    randint = rng.randint
+    offset = scenario.base_modifier + scenario.flat_total
+    histogram: Dict[int, int] = {}
+    done = successes = 0
+
+    while done < trials and time.time() < deadline:
+        n = min(BLOCK_SIZE, trials - done)
+        for _ in range(n):
+            for _ in range(scenario.attempts):
+                d20s = [randint(1, 20)] if scenario.roll_type == RollType.NORMAL \
+                    else [randint(1, 20), randint(1, 20)]
+                if scenario.reroll_ones:
+                    d20s = [randint(1, 20) if d20 == 1 else d20 for d20 in d20s]
+                if scenario.roll_type == RollType.ADVANTAGE:
+                    d20 = max(d20s)
+                elif scenario.roll_type == RollType.DISADVANTAGE:
+                    d20 = min(d20s)
+                else:
+                    d20 = d20s[0]
+                total = max(d20, scenario.minimum_d20) + offset
+                for expression in scenario.dice:
+                    total += expression.roll(rng)[0]
+                if total >= scenario.dc:
+                    successes += 1
+                    break
+            histogram[total] = histogram.get(total, 0) + 1
+        done += n
+
+    return done, successes, histogram
+
+
+def _simulate_chunk(scenario: RollScenario, seed, trials: int,
+                    deadline: float) -> Tuple[int, int, Dict[int, int]]:
+    """Worker entry point: simulate up to `trials` trials before the deadline"""
+    if np is not None:
+        return _simulate_numpy(scenario, seed, trials, deadline)
+    return _simulate_python(scenario, seed, trials, deadline)
+
+
+def _chunks(trials: int, seed: Optional[int]) -> Iterator[Tuple[int, object]]:
+    """Yield (trials, stream seed) for each chunk, deriving seeds only as chunks are taken"""
+    root = np.random.SeedSequence(seed) if np is not None else random.Random(seed)
+    for offset in range(0, trials, CHUNK_SIZE):
+        chunk_seed = root.spawn(1)[0] if np is not None else root.getrandbits(128)
+        yield min(CHUNK_SIZE, trials - offset), chunk_seed
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared worker pool, restarted if a different size is asked for"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the shared worker processes (they are started again when needed)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown_pool)
+
+
+def simulate(scenario: RollScenario, trials: int = 1_000_000, time_budget: float = 5.0,
+             workers: Optional[int] = None, seed: Optional[int] = None) -> SimulationResult:
+    """Simulate a roll scenario across worker processes
+
+    Args:
+        scenario: The scenario to sample
+        trials: Maximum number of trials to run (at most MAX_TRIALS)
+        time_budget: Seconds after which no new trials are started
+        workers: Number of worker processes (defaults to the CPU count);
+            1 runs everything in the calling process
+        seed: Root seed for reproducible streams; random when omitted
+    """
+    if not 1 <= trials <= MAX_TRIALS:
+        raise ValueError(f"trials must be between 1 and {MAX_TRIALS}")
+    if scenario.attempts < 1:
+        raise ValueError("attempts must be at least 1")
+
+    workers = workers or os.cpu_count() or 1
+    start = time.time()
+    deadline = start + time_budget
+    chunks = _chunks(trials, seed)
+    result = SimulationResult(workers=workers)
+
+    if workers == 1 or trials <= CHUNK_SIZE:
+        result.workers = 1
+        for chunk, chunk_seed in chunks:
+            if time.time() >= deadline:
+                break
+            result.merge(*_simulate_chunk(scenario, chunk_seed, chunk, deadline))
+    else:
+        executor = _get_pool(workers)
+        running = set()
+        try:
+            while True:
+                # Keep two tasks per worker in flight until the budget runs out
+                while len(running) < 2 * workers and time.time() < deadline:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    running.add(executor.submit(_simulate_chunk, scenario, chunk[1], chunk[0], deadline))
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result.merge(*future.result())
+        except BrokenProcessPool:
+            shutdown_pool()  # A worker died; start a new pool next time
+            raise
+
+    result.elapsed = time.time() - start
+    return result
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for weapon attack profiles
+"""
+
+import json
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.attacks import damage_table, roll_damage
+from src.dnd_mcp.dice import compile_modifiers
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_attack_profiles():
+    """Both weapon formats give the ability, proficiency and damage the rules call for"""
+    print("=== Attack Profiles ===")
+
+    thorin = Character()
+    thorin.load(os.path.join(EXAMPLES, "thorin.json"))
+    battleaxe = thorin.get_attack_profile("battleaxe")
+    print(battleaxe)
+    assert battleaxe.ability == "str" and battleaxe.proficient
+    assert battleaxe.attack_bonus == thorin.get_ability_modifier("str") + thorin.get_proficiency_bonus()
+    assert battleaxe.damage_dice == "1d8" and battleaxe.damage_type == "slashing"
+    assert battleaxe.crit_range == 19  # Level 5 Champion
+
+    sorcerer = Character()
+    sorcerer.load(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"))
+    dagger = sorcerer.get_attack_profile("Dagger")
+    print(dagger)
+    assert dagger.ability == ("dex" if sorcerer.get_ability_modifier("dex") > sorcerer.get_ability_modifier("str")
+                              else "str")
+    assert dagger.damage_dice == "1d4" and dagger.damage_bonus == 1  # The sheet's own damage modifier
+    assert sorcerer.get_attack_profile("Longbow") is None
+
+    # Profiles are reused until the sheet changes
+    assert thorin.attack_profiles is thorin.attack_profiles
+    thorin.weapons = thorin.weapons + [{"name": "Longbow", "damage": "1d8", "damage_type": "piercing", "magic_bonus": 1}]
+    thorin.weapon_proficiencies = ["Simple Weapons"]
+    longbow = thorin.get_attack_profile("Longbow")
+    assert longbow.ranged and longbow.ability == "dex" and not longbow.proficient
+    assert longbow.attack_bonus == thorin.get_ability_modifier("dex") + 1
+    assert not thorin.get_attack_profile("Battleaxe").proficient
+    assert thorin.get_attack_profile("Handaxe").proficient
+
+    critical = roll_damage(battleaxe, critical=True)
+    assert len(critical["rolls"]) == 2
+    assert critical["total"] == sum(critical["rolls"]) + battleaxe.damage_bonus
+
+
+def test_roll_attack():
+    """roll_attack rolls with the weapon's bonus and rolls damage on a hit"""
+    print("=== Roll Attack ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "attack_thorin"))
+    try:
+        thorin = server.registry.get("attack_thorin")
+        profile = thorin.get_attack_profile("Battleaxe")
+        for _ in range(50):
+            result = json.loads(server.roll_attack("Battleaxe", "+1", target_ac=15))
+            natural = result["d20_roll"]["result"]
+            assert result["total"] == natural + profile.attack_bonus + 1
+            assert result["critical"] == (natural >= 19)
+            assert result["hit"] == (natural != 1 and (result["critical"] or result["total"] >= 15))
+            assert ("damage" in result) == result["hit"]
+            if result["hit"]:
+                assert len(result["damage"]["rolls"]) == (2 if result["critical"] else 1)
+
+        generic = json.loads(server.roll_attack())
+        assert generic["weapon"] == "Generic Attack" and "damage" not in generic
+        assert server.roll_attack("Warhammer").startswith("Error")
+    finally:
+        server.unload_character("attack_thorin")
+
+
+def test_damage_table():
+    """The vectorized table matches counting every d20 and bless outcome by hand"""
+    print("=== Damage Table ===")
+
+    thorin = Character()
+    thorin.load(os.path.join(EXAMPLES, "thorin.json"))
+    battleaxe = thorin.get_attack_profile("Battleaxe")
+    table = damage_table(battleaxe, compile_modifiers("+1 bless:1d4"))
+    assert table.armor_classes == list(range(5, 31))
+    assert abs(table.crit_chance - 0.1) < 1e-12  # 19-20 for a Champion
+    assert abs(table.damage_on_hit - (4.5 + battleaxe.damage_bonus)) < 1e-9
+    assert abs(table.damage_on_crit - (9 + battleaxe.damage_bonus)) < 1e-9
+
+    for armor_class, chance, damage in zip(table.armor_classes, table.hit_chances, table.damage_per_round):
+        hits = crits = 0
+        for natural in range(1, 21):
+            for bless in range(1, 5):
+                if natural >= 19:
+                    crits += 1
+                elif natural > 1 and natural + bless + 1 + battleaxe.attack_bonus >= armor_class:
+                    hits += 1
+        assert abs(chance - (hits + crits) / 80) < 1e-9, armor_class
+        assert abs(damage - (hits * table.damage_on_hit + crits * table.damage_on_crit) / 80) < 1e-9
+
+
+def test_invalid_weapons():
+    """A weapon with unparseable damage is reported without disabling the others"""
+    print("=== Invalid Weapons ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "broken_thorin"))
+    try:
+        thorin = server.registry.get("broken_thorin")
+        thorin.weapons = thorin.weapons + [
+            {"name": "Flame Tongue", "damage": "1d8 fire"},
+            {"name": "Odd Dagger", "damage": {"dice": {"sides": 4, "count": 1, "mod": "x"}}}
+        ]
+        assert set(thorin.attack_profiles) == {"battleaxe", "handaxe"}
+        assert set(thorin.attack_profile_errors) == {"flame tongue", "odd dagger"}
+        print(thorin.attack_profile_errors)
+
+        assert server.roll_attack("Battleaxe").startswith("{")
+        assert server.roll_attack("Flame Tongue").startswith("Error: Invalid weapon Flame Tongue")
+        assert server.roll_attack("Odd Dagger").startswith("Error: Invalid weapon Odd Dagger")
+        summary = json.loads(server.get_damage_per_round())
+        assert set(summary["weapons"]) == {"Battleaxe", "Handaxe"}
+        assert set(summary["invalid_weapons"]) == {"flame tongue", "odd dagger"}
+        results = json.loads(server.roll_batch([{"kind": "attack", "weapon": "Battleaxe"},
+                                                {"kind": "attack", "weapon": "Flame Tongue"}]))
+        assert "error" not in results[0] and "Flame Tongue" in results[1]["error"]
+    finally:
+        server.unload_character("broken_thorin")
+
+
+def test_damage_per_round_tool():
+    """The tool lists every weapon and is cached until the character changes"""
+    print("=== Damage Per Round ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "dpr_thorin"))
+    try:
+        response = server.get_damage_per_round(modifiers="advantage", attacks=2)
+        summary = json.loads(response)
+        print(summary["weapons"]["Battleaxe"])
+        assert set(summary["weapons"]) == {"Battleaxe", "Handaxe"} and len(summary["ac"]) == 26
+        dpr = summary["weapons"]["Battleaxe"]["dpr"]
+        assert dpr == sorted(dpr, reverse=True)
+        assert server.get_damage_per_round(modifiers="advantage", attacks=2) is response
+
+        thorin = server.registry.get("dpr_thorin")
+        thorin.ability_scores = dict(thorin.ability_scores, str=20)
+        assert json.loads(server.get_damage_per_round(modifiers="advantage", attacks=2))["weapons"]["Battleaxe"]["dpr"] > dpr
+        assert server.get_damage_per_round("Longbow").startswith("Error")
+        assert server.get_damage_per_round(attacks=0).startswith("Error")
+    finally:
+        server.unload_character("dpr_thorin")
+
+
+if __name__ == "__main__":
+    test_attack_profiles()
+    test_roll_attack()
+    test_damage_table()
+    test_invalid_weapons()
+    test_damage_per_round_tool()
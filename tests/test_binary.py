@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the binary character format
+"""
+
+import glob
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.binary import BinaryFormatError, decode_character, is_binary_file, main
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_binary_round_trip():
+    """Every example survives JSON -> binary -> JSON unchanged, eager and lazy"""
+    print("=== Binary Round Trip ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for path in sorted(glob.glob(os.path.join(EXAMPLES, "*.json"))):
+            original = Character()
+            original.load(path)
+            binary_path = os.path.join(directory, "character.dndb")
+            original.write_binary(binary_path)
+            assert is_binary_file(binary_path) and not is_binary_file(path)
+            print(f"{os.path.basename(path)}: {os.path.getsize(path)} -> {os.path.getsize(binary_path)} bytes")
+
+            for lazy in (False, True):
+                loaded = Character()
+                loaded.load(binary_path, lazy=lazy)  # Format is detected
+                assert loaded.to_json() == original.to_json()
+                assert loaded.derived_stats == original.derived_stats
+
+            # Deferred sections are copied without being decoded
+            lazy = Character()
+            lazy.load_binary(binary_path, lazy=True)
+            assert "spells" in lazy.__dict__["_deferred"]
+            assert lazy.to_binary() == original.to_binary()
+
+    # Fields that do not fit the packed core are kept as JSON
+    odd = Character()
+    odd.load(os.path.join(EXAMPLES, "thorin.json"))
+    odd.ability_scores = {"str": 300, "dex": 10, "con": 10, "int": 10, "wis": 10, "cha": 10}
+    odd.hit_points = {"max": 20, "current": 20, "temp": 5}
+    copy = Character()
+    copy._load_binary(odd.to_binary(), lazy=False)
+    assert copy.to_dict() == odd.to_dict()
+
+    try:
+        decode_character(b"DNDB\x63")
+        assert False, "damaged data should be rejected"
+    except BinaryFormatError as e:
+        print(f"Rejected: {e}")
+
+
+def test_converter_and_server():
+    """The converter writes both directions; tools load and save binary sheets"""
+    print("=== Converter and Server ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "thorin.json")
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), path)
+        binary_path = os.path.join(directory, "thorin.dndb")
+        assert main([path]) == 0
+        assert is_binary_file(binary_path)
+        assert main([binary_path, "-o", os.path.join(directory, "back.json")]) == 0
+        original = Character()
+        original.load(path)
+        with open(os.path.join(directory, "back.json"), encoding='utf-8') as converted:
+            assert converted.read() == original.to_json()
+
+        # Journaled changes to a binary sheet are checkpointed back as binary
+        print(server.load_character(binary_path, "binary_thorin"))
+        print(server.update_hit_points(7, "binary_thorin"))
+        print(server.save_character(binary_path, "binary_thorin"))
+        print(server.flush())
+        assert is_binary_file(binary_path)
+        reloaded = Character()
+        reloaded.load(binary_path)
+        assert reloaded.hit_points["current"] == 7
+        server.unload_character("binary_thorin")
+
+
+if __name__ == "__main__":
+    test_binary_round_trip()
+    test_converter_and_server()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk character import
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.bulk import bulk_load
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_bulk_load():
+    """Directories and JSONL files load in order, reporting bad entries"""
+    print("=== Bulk Load ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), directory)
+        shutil.copy(os.path.join(EXAMPLES, "gandalf.json"), directory)
+        with open(os.path.join(directory, "broken.json"), "w") as file:
+            file.write("{not json")
+
+        results = list(bulk_load(directory, workers=2, max_in_flight=1))
+        for result in results:
+            print(f"  {os.path.basename(result.source)}: {result.error or result.character.name}")
+        assert [os.path.basename(result.source) for result in results] == \
+            ["broken.json", "gandalf.json", "thorin.json"]
+        assert results[0].character is None and "Invalid JSON" in results[0].error
+        assert results[2].character.get_level() == 5
+
+        jsonl_path = os.path.join(directory, "roster.jsonl")
+        with open(os.path.join(EXAMPLES, "thorin.json")) as file:
+            thorin = json.load(file)
+        with open(jsonl_path, "w") as file:
+            for hit_points in range(1, 6):
+                thorin["hit_points"]["current"] = hit_points
+                file.write(json.dumps(thorin) + "\n")
+            file.write("\n[]\n")
+
+        results = list(bulk_load(jsonl_path, processes=True, workers=2))
+        assert [result.character.hit_points["current"] for result in results[:5]] == [1, 2, 3, 4, 5]
+        assert results[5].source.endswith(":7") and results[5].error is not None
+
+        print(server.import_characters(jsonl_path))
+        assert "thorin_ironforge_5" in server.registry
+        assert server.registry.get("thorin_ironforge_3").hit_points["current"] == 3
+
+
+if __name__ == "__main__":
+    test_bulk_load()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the character catalog index
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.catalog import Catalog, CATALOG_FILE_NAME
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_catalog_index():
+    """The index is persisted, searched without JSON and refreshed incrementally"""
+    print("=== Catalog Index ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("thorin.json", "gandalf.json", "Dragonborn Sorcerer 1.json"):
+            shutil.copy(os.path.join(EXAMPLES, name), directory)
+
+        catalog = Catalog(directory)
+        assert catalog.refresh()[:3] == (3, 0, 0)
+        assert os.path.exists(os.path.join(directory, CATALOG_FILE_NAME))
+
+        # A fresh instance reads the persisted index without rescanning
+        reopened = Catalog(directory)
+        assert len(reopened) == 3
+        thorin = reopened.find("THORIN IRONFORGE")[0]
+        print(f"  {thorin}")
+        assert (thorin.race, thorin.classes, thorin.level) == ("Dwarf", "Fighter 5", 5)
+        assert [entry.name for entry in reopened.search(class_name="wizard")] == ["Gandalf the Grey"]
+        assert len(reopened.search(min_level=2, max_level=10)) == 1
+        assert reopened.find("nobody") == []
+
+        # Only changed files are re-read
+        path = os.path.join(directory, "thorin.json")
+        with open(path) as file:
+            data = json.load(file)
+        data["classes"][0]["level"] = 6
+        with open(path, "w") as file:
+            json.dump(data, file)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        os.remove(os.path.join(directory, "gandalf.json"))
+        assert reopened.refresh()[:3] == (0, 1, 1)
+        assert reopened.find("Thorin Ironforge")[0].level == 6
+        assert not reopened.is_stale()
+
+        # An edit in place, which leaves the directory's mtime alone, is noticed
+        data["classes"][0]["level"] = 7
+        with open(path, "w") as file:
+            json.dump(data, file)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+        assert reopened.is_stale()
+        assert reopened.refresh()[:3] == (0, 1, 0)
+        assert reopened.find("Thorin Ironforge")[0].level == 7
+
+        # Sheets that cannot be indexed are reported without stopping the scan
+        sheets = (("words.json", {"classes": [{"name": "Fighter", "level": "five"}]}),
+                  ("epic.json", {"classes": [{"name": "Fighter", "level": 70000}]}),
+                  ("half.json", {"classes": [{"name": "Fighter", "level": 2.5}]}),
+                  ("number.json", {"name": 42}),
+                  ("odd_race.json", {"race": {"name": ["Elf"]}}))
+        for name, fields in sheets:
+            with open(os.path.join(directory, name), "w") as file:
+                json.dump({**data, "name": name, **fields}, file)
+        added, _, _, errors = reopened.refresh()
+        print(f"  errors: {errors}")
+        assert added == 0 and len(errors) == 5 and len(reopened) == 2
+        # ...and only read again once they change
+        assert not reopened.is_stale()
+        assert reopened.refresh()[3] == errors
+
+        print(server.search_characters(race="dragon", directory=directory))
+        print(server.load_character_by_name("thorin", directory=directory))
+        assert server.registry.get().get_level() == 7
+        assert server.load_character_by_name("nobody", directory=directory).startswith("Error: No character")
+        assert server.load_character_by_name("o", directory=directory).startswith("Error: 'o' matches several")
+        server.unload_character("thorin_ironforge")
+
+
+if __name__ == "__main__":
+    test_catalog_index()
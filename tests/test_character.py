@@ -97,5 +97,66 @@ def main():
     print("New character saved to: ../examples/characters/gandalf.json")
 
 
+
+def test_derived_stats():
+    """Derived stats are cached and rebuilt when their source data changes"""
+    char = Character()
+    char.load(os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters', 'thorin.json'))
+
+    stats = char.derived_stats
+    assert char.derived_stats is stats
+    assert char.get_level() == 5
+    assert char.get_proficiency_bonus() == 3
+    assert char.get_skill_bonus("athletics").total == 3 + 3
+    assert char.get_saving_throw_bonus("dex").is_proficient is False
+
+    # Assigning unrelated fields keeps the cached table
+    char.hit_points = {"max": 44, "current": 1}
+    assert char.derived_stats is stats
+
+    # Assigning a source field invalidates it; changes in place need touch()
+    char.classes[0]["level"] = 9
+    assert char.get_proficiency_bonus() == 3
+    char.touch()
+    assert char.get_proficiency_bonus() == 4
+    char.ability_scores = dict(char.ability_scores, str=20)
+    assert char.get_skill_bonus("athletics").total == 5 + 4
+    char.skills["acrobatics"] = True
+    char.touch()
+    assert char.get_skill_bonus("acrobatics").is_proficient
+    char.saving_throws = {"dex": True}
+    assert char.get_saving_throw_bonus("dex").total == 0 + 4
+    assert char.get_saving_throw_bonus("str").is_proficient is False
+
+    # Fields are stored as given
+    assert type(char.classes) is list and type(char.ability_scores) is dict
+    assert json.loads(char.to_json()) == char.to_dict()
+
+
+def test_lazy_load():
+    """Lazy loading defers non-combat sections without changing the character"""
+    path = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters', 'Dragonborn Sorcerer 1.json')
+    eager = Character()
+    eager.load(path)
+    lazy = Character()
+    lazy.load(path, lazy=True)
+
+    # Core fields are ready, deferred sections are still raw text
+    assert lazy.get_skill_bonus("arcana") == eager.get_skill_bonus("arcana")
+    assert "spells" not in lazy.__dict__
+    assert lazy.spells == eager.spells
+    assert "spells" in lazy.__dict__
+
+    # Assigning a deferred section replaces the raw text
+    lazy.weapons = []
+    assert lazy.weapons == []
+    lazy.weapons = eager.weapons
+
+    assert lazy.to_json() == eager.to_json()
+    print("Lazy load matches eager load")
+
+
 if __name__ == "__main__":
     main()
+    test_derived_stats()
+    test_lazy_load()
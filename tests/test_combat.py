@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the combat tracker
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.combat import Combatant, Encounter
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def monster(name: str, initiative: int, hp: int = 10, bonus: int = 0) -> Combatant:
+    return Combatant(name, {"max": hp, "current": hp}, initiative_bonus=bonus, initiative=initiative)
+
+
+def test_turn_order():
+    """Turns follow initiative; joining and leaving mid-round keeps the order"""
+    print("=== Turn Order ===")
+
+    fight = Encounter("test")
+    fight.add([("orc", monster("Orc", 12)), ("elf", monster("Elf", 18, bonus=3)),
+               ("wolf", monster("Wolf", 18, bonus=2)), ("bat", monster("Bat", 5))])
+    assert fight.order() == ["elf", "wolf", "orc", "bat"]
+
+    assert [fight.next_turn(), fight.next_turn()] == ["elf", "wolf"]
+    assert fight.round == 1
+    # Summoned at 15 acts this round; at 20 it waits for the next one
+    fight.add([("imp", monster("Imp", 15)), ("sprite", monster("Sprite", 20))])
+    fight.remove("orc")
+    assert [fight.next_turn(), fight.next_turn()] == ["imp", "bat"]
+    assert fight.next_turn() == "sprite" and fight.round == 2
+    assert fight.snapshot()["order"][0] == ["sprite", 20, 10, 10]
+
+    changes = fight.apply({"bat": 25, "imp": -5, "wolf": 4})
+    assert [(change.new, change.defeated) for change in changes] == [(0, True), (10, False), (6, False)]
+    assert "bat" not in fight
+    assert [fight.next_turn() for _ in range(4)] == ["elf", "wolf", "imp", "sprite"]
+
+    try:
+        fight.apply({"elf": 1, "ghost": 1})
+        assert False, "unknown combatants should be rejected"
+    except ValueError as e:
+        print(f"Rejected: {e}")
+    assert fight.combatants["elf"].current_hp == 10
+
+
+def test_initiative_rolls():
+    """Combatants without an initiative roll d20 plus their bonus"""
+    print("=== Initiative Rolls ===")
+
+    fight = Encounter()
+    fight.add((f"goblin_{i}", Combatant("Goblin", {"max": 7, "current": 7}, initiative_bonus=2))
+              for i in range(200))
+    assert all(3 <= combatant.initiative <= 22 for combatant in fight.combatants.values())
+    seen = [fight.next_turn() for _ in range(200)]
+    assert sorted(seen) == sorted(fight.combatants) and fight.round == 1
+    initiatives = [fight.combatants[combatant_id].initiative for combatant_id in seen]
+    assert initiatives == sorted(initiatives, reverse=True)
+
+
+def test_combat_tools():
+    """A fight between a loaded character and monsters, through the server tools"""
+    print("=== Combat Tools ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "thorin.json")
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), path)
+        print(server.load_character(path, "combat_thorin"))
+        try:
+            thorin = server.registry.get("combat_thorin")
+            state = json.loads(server.start_encounter(
+                character_ids=["combat_thorin"],
+                monsters=[{"name": "Goblin", "hp": 7, "ac": 15, "initiative_bonus": 2, "count": 3}]))
+            print(json.dumps(state))
+            assert state["round"] == 1 and len(state["order"]) == 4
+            assert {row[0] for row in state["order"]} == {"combat_thorin", "goblin", "goblin_1", "goblin_2"}
+
+            for _ in range(3):
+                state = json.loads(server.next_turn())
+                assert "order" not in state
+            assert "order" in json.loads(server.next_turn())
+
+            max_hp = thorin.hit_points["max"]
+            result = json.loads(server.apply_damage_batch({"combat_thorin": 5, "goblin": 10, "goblin_1": 3}))
+            assert result["changes"][0] == ["combat_thorin", max_hp, max_hp - 5]
+            assert result["defeated"] == ["goblin"]
+            assert thorin.hit_points["current"] == max_hp - 5
+            assert os.path.exists(path + ".journal")
+
+            added = json.loads(server.add_combatants(monsters=[{"name": "Goblin", "hp": 7}]))
+            assert list(added) == ["goblin"]
+            print(server.remove_combatant("goblin_2"))
+            ids = [row[0] for row in json.loads(server.get_encounter())["order"]]
+            assert sorted(ids) == ["combat_thorin", "goblin", "goblin_1"]
+
+            assert server.apply_damage_batch({"nobody": 1}).startswith("Error")
+            assert server.start_encounter(character_ids=["nobody"]).startswith("Error")
+            assert server.next_turn("nowhere").startswith("Error: Unknown encounter")
+            print(server.end_encounter())
+            assert not server.encounters
+        finally:
+            server.encounters.clear()
+            server.unload_character("combat_thorin")
+            server.flush()
+
+
+if __name__ == "__main__":
+    test_turn_order()
+    test_initiative_rolls()
+    test_combat_tools()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact character representation
+"""
+
+import glob
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.bulk import bulk_load
+from src.dnd_mcp.compact import CompactCharacter
+from src.dnd_mcp.registry import CharacterRegistry
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_identical_output():
+    """Compact characters serialize exactly like Character"""
+    print("=== Identical Output ===")
+
+    for path in glob.glob(os.path.join(EXAMPLES, "*.json")):
+        full = Character()
+        full.load(path)
+        compact = CompactCharacter()
+        compact.load(path)
+        print(f"{compact}")
+
+        assert compact.to_json() == full.to_json()
+        assert compact.get_level() == full.get_level()
+        for skill in ("arcana", "athletics", "perception", "stealth"):
+            assert compact.get_skill_bonus(skill) == full.get_skill_bonus(skill)
+        for ability in ("str", "dex", "con", "int", "wis", "cha"):
+            assert compact.get_saving_throw_bonus(ability) == full.get_saving_throw_bonus(ability)
+        assert compact.to_character().to_dict() == full.to_dict()
+
+
+def test_updates():
+    """Packed fields update by assignment and fall back when they cannot be packed"""
+    print("\n=== Updates ===")
+
+    compact = CompactCharacter()
+    compact.load(os.path.join(EXAMPLES, "thorin.json"))
+
+    compact.set_current_hit_points(12)
+    assert compact.hit_points == {"max": 52, "current": 12}
+
+    compact.hit_points = {"max": 52, "current": 40, "temp": 5}
+    compact.ability_scores = {"str": 18, "dex": 10, "con": 16, "int": 12, "wis": 14, "cha": 10}
+    compact.skills = {"Athletics": True}
+    compact.equipment.append({"name": "Rope"})
+    compact.compact()
+
+    data = compact.to_dict()
+    assert data["hit_points"] == {"max": 52, "current": 40, "temp": 5}
+    assert data["skills"] == {"Athletics": True}
+    assert data["equipment"][-1] == {"name": "Rope"}
+    assert compact.get_skill_bonus("athletics").total == 4 + 3
+
+    # Level changes, in place or by assignment, survive re-encoding
+    compact.classes[0]["level"] = 9
+    compact.compact()
+    assert compact.get_level() == 9 == compact.to_dict()["classes"][0]["level"]
+    assert compact.get_proficiency_bonus() == 4
+    assert compact.get_skill_bonus("athletics").total == 4 + 4
+    compact.classes = [dict(compact.classes[0], level=13)]
+    compact.compact()
+    assert compact.get_level() == 13 and compact.get_proficiency_bonus() == 5
+
+
+def test_registry_and_bulk_load():
+    """The registry can keep evicted characters compact, and bulk_load can yield them"""
+    print("=== Compact Registry ===")
+
+    registry = CharacterRegistry(max_resident=1, compact=True)
+    thorin_id, thorin = registry.load(os.path.join(EXAMPLES, "thorin.json"))
+    thorin.hit_points = {"max": thorin.hit_points["max"], "current": 3}
+    expected = thorin.to_dict()
+    gandalf_id, _ = registry.load(os.path.join(EXAMPLES, "gandalf.json"))
+    assert registry.peek(thorin_id) is None and thorin_id in registry and len(registry) == 2
+    assert registry.spill_dir is None  # Nothing was written to disk
+
+    reloaded = registry.get(thorin_id)
+    assert isinstance(reloaded, Character) and reloaded.to_dict() == expected
+    assert registry.peek(gandalf_id) is None  # Packed in turn
+    assert registry.remove(gandalf_id) and registry.ids() == [thorin_id]
+
+    results = list(bulk_load(os.path.join(EXAMPLES, "*.json"), workers=2, compact=True))
+    assert results and all(isinstance(result.character, CompactCharacter) for result in results)
+    for result in results:
+        character = Character()
+        character.load(result.source)
+        assert result.character.to_dict() == character.to_dict()
+
+
+if __name__ == "__main__":
+    test_identical_output()
+    test_updates()
+    test_registry_and_bulk_load()
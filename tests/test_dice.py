@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the dice engine
+"""
+
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.dice import (
+    RollType, DiceModifier, roll_d20, roll_dice_batch, roll_d20_batch,
+    perform_roll, perform_roll_batch, parse_modifiers_string,
+    d20_distribution, check_distribution, compile_modifiers, RollPlan,
+    compile_dice, DiceExpressionError
+)
+
+
+def test_single_rolls():
+    """Single rolls keep their original result shape"""
+    print("=== Single Rolls ===")
+
+    result = roll_d20(RollType.ADVANTAGE)
+    print(f"d20 with advantage: {result}")
+    assert len(result["rolls"]) == 2
+    assert result["result"] == max(result["rolls"])
+
+    result = roll_d20(RollType.DISADVANTAGE)
+    assert result["result"] == min(result["rolls"])
+
+    result = DiceModifier("Bless", "2d4").roll()
+    print(f"Bless 2d4: {result}")
+    assert len(result["rolls"]) == 2
+    assert 2 <= result["total"] <= 8
+
+    result = perform_roll(3, parse_modifiers_string("advantage +2 guidance:1d4"), "Test Check")
+    print(f"Breakdown: {result['breakdown']}")
+    assert result["total"] == (result["d20_roll"]["result"] + 3 + 2
+                               + result["dice_modifiers"][0]["total"])
+
+
+def test_batch_rolls():
+    """Batch rolls stay within range and apply advantage per roll"""
+    print("\n=== Batch Rolls ===")
+
+    rolls = roll_dice_batch(6, 3, 1000)
+    assert len(rolls) == 1000
+    assert all(1 <= face <= 6 for row in rolls for face in row)
+
+    batch = roll_d20_batch(1000, RollType.ADVANTAGE)
+    assert all(result == max(row) for result, row in zip(batch["result"], batch["rolls"]))
+
+    modifiers = parse_modifiers_string("disadvantage -1 bless:1d4 bardic:1d8")
+    batch = perform_roll_batch(5, modifiers, 10000)
+    totals = list(batch["total"])
+    print(f"10000 rolls: min={min(totals)} max={max(totals)}")
+    assert min(totals) >= 1 + 5 - 1 + 2
+    assert max(totals) <= 20 + 5 - 1 + 12
+
+
+def test_distributions():
+    """Exact distributions match the closed-form odds"""
+    print("\n=== Distributions ===")
+
+    normal = d20_distribution()
+    assert abs(normal.probability_at_least(11) - 0.5) < 1e-9
+    assert abs(normal.mean() - 10.5) < 1e-9
+
+    advantage = d20_distribution(RollType.ADVANTAGE)
+    assert abs(advantage.probability_at_least(11) - 0.75) < 1e-9
+    assert abs(sum(advantage.probabilities) - 1.0) < 1e-9
+
+    distribution = check_distribution(3, parse_modifiers_string("+1 bless:1d4 bardic:1d8"))
+    print(f"d20+4+1d4+1d8: {distribution.minimum}..{distribution.maximum}, "
+          f"mean {distribution.mean():.2f}, P(>=15) {distribution.probability_at_least(15):.4f}")
+    assert distribution.minimum == 1 + 4 + 1 + 1
+    assert distribution.maximum == 20 + 4 + 4 + 8
+    assert abs(distribution.mean() - (10.5 + 4 + 2.5 + 4.5)) < 1e-9
+    assert distribution.percentile(0.5) == 21
+
+
+def test_compiled_plans():
+    """Compiled plans are cached, hashable and roll like the parsed modifiers"""
+    print("\n=== Compiled Plans ===")
+
+    plan = compile_modifiers("advantage -2 +1 guidance:1d4 bardic:1d8")
+    assert compile_modifiers("advantage -2 +1 guidance:1d4 bardic:1d8") is plan
+    assert isinstance(plan, RollPlan)
+    assert plan == parse_modifiers_string("advantage -2 +1 guidance:1d4 bardic:1d8").compile()
+    assert hash(plan) == hash(plan.to_modifiers().compile())
+    assert plan.flat_total == -1
+    assert plan.dice == (compile_dice("1d4"), compile_dice("1d8"))
+
+    result = perform_roll(0, plan, "Plan Check")
+    print(f"Breakdown: {result['breakdown']}")
+    assert result["breakdown"].endswith(f"= {result['total']}")
+    assert [mod["value"] for mod in result["flat_modifiers"]] == [-2, 1]
+
+
+def test_dice_expressions():
+    """Expressions compile once and evaluate within their exact range"""
+    print("\n=== Dice Expressions ===")
+
+    assert compile_dice("4d6kh3") is compile_dice("4D6KH3")
+
+    for text, low, high in [("4d6kh3", 3, 18), ("2d6r1+3", 5, 15), ("1d8+1d4*2", 3, 16),
+                            ("(1d4+1)/2", 1, 2), ("d%", 1, 100), ("-1d4", -4, -1)]:
+        expression = compile_dice(text)
+        totals = list(expression.evaluate_batch(2000))
+        distribution = expression.distribution()
+        print(f"{text}: {min(totals)}..{max(totals)}, mean {distribution.mean():.3f}")
+        assert (distribution.minimum, distribution.maximum) == (low, high)
+        assert low <= min(totals) and max(totals) <= high
+        assert abs(sum(distribution.probabilities) - 1.0) < 1e-9
+
+    total, rolls = compile_dice("4d6kh3").roll()
+    assert len(rolls) == 3 and total == sum(rolls)
+
+    assert abs(compile_dice("4d6kh3").distribution().mean() - 12.2446) < 1e-3
+    assert abs(compile_dice("2d6r2").distribution().mean() - 8.3333) < 1e-3
+    assert abs(compile_dice("1d6!").distribution().mean() - 4.2) < 1e-6
+
+    for text in ["", "2d", "1d6kh3", "1d6r6", "3+", "1d6)", "2x6", "1d0"]:
+        try:
+            compile_dice(text)
+        except DiceExpressionError as e:
+            print(f"'{text}': {e}")
+        else:
+            raise AssertionError(f"'{text}' should not compile")
+
+
+if __name__ == "__main__":
+    test_single_rolls()
+    test_batch_rolls()
+    test_distributions()
+    test_compiled_plans()
+    test_dice_expressions()
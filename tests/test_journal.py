@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the character change journal
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp.journal import CharacterJournal, JOURNAL_SUFFIX, COMPACTING_SUFFIX
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_journal_replay_and_compaction():
+    """Journaled changes survive a reload and are folded into the file on compaction"""
+    print("=== Journal Replay and Compaction ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "thorin.json")
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), path)
+        with open(path) as file:
+            original = file.read()
+
+        character = Character()
+        character.load(path)
+        journal = CharacterJournal(path, fsync="always", compact_after=3)
+        for hit_points in (30, 20):
+            character.hit_points["current"] = hit_points
+            journal.record(["hit_points", "current"], hit_points, lambda: character.serialize(path))
+
+        # The file is untouched; a fresh load replays the journal
+        with open(path) as file:
+            assert file.read() == original
+        reloaded = Character()
+        reloaded.load(path, lazy=True)
+        assert reloaded.hit_points["current"] == 20
+
+        # A torn final record (crash mid-append) is ignored and cut off
+        with open(path + JOURNAL_SUFFIX, "a") as file:
+            file.write('{"set":["hit_points","current"],"val')
+        reloaded = Character()
+        reloaded.load(path)
+        assert reloaded.hit_points["current"] == 20
+        journal = CharacterJournal(path, fsync="always", compact_after=3)
+        assert journal.records == 2
+
+        # The third record checkpoints the full character into its file
+        character.hit_points["current"] = 5
+        journal.record(["hit_points", "current"], 5, lambda: character.serialize(path))
+        assert journal.wait(timeout=5)
+        assert not os.path.exists(path + JOURNAL_SUFFIX)
+        assert not os.path.exists(path + COMPACTING_SUFFIX)
+        with open(path) as file:
+            assert json.load(file)["hit_points"]["current"] == 5
+        journal.close()
+
+        # Tools journal their changes; saving over the source checkpoints the journal
+        print(server.load_character(path, "journaled"))
+        print(server.update_hit_points(12, "journaled"))
+        server.journals["journaled"].flush()
+        assert os.path.exists(path + JOURNAL_SUFFIX)
+        print(server.save_character(path, "journaled"))
+        print(server.flush())
+        assert not os.path.exists(path + JOURNAL_SUFFIX)
+        with open(path) as file:
+            assert json.load(file)["hit_points"]["current"] == 12
+        server.unload_character("journaled")
+
+
+def test_failed_checkpoint():
+    """A checkpoint that cannot be written keeps the journal and does not stop later ones"""
+    print("\n=== Failed Checkpoint ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "thorin.json")
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), path)
+
+        def fail(path, text, on_written, on_failed):
+            on_failed("disk full")
+
+        character = Character()
+        character.load(path)
+        journal = CharacterJournal(path, compact_after=2, submit=fail)
+        for hit_points in (30, 20):
+            character.hit_points["current"] = hit_points
+            journal.record(["hit_points", "current"], hit_points, lambda: character.serialize(path))
+        assert journal.wait(timeout=5)
+        assert os.path.exists(path + COMPACTING_SUFFIX)
+
+        # Later records still checkpoint; the failed one's records survive until then
+        journal.close()
+        journal = CharacterJournal(path, compact_after=1)
+        reloaded = Character()
+        reloaded.load(path)
+        assert reloaded.hit_points["current"] == 20
+        character.hit_points["current"] = 5
+        journal.record(["hit_points", "current"], 5, lambda: character.serialize(path))
+        assert journal.wait(timeout=5)
+        assert not os.path.exists(path + JOURNAL_SUFFIX)
+        assert not os.path.exists(path + COMPACTING_SUFFIX)
+        with open(path) as file:
+            assert json.load(file)["hit_points"]["current"] == 5
+        journal.close()
+
+    # The same journal retries once its failed checkpoint is accounted for
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "thorin.json")
+        shutil.copy(os.path.join(EXAMPLES, "thorin.json"), path)
+        outcomes = ["fail", "write"]
+
+        def flaky(path, text, on_written, on_failed):
+            if outcomes.pop(0) == "fail":
+                on_failed("disk full")
+            else:
+                with open(path, "w") as file:
+                    file.write(text)
+                on_written()
+
+        character = Character()
+        character.load(path)
+        journal = CharacterJournal(path, compact_after=1, submit=flaky)
+        for hit_points in (30, 20):
+            character.hit_points["current"] = hit_points
+            journal.record(["hit_points", "current"], hit_points, lambda: character.serialize(path))
+        assert journal.wait(timeout=5) and not outcomes
+        assert not os.path.exists(path + JOURNAL_SUFFIX)
+        assert not os.path.exists(path + COMPACTING_SUFFIX)
+        with open(path) as file:
+            assert json.load(file)["hit_points"]["current"] == 20
+        journal.close()
+
+
+if __name__ == "__main__":
+    test_journal_replay_and_compaction()
+    test_failed_checkpoint()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for tool metrics
+"""
+
+import json
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.metrics import LATENCY_BOUNDS, MetricsDumper, ToolMetrics, percentile
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_histograms():
+    """Buckets are at most 25% wide and percentiles land in the right one"""
+    print("=== Histograms ===")
+
+    assert LATENCY_BOUNDS == sorted(LATENCY_BOUNDS)
+    assert all(upper / lower <= 1.25 + 1e-9 for lower, upper in zip(LATENCY_BOUNDS, LATENCY_BOUNDS[1:]))
+
+    metrics = ToolMetrics()
+    metrics.instrument(lambda: None, "probe")
+    stats = metrics.tools["probe"]
+    for _ in range(90):
+        stats.record(0.001, 100, False)
+    for _ in range(10):
+        stats.record(0.5, 5000, True)
+    snapshot = metrics.snapshot(histograms=True)["probe"]
+    print(snapshot)
+    assert snapshot["calls"] == 100 and snapshot["errors"] == 10
+    assert 1 <= snapshot["latency_ms"]["p50"] <= 1.25 and snapshot["latency_ms"]["p99"] == 500
+    assert snapshot["response_bytes"] == {"total": 59000, "mean": 590.0, "p99": 5000, "max": 5000}
+    assert sum(count for _, count in snapshot["latency_buckets_ms"]) == 100
+    assert percentile([1.0, 2.0], [0, 0, 0], 50) == 0.0
+
+
+def test_concurrent_recording():
+    """Calls from many threads are all counted"""
+    print("=== Concurrent Recording ===")
+
+    metrics = ToolMetrics()
+    tool = metrics.instrument(lambda value: "Error: odd" if value % 2 else "even", "parity")
+
+    def call():
+        for value in range(1000):
+            tool(value)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snapshot = metrics.snapshot()["parity"]
+    assert snapshot["calls"] == 8000 and snapshot["errors"] == 4000
+
+    failing = metrics.instrument(lambda: 1 / 0, "failing")
+    try:
+        failing()
+        assert False, "exceptions should propagate"
+    except ZeroDivisionError:
+        pass
+    assert metrics.snapshot(["failing"])["failing"]["errors"] == 1
+
+
+def test_server_metrics():
+    """Every registered tool is instrumented and reported by get_server_metrics"""
+    print("=== Server Metrics ===")
+
+    def calls(name):
+        return json.loads(server.get_server_metrics([name])).get("tools", {}).get(name, {}).get("calls", 0)
+
+    before = calls("roll_dice")
+    assert server.roll_dice("2d6").startswith("{")
+    assert server.roll_dice("nonsense").startswith("Error")
+    report = json.loads(server.get_server_metrics(["roll_dice"], histograms=True))
+    print(report["tools"])
+    stats = report["tools"]["roll_dice"]
+    assert stats["calls"] == before + 2 and stats["errors"] >= 1
+    assert "latency_buckets_ms" in stats and "saves" in report
+    assert set(server.metrics.tools) >= {"load_character", "roll_dice", "get_server_metrics"}
+
+    # Tool failures such as an unknown character count as errors
+    def errors(name):
+        return json.loads(server.get_server_metrics([name])).get("tools", {}).get(name, {}).get("errors", 0)
+
+    failures = {name: errors(name) for name in ("roll_skill_check", "get_character_info", "select_character")}
+    assert server.roll_skill_check("athletics", character_id="nobody").startswith("Error: Unknown character id")
+    assert server.get_character_info("nobody").startswith("Error")
+    assert server.select_character("nobody").startswith("Error")
+    assert all(errors(name) == count + 1 for name, count in failures.items())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.prom")
+        dumper = MetricsDumper(path, server._prometheus_metrics, 0.05)
+        dumper.start()
+        time.sleep(0.2)
+        dumper.stop()
+        with open(path) as file:
+            text = file.read()
+    assert '# TYPE dnd_mcp_tool_latency_seconds histogram' in text
+    assert f'dnd_mcp_tool_calls_total{{tool="roll_dice"}} {before + 2}' in text
+    assert 'dnd_mcp_tool_latency_seconds_bucket{tool="roll_dice",le="+Inf"}' in text
+    assert 'dnd_mcp_save_queue_depth' in text
+
+
+if __name__ == "__main__":
+    test_histograms()
+    test_concurrent_recording()
+    test_server_metrics()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for parties and group checks
+"""
+
+import json
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_parties():
+    """Parties group loaded characters and lose members that are unloaded"""
+    print("=== Parties ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "party_thorin"))
+    print(server.load_character(os.path.join(EXAMPLES, "gandalf.json"), "party_gandalf"))
+    try:
+        print(server.create_party("fellowship", ["party_thorin", "party_gandalf", "party_thorin"]))
+        assert json.loads(server.list_parties())["fellowship"] == ["party_thorin", "party_gandalf"]
+        assert server.create_party("strangers", ["party_thorin", "nobody"]).startswith("Error: Unknown")
+        assert server.create_party("empty", []).startswith("Error")
+
+        server.unload_character("party_gandalf")
+        assert server.parties["fellowship"] == ["party_thorin"]
+        print(server.disband_party("fellowship"))
+        assert "fellowship" not in server.parties
+        assert server.disband_party("fellowship").startswith("Error: Unknown")
+    finally:
+        server.unload_character("party_thorin")
+        server.unload_character("party_gandalf")
+        server.parties.clear()
+
+
+def test_group_check():
+    """Every member rolls once; the group succeeds when half of them succeed"""
+    print("=== Group Check ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "group_thorin"))
+    print(server.load_character(os.path.join(EXAMPLES, "gandalf.json"), "group_gandalf"))
+    try:
+        thorin = server.registry.get("group_thorin")
+        gandalf = server.registry.get("group_gandalf")
+        bonuses = {
+            "group_thorin": thorin.get_skill_bonus("stealth").total,
+            "group_gandalf": gandalf.get_skill_bonus("stealth").total,
+        }
+        server.create_party("group", ["group_thorin", "group_gandalf"])
+
+        summary = json.loads(server.roll_group_check("skill", "stealth", 12, party="group", modifiers="+1"))
+        print(json.dumps(summary, indent=2))
+        assert summary["roll"] == "Stealth Check" and summary["party"] == "group"
+        for member in summary["members"]:
+            assert member["total"] == member["natural"] + bonuses[member["character_id"]] + 1
+            assert member["success"] == (member["total"] >= 12)
+        assert summary["successes"] + summary["failures"] == 2
+        assert summary["success"] == (summary["successes"] >= 1)
+
+        # A large group of the same characters still rolls in one call
+        crowd = ["group_thorin", "group_gandalf"] * 500 + ["nobody"]
+        summary = json.loads(server.roll_group_check("save", "dex", 10, character_ids=crowd))
+        assert len(summary["members"]) == 1000
+        assert summary["errors"][0]["character_id"] == "nobody"
+        assert all(1 <= member["natural"] <= 20 for member in summary["members"])
+        assert summary["success"] == (summary["successes"] * 2 >= 1000)
+
+        assert server.roll_group_check("skill", "flying", 10, party="group").startswith("Error")
+        assert server.roll_group_check("skill", "stealth", 10, party="nobody").startswith("Error: Unknown")
+        assert server.roll_group_check("skill", "stealth", 10).startswith("Error")
+        assert server.roll_group_check("skill", "stealth", 10, character_ids=["nobody"]).startswith("Error")
+    finally:
+        server.unload_character("group_thorin")
+        server.unload_character("group_gandalf")
+        server.parties.clear()
+
+
+if __name__ == "__main__":
+    test_parties()
+    test_group_check()
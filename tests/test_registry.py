@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-character registry
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.registry import CharacterRegistry
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_registry_eviction():
+    """Evicted characters are spilled to disk and reloaded with their changes"""
+    print("=== Registry Eviction ===")
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        registry = CharacterRegistry(max_resident=2, spill_dir=spill_dir)
+        thorin_id, thorin = registry.load(os.path.join(EXAMPLES, "thorin.json"))
+        gandalf_id, _ = registry.load(os.path.join(EXAMPLES, "gandalf.json"))
+        thorin.hit_points["current"] = 7
+        assert "_deferred" not in thorin.__dict__  # JSON is loaded in full
+
+        sorcerer_id, _ = registry.load(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"),
+                                       "sorcerer")
+        print(f"Ids: {registry.ids()}, active: {registry.active_id}")
+        assert registry.peek(thorin_id) is None
+        assert registry.active_id == sorcerer_id
+        assert len(registry) == 3
+
+        reloaded = registry.get(thorin_id)
+        assert reloaded.hit_points["current"] == 7
+        assert "weapons" in reloaded.__dict__["_deferred"]  # Binary spill files are loaded lazily
+        assert registry.peek(gandalf_id) is None
+
+        assert registry.remove(gandalf_id)
+        assert gandalf_id not in registry
+        assert registry.get("missing") is None
+
+    # Without a spill directory, spills go to a temporary one removed on close
+    registry = CharacterRegistry(max_resident=1)
+    registry.load(os.path.join(EXAMPLES, "thorin.json"))
+    registry.load(os.path.join(EXAMPLES, "gandalf.json"))
+    spill_dir = registry.spill_dir
+    assert len(os.listdir(spill_dir)) == 1
+    registry.close()
+    assert not os.path.exists(spill_dir) and len(registry) == 1
+
+
+def test_server_character_ids():
+    """Tools address characters by id and default to the active one"""
+    print("\n=== Server Character Ids ===")
+
+    # Work on copies: hit point changes are journaled next to the loaded file
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("thorin.json", "gandalf.json"):
+            shutil.copy(os.path.join(EXAMPLES, name), directory)
+
+        print(server.load_character(os.path.join(directory, "thorin.json"), "thorin"))
+        print(server.load_character(os.path.join(directory, "gandalf.json"), "gandalf"))
+
+        assert json.loads(server.get_character_info())["name"] == "Gandalf the Grey"
+        assert json.loads(server.get_character_info("thorin"))["name"] == "Thorin Ironforge"
+
+        print(server.update_hit_points(10, "thorin"))
+        assert json.loads(server.get_character_info("thorin"))["hit_points"]["current"] == 10
+
+        result = json.loads(server.roll_skill_check("athletics", character_id="thorin"))
+        assert result["is_proficient"]
+
+        assert server.get_character_info("nobody").startswith("Error: Unknown character id")
+        print(server.select_character("thorin"))
+        assert json.loads(server.get_character_info())["name"] == "Thorin Ironforge"
+        print(server.list_characters())
+        print(server.unload_character("gandalf"))
+        assert "gandalf" not in server.registry
+        server.unload_character("thorin")
+
+
+if __name__ == "__main__":
+    test_registry_eviction()
+    test_server_character_ids()
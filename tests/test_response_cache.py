@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for character versions and memoized tool responses
+"""
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_character_version():
+    """Assignments and touch() bump the version; reading and lazy decoding do not"""
+    print("=== Character Version ===")
+
+    character = Character()
+    character.load(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"), lazy=True)
+    version = character.version
+    character.spells  # Decoding a deferred section
+    character.get_skill_bonus("arcana")
+    assert character.version == version
+
+    changes = [
+        lambda: setattr(character, "alignment", "Chaotic Good"),
+        lambda: setattr(character, "hit_points", {"max": 30, "current": 1}),
+        lambda: setattr(character, "spells", character.spells + [{"name": "Shield", "level": 1}]),
+        character.touch,
+    ]
+    for change in changes:
+        change()
+        assert character.version > version
+        version = character.version
+
+    # Changes made in place are only seen after touch()
+    character.classes[0]["level"] = 2
+    assert character.version == version
+    character.touch()
+    assert character.version > version and character.get_level() == 2
+
+
+def test_cached_responses():
+    """Responses are reused until the character changes or the format does"""
+    print("=== Cached Responses ===")
+
+    assert server.list_available_skills() is server.list_available_skills()
+    assert server.list_common_modifiers() is server.list_common_modifiers()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sorcerer.json")
+        shutil.copy(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"), path)
+        print(server.load_character(path, "cached_sorcerer"))
+        try:
+            info = server.get_character_info("cached_sorcerer")
+            spells = server.get_character_spells("cached_sorcerer")
+            assert server.get_character_info("cached_sorcerer") is info
+            assert server.get_character_spells("cached_sorcerer") is spells
+
+            print(server.update_hit_points(1, "cached_sorcerer"))
+            assert json.loads(server.get_character_info("cached_sorcerer"))["hit_points"]["current"] == 1
+
+            character = server.registry.get("cached_sorcerer")
+            character.spells[0]["name"] = "Renamed"
+            character.touch()
+            assert "Renamed" in server.get_character_spells("cached_sorcerer")
+
+            # Responses keyed by arguments are bounded, keeping the most recently used
+            for bonus in range(server.MAX_CHARACTER_RESPONSES * 2):
+                server.get_damage_per_round(modifiers=f"+{bonus}", character_id="cached_sorcerer")
+                assert server.get_character_info("cached_sorcerer") is not None
+            responses = server._character_responses[character]
+            assert len(responses) == server.MAX_CHARACTER_RESPONSES
+            assert "get_character_info" in responses
+
+            server.RESPONSE_FORMAT = "compact"
+            assert "\n" not in server.get_character_equipment("cached_sorcerer")
+        finally:
+            server.RESPONSE_FORMAT = "pretty"
+            server.unload_character("cached_sorcerer")
+
+
+if __name__ == "__main__":
+    test_character_version()
+    test_cached_responses()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test script for seeded dice streams, recording and replay
+"""
+
+import asyncio
+import json
+import random
+import sys
+import threading
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.dnd_mcp.dice import (DiceModifier, compile_dice, compile_modifiers, perform_roll, perform_roll_batch,
+                              roll_d20, use_rng)
+from src.dnd_mcp.rng import POOL_MODULUS, DiceRNG, EntropyPool, ReplayError, ReplayRNG, uniform_choices
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def session_rolls():
+    """A mix of single rolls, vectorized batches and dice expressions"""
+    plan = compile_modifiers("advantage bless:1d4 +2")
+    return [
+        perform_roll(3, plan, "Check")["breakdown"],
+        [int(total) for total in perform_roll_batch(1, plan, 200)["total"]],
+        compile_dice("4d6kh3 + 1d6!").roll(),
+        [int(total) for total in compile_dice("2d8r1").evaluate_batch(100)],
+    ]
+
+
+def test_seeded_streams():
+    """Streams seeded alike roll alike, and do not disturb each other"""
+    print("=== Seeded Streams ===")
+
+    with use_rng(DiceRNG(1234)):
+        first = session_rolls()
+    with use_rng(DiceRNG(1234)):
+        other = DiceRNG(99)
+        perform_roll(0, compile_modifiers(""), "Elsewhere", rng=other)
+        second = session_rolls()
+    assert first == second
+    with use_rng(DiceRNG(4321)):
+        assert session_rolls() != first
+
+    try:
+        DiceRNG(-1)
+        assert False, "negative seeds should be rejected"
+    except ValueError as e:
+        print(f"Rejected: {e}")
+
+
+def test_record_and_replay():
+    """Replaying a record reproduces every roll, and stops where the session diverges"""
+    print("=== Record and Replay ===")
+
+    recorder = DiceRNG(record=True)
+    with use_rng(recorder):
+        recorded = session_rolls()
+    record = json.loads(json.dumps(recorder.record()))
+    print(f"{len(record['draws'])} draws recorded (seed {record['seed']})")
+
+    replay = ReplayRNG(record)
+    with use_rng(replay):
+        assert session_rolls() == recorded
+        assert replay.remaining == 0
+        try:
+            compile_dice("1d20").roll()
+            assert False, "an exhausted record should stop the replay"
+        except ReplayError as e:
+            print(f"Stopped: {e}")
+
+    with use_rng(ReplayRNG(record)):
+        try:
+            compile_dice("1d12").roll()  # The record starts with a d20
+            assert False, "a different die should stop the replay"
+        except ReplayError as e:
+            print(f"Stopped: {e}")
+
+    try:
+        ReplayRNG({"draws": "nothing"})
+        assert False, "malformed records should be rejected"
+    except ReplayError as e:
+        print(f"Rejected: {e}")
+
+
+def test_entropy_pool():
+    """Pooled dice are uniform, reproducible with or without background refills"""
+    print("=== Entropy Pool ===")
+
+    assert all(POOL_MODULUS % sides == 0 for sides in list(range(1, 21)) + [100])
+
+    pool = EntropyPool(5, size=64)
+    counts = [0] * 20
+    for _ in range(20000):
+        counts[pool.choices(range(1, 21))[0] - 1] += 1
+    print(f"d20 counts: {counts} over {pool.refills} refills")
+    assert pool.refills > 300
+    # Chi-square with 19 degrees of freedom; 43.8 is the 0.1% critical value
+    assert sum((c - 1000) ** 2 / 1000 for c in counts) < 43.8
+    faces = pool.choices(range(1, 7), k=64)
+    assert len(faces) == 64 and set(faces) <= set(range(1, 7))
+    # Sizes that do not divide the modulus, or larger than a block, skip the pool
+    assert set(pool.choices(range(1, 24), k=200)) <= set(range(1, 24))
+
+    def rolls(**options):
+        with use_rng(DiceRNG(77, **options)):
+            return ([roll_d20()["result"] for _ in range(3000)],
+                    [DiceModifier("bless", "1d4").roll()["total"] for _ in range(500)],
+                    session_rolls())
+
+    pooled = rolls(pool_size=128)
+    assert rolls(pool_size=128, background=True) == pooled
+    assert rolls(pool_size=0) != pooled
+    assert rolls(pool_size=0) == rolls(pool_size=0) == rolls()
+    assert DiceRNG(1).pool is None  # The pool is opt-in
+
+    # Direct draws match random.Random.choices value for value
+    for k in (1, 2, 3, 70):
+        expected, actual = random.Random(9), random.Random(9)
+        draw = uniform_choices(actual.random)
+        assert [draw(range(1, 21), k=k) for _ in range(50)] == \
+            [expected.choices(range(1, 21), k=k) for _ in range(50)]
+
+    # Threads sharing a pool each get distinct values: together, exactly the sequential ones
+    shared, sequential = EntropyPool(5, size=64), EntropyPool(5, size=64)
+    drawn = [[] for _ in range(8)]
+
+    def draw(values):
+        for _ in range(1000):
+            values.extend(shared.choices(range(1, 101)))
+
+    threads = [threading.Thread(target=draw, args=(values,)) for values in drawn]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often enough to interleave draws
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    total = sum(len(values) for values in drawn)
+    expected = []
+    while len(expected) < total:
+        expected += sequential.choices(range(1, 101), k=1)
+    assert sorted(sum(drawn, [])) == sorted(expected)
+
+    recorder = DiceRNG(record=True, pool_size=32, background=True)
+    with use_rng(recorder):
+        recorded = [roll_d20()["result"] for _ in range(100)]
+    with use_rng(ReplayRNG(recorder.record())):
+        assert [roll_d20()["result"] for _ in range(100)] == recorded
+
+
+def test_dice_tools():
+    """seed_dice, get_dice_record and replay_dice reproduce tool output exactly"""
+    print("=== Dice Tools ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "rng_thorin"))
+    try:
+        def play():
+            return [
+                server.roll_skill_check("athletics", "advantage bless:1d4"),
+                server.roll_attack("Battleaxe", target_ac=14),
+                server.roll_dice("8d6", count=20),
+                server.roll_group_check("save", "dex", 12, character_ids=["rng_thorin"] * 100),
+            ]
+
+        print(server.seed_dice(2024, record=True))
+        recorded = play()
+        record = json.loads(server.get_dice_record())
+        assert record["seed"] == 2024
+
+        print(server.replay_dice(record))
+        assert play() == recorded
+        assert "ran out" in server.roll_dice("1d20")
+        print(server.seed_dice(2024))
+        assert play() == recorded
+        assert server.get_dice_record().startswith("Error")
+        assert server.replay_dice({"draws": 5}).startswith("Error")
+        assert server.seed_dice(-5).startswith("Error")
+    finally:
+        server.seed_dice()
+        server.unload_character("rng_thorin")
+
+
+def test_session_streams():
+    """Each client session rolls from its own stream"""
+    print("=== Session Streams ===")
+
+    async def run():
+        async with create_connected_server_and_client_session(server.server._mcp_server) as first, \
+                create_connected_server_and_client_session(server.server._mcp_server) as second:
+            async def roll(session):
+                result = await session.call_tool("roll_dice", {"expression": "1d20", "count": 10})
+                return json.loads(result.content[0].text)["totals"]
+
+            await first.call_tool("seed_dice", {"seed": 7})
+            await second.call_tool("seed_dice", {"seed": 7})
+            # Interleaved calls from the other session do not shift this one's rolls
+            first_rolls, second_rolls = [], []
+            for _ in range(2):
+                first_rolls.append(await roll(first))
+                second_rolls.append(await roll(second))
+            return first_rolls, second_rolls
+
+    first_rolls, second_rolls = asyncio.run(run())
+    assert first_rolls == second_rolls
+
+
+if __name__ == "__main__":
+    test_seeded_streams()
+    test_record_and_replay()
+    test_entropy_pool()
+    test_dice_tools()
+    test_session_streams()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for batched rolls
+"""
+
+import json
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_roll_batch():
+    """One call rolls for several characters and reports bad specs in place"""
+    print("=== Roll Batch ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "batch_thorin"))
+    print(server.load_character(os.path.join(EXAMPLES, "gandalf.json"), "batch_gandalf"))
+    try:
+        thorin = server.registry.get("batch_thorin")
+        gandalf = server.registry.get("batch_gandalf")
+        rolls = [
+            {"kind": "skill", "name": "athletics", "character_id": "batch_thorin", "dc": 15},
+            {"kind": "save", "ability": "wis", "character_id": "batch_gandalf", "modifiers": "+2"},
+            {"kind": "attack", "weapon": "Battleaxe", "character_id": "batch_thorin", "dc": "16"},
+            {"kind": "ability", "name": "dex", "modifiers": "advantage bless:1d4"},
+            {"kind": "skill", "name": "flying"},
+            {"kind": "save", "ability": "str", "character_id": "nobody"},
+            {"kind": "skill", "name": "stealth", "dc": "hard"},
+        ]
+        results = json.loads(server.roll_batch(rolls, breakdown=True))
+        print(json.dumps(results, indent=2))
+        assert len(results) == len(rolls)
+
+        athletics, wisdom_save, attack, dexterity = results[:4]
+        assert athletics["total"] == athletics["natural"] + thorin.get_skill_bonus("athletics").total
+        assert athletics["success"] == (athletics["total"] >= 15)
+        assert wisdom_save["total"] == wisdom_save["natural"] + gandalf.get_saving_throw_bonus("wis").total + 2
+        assert "dc" not in wisdom_save and "success" not in wisdom_save
+        assert attack["roll"] == "Battleaxe Attack" and attack["dc"] == 16
+        # Without a character_id the active (last loaded) character rolls
+        assert dexterity["character_id"] == "batch_gandalf"
+        assert dexterity["breakdown"].endswith(f"= {dexterity['total']}")
+        assert all("error" in result for result in results[4:])
+
+        compact = json.loads(server.roll_batch(rolls[:1] * 50))
+        assert len(compact) == 50 and "breakdown" not in compact[0]
+        assert all(1 <= result["natural"] <= 20 for result in compact)
+
+        # Natural 1, 20 and 19 (a Champion's critical range), replayed from a record
+        attack = {"kind": "attack", "weapon": "Battleaxe", "character_id": "batch_thorin"}
+        server.replay_dice({"seed": 0, "draws": [[20, [1]], [20, [20]], [20, [19]]]})
+        try:
+            pinned = json.loads(server.roll_batch([dict(attack, dc=2), dict(attack, dc=30), dict(attack, dc=30)]))
+        finally:
+            server.seed_dice()
+        assert [result["natural"] for result in pinned] == [1, 20, 19]
+        assert [result["success"] for result in pinned] == [False, True, True]
+        assert [result["critical"] for result in pinned] == [False, True, True]
+        assert "critical" not in athletics
+
+        assert server.roll_batch([]).startswith("Error")
+        assert server.roll_batch(rolls[:1] * (server.MAX_BATCH_ROLLS + 1)).startswith("Error")
+    finally:
+        server.unload_character("batch_thorin")
+        server.unload_character("batch_gandalf")
+
+
+if __name__ == "__main__":
+    test_roll_batch()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the background save queue
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.saver import SaveQueue, write_atomically
+
+
+def test_coalesced_saves():
+    """Saves within the debounce window collapse into one atomic write"""
+    print("=== Coalesced Saves ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hero.json")
+        queue = SaveQueue(debounce=60)
+        written = []
+        for version in range(5):
+            queue.submit(path, f'{{"version": {version}}}', lambda: written.append(True))
+
+        metrics = queue.metrics()
+        assert metrics["queue_depth"] == 1 and not os.path.exists(path)
+
+        assert queue.flush(timeout=5)
+        metrics = queue.metrics()
+        print(f"  {metrics}")
+        with open(path) as file:
+            assert file.read() == '{"version": 4}'
+        assert (metrics["saves_requested"], metrics["saves_written"], metrics["saves_coalesced"]) == (5, 1, 4)
+        assert len(written) == 5 and metrics["queue_depth"] == 0
+        assert os.listdir(directory) == ["hero.json"]
+
+        # Failed writes are reported, not raised
+        queue.submit(os.path.join(directory, "missing", "hero.json"), "{}")
+        assert queue.flush(timeout=5)
+        assert queue.metrics()["saves_failed"] == 1
+
+
+def test_write_permissions():
+    """Replacing a file keeps its permissions; new files follow the umask"""
+    print("=== Write Permissions ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hero.json")
+        write_atomically(path, "{}")
+        umask = os.umask(0)
+        os.umask(umask)
+        assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+        os.chmod(path, 0o640)
+        write_atomically(path, b"{}")
+        assert os.stat(path).st_mode & 0o777 == 0o640
+        assert os.listdir(directory) == ["hero.json"]
+
+
+if __name__ == "__main__":
+    test_coalesced_saves()
+    test_write_permissions()
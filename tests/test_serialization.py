@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSON serialization backends
+"""
+
+import json
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.character import Character, RollBonus
+from src.dnd_mcp.serialization import available_backends, dumps, select_backend
+from src.dnd_mcp import server
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples', 'characters')
+
+
+def test_backends_agree():
+    """Every installed backend writes the same data as the standard library"""
+    print(f"=== Backends: {', '.join(available_backends())} ===")
+
+    character = Character()
+    character.load(os.path.join(EXAMPLES, "Dragonborn Sorcerer 1.json"))
+    values = [
+        character.to_dict(),
+        {1: ["Magic Missile"], 2: [], "name": "Ærwen the Élan"},
+        {"bonus": RollBonus(5, "dex", 3, 2, True), "weights": [0.5, 1e-7, 12345678901234]},
+    ]
+    for value in values:
+        expected = json.loads(json.dumps(value))
+        for backend in available_backends():
+            for indent in (None, 2, 4):
+                assert json.loads(dumps(value, indent=indent, backend=backend)) == expected, (backend, indent)
+
+    # Indents a backend cannot produce fall back to one that can
+    assert dumps(values[0], indent=4) == json.dumps(values[0], indent=4, ensure_ascii=False)
+    assert "\n" not in dumps(values[0])
+    assert json.loads(character.to_json()) == character.to_dict()
+
+    # Integers wider than 64 bits fall back to a backend that can write them
+    huge = {"a": 2 ** 70, "b": -(2 ** 80), "gold": [2 ** 64]}
+    for backend in available_backends():
+        for indent in (None, 2):
+            assert json.loads(dumps(huge, indent=indent, backend=backend)) == huge, (backend, indent)
+    rich = Character()
+    rich.load(os.path.join(EXAMPLES, "thorin.json"))
+    rich.treasure = {"gp": 2 ** 70}
+    assert json.loads(rich.to_json())["treasure"] == {"gp": 2 ** 70}
+
+    assert select_backend("json") == "json"
+    try:
+        select_backend("pickle")
+        assert False, "unknown backends should be rejected"
+    except ValueError as e:
+        print(f"Rejected: {e}")
+
+
+def test_compact_responses():
+    """Compact responses carry the same data in fewer bytes"""
+    print("=== Compact Responses ===")
+
+    print(server.load_character(os.path.join(EXAMPLES, "thorin.json"), "compact_thorin"))
+    try:
+        pretty = server.get_character_info("compact_thorin")
+        server.RESPONSE_FORMAT = "compact"
+        compact = server.get_character_info("compact_thorin")
+        print(f"{len(pretty)} -> {len(compact)} characters")
+        assert json.loads(compact) == json.loads(pretty)
+        assert len(compact) < len(pretty)
+    finally:
+        server.RESPONSE_FORMAT = "pretty"
+        server.unload_character("compact_thorin")
+
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_compact_responses()
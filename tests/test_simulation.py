@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the Monte Carlo roll simulation
+"""
+
+import sys
+import os
+
+# Add the parent directory to path to import from src
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dnd_mcp.dice import RollType, parse_modifiers_string, check_distribution
+from src.dnd_mcp import simulation
+from src.dnd_mcp.simulation import CHUNK_SIZE, MAX_TRIALS, RollScenario, simulate
+
+
+def test_simulation_matches_exact_odds():
+    """Simulated odds agree with the exact distribution"""
+    print("=== Simulation vs Exact Odds ===")
+
+    modifiers = parse_modifiers_string("advantage +1 bless:1d4")
+    exact = check_distribution(3, modifiers).probability_at_least(18)
+
+    scenario = RollScenario.from_modifiers(3, modifiers, 18)
+    result = simulate(scenario, trials=200000, workers=1, seed=7)
+    low, high = result.success_interval()
+    print(f"Exact {exact:.4f}, simulated {result.success_rate():.4f} ({low:.4f}-{high:.4f})")
+    assert result.trials == 200000
+    assert low - 0.005 <= exact <= high + 0.005
+
+
+def test_simulation_scenarios():
+    """Rerolls, minimum d20 and repeated attempts"""
+    print("\n=== Scenarios ===")
+
+    reliable = RollScenario(5, 15, minimum_d20=10)
+    result = simulate(reliable, trials=50000, workers=1, seed=1)
+    assert min(result.histogram) == 15
+    assert result.success_rate() == 1.0
+
+    retries = RollScenario(0, 20, attempts=3)
+    result = simulate(retries, trials=100000, workers=2, seed=3)
+    expected = 1 - 0.95 ** 3
+    print(f"Three tries at a natural 20: {result.success_rate():.4f} (expected {expected:.4f})")
+    assert abs(result.success_rate() - expected) < 0.01
+
+    lucky = RollScenario(0, 2, RollType.DISADVANTAGE, reroll_ones=True)
+    result = simulate(lucky, trials=100000, workers=1, seed=5)
+    expected = (1 - 0.05 * 0.05) ** 2
+    assert abs(result.success_rate() - expected) < 0.01
+
+
+def test_worker_pool():
+    """Worker processes are reused, and give the same counts as one process"""
+    print("\n=== Worker Pool ===")
+
+    scenario = RollScenario(2, 12)
+    trials = 2 * CHUNK_SIZE + 1000
+    local = simulate(scenario, trials=trials, workers=1, seed=11, time_budget=60)
+    pooled = simulate(scenario, trials=trials, workers=2, seed=11, time_budget=60)
+    pool = simulation._pool
+    again = simulate(scenario, trials=trials, workers=2, seed=11, time_budget=60)
+    assert simulation._pool is pool and pooled.workers == 2
+    assert local.trials == pooled.trials == again.trials == trials
+    assert local.histogram == pooled.histogram == again.histogram
+
+    for bad_trials in (0, MAX_TRIALS + 1):
+        try:
+            simulate(scenario, trials=bad_trials)
+            assert False, "trials out of range should be rejected"
+        except ValueError:
+            pass
+    simulation.shutdown_pool()
+    assert simulation._pool is None
+
+
+if __name__ == "__main__":
+    test_simulation_matches_exact_odds()
+    test_simulation_scenarios()
+    test_worker_pool()